@@ -0,0 +1,77 @@
+"""
+Núcleo de cálculo do Detector de Lateralizações.
+
+Depende apenas de pandas/NumPy e pode ser importado por workers, notebooks e scripts
+sem iniciar o Streamlit (a página fica em pagina.py).
+"""
+from lateralizacoes.barras import (
+    analisar_sequencias_barras_por_categoria,
+    calcular_evolucao_probabilidade_sequencia,
+    calcular_frequencia_barras,
+    contar_padroes_por_dia,
+    evolucao_do_padrao,
+    tabela_padroes_por_dia,
+)
+from lateralizacoes.estatisticas import (
+    calcular_estatisticas_por_nivel,
+    calcular_media_stops_entre_ganhos_por_linha,
+    calcular_probabilidade_ganho_por_nivel,
+    extrair_stops_entre_gains_por_nivel,
+    medias_stops_entre_ganhos,
+    resumir_operacoes,
+    resumo_por_nivel,
+    stops_do_nivel,
+    stops_entre_ganhos,
+    stops_entre_ganhos_por_nivel,
+    totais_por_nivel,
+)
+from lateralizacoes.janelas import indice_do_historico, limites_das_janelas, walk_forward
+from lateralizacoes.periodos import calcular_estatisticas_por_periodo, filtrar_por_periodo
+from lateralizacoes.range_diario import (
+    calcular_media_range_por_periodo,
+    calcular_range_diario,
+    encontrar_colunas_maxima_minima,
+    linhas_do_dia,
+    obter_dias_por_periodo,
+    resumir_dias,
+    resumo_diario,
+)
+from lateralizacoes.risco import ciclos_do_nivel, resumir_caminhos, risco_do_nivel, simular_caminhos
+from lateralizacoes.sessoes import (
+    construir_indice_sessoes,
+    indice_sessoes,
+    posicoes_sessoes,
+    selecionar_sessoes,
+)
+from lateralizacoes.simulacao import (
+    comparar_tabelas_pontos,
+    detectar_alternancias,
+    detectar_alternancias_paralelo,
+    detectar_dias,
+    detectar_incremental,
+    formatar_operacoes,
+    indexar_dias,
+    matriz_por_sequencia,
+    montar_tabela_resultado,
+    precificar,
+    simular,
+    simular_incremental,
+    simular_paralelo,
+    stop_do_ativo,
+    total_de_sequencias,
+    valores_por_ativo,
+)
+from lateralizacoes.tabelas import (
+    filtrar_posicoes,
+    linhas_da_pagina,
+    ordenar_posicoes,
+    pagina_do_dia,
+    posicoes_da_tabela,
+    total_de_paginas,
+)
+from lateralizacoes.tempos_graficos import (
+    estatisticas_das_barras,
+    reamostrar,
+    sequencias_por_categoria,
+    simular_tempos_graficos,
+)
@@ -0,0 +1,77 @@
+"""
+Redução de séries longas para gráficos: Largest-Triangle-Three-Buckets (LTTB), que mantém picos,
+vales e o formato da curva com um número fixo de pontos, feita antes de montar a figura
+"""
+import numpy as np
+import pandas as pd
+
+def lttb(x, y, pontos):
+    """
+    Posições dos pontos escolhidos pelo LTTB (sempre o primeiro e o último). Os pontos do meio
+    são divididos em 'pontos' - 2 faixas e, de cada faixa, fica o que forma o maior triângulo com
+    o ponto escolhido na faixa anterior e a média da faixa seguinte. x precisa estar em ordem.
+    """
+    quantidade = len(x)
+    if pontos >= quantidade or pontos < 3:
+        return np.arange(quantidade)
+    
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    bordas = np.linspace(1, quantidade - 1, pontos - 1).astype(np.int64)
+    
+    escolhidos = np.empty(pontos, dtype=np.int64)
+    escolhidos[0], escolhidos[-1] = 0, quantidade - 1
+    anterior = 0
+    for faixa in range(pontos - 2):
+        inicio, fim = bordas[faixa], bordas[faixa + 1]
+        # Média da faixa seguinte (a última faixa olha só para o último ponto)
+        proximo_inicio, proximo_fim = (bordas[faixa + 1], bordas[faixa + 2]) if faixa + 2 < len(bordas) else (quantidade - 1, quantidade)
+        media_x = x[proximo_inicio:proximo_fim].mean()
+        media_y = y[proximo_inicio:proximo_fim].mean()
+        
+        # Dobro da área do triângulo (anterior, candidato, média seguinte): a constante não muda o máximo
+        areas = np.abs(
+            (x[anterior] - media_x) * (y[inicio:fim] - y[anterior])
+            - (x[anterior] - x[inicio:fim]) * (media_y - y[anterior])
+        )
+        anterior = inicio + int(np.argmax(areas))
+        escolhidos[faixa + 1] = anterior
+    
+    return escolhidos
+
+def _eixo_numerico(valores):
+    """Eixo x como float (datas viram nanossegundos), para as áreas do LTTB"""
+    if pd.api.types.is_numeric_dtype(valores):
+        return valores.to_numpy(dtype=float)
+    return pd.to_datetime(valores).to_numpy().astype('datetime64[ns]').astype(np.int64).astype(float)
+
+def reduzir_serie(df, x, y, pontos, grupo=None, intervalo=None):
+    """
+    Linhas do df que bastam para desenhar as colunas y contra x com até 'pontos' pontos por coluna
+    (e por grupo, quando cada grupo vira uma linha do gráfico). Com intervalo (mínimo, máximo) de x,
+    só essa faixa entra, então uma faixa estreita volta à resolução completa. O df deve estar em
+    ordem de x dentro de cada grupo; linhas sem valor em y não entram na escolha.
+    """
+    if intervalo is not None:
+        df = df[(df[x] >= intervalo[0]) & (df[x] <= intervalo[1])]
+    
+    colunas_y = [y] if isinstance(y, str) else list(y)
+    partes = [df] if grupo is None else [parte for _, parte in df.groupby(grupo, sort=False)]
+    
+    reduzidas = []
+    for parte in partes:
+        if len(parte) <= pontos:
+            reduzidas.append(parte)
+            continue
+        
+        eixo = _eixo_numerico(parte[x])
+        posicoes = []
+        for coluna in colunas_y:
+            valores = parte[coluna].to_numpy(dtype=float)
+            validas = np.flatnonzero(~np.isnan(valores))
+            posicoes.append(validas[lttb(eixo[validas], valores[validas], pontos)])
+        reduzidas.append(parte.iloc[np.unique(np.concatenate(posicoes))])
+    
+    if not reduzidas:
+        return df
+    return pd.concat(reduzidas) if len(reduzidas) > 1 else reduzidas[0]
@@ -0,0 +1,278 @@
+"""Estatísticas de sequências de barras (compradoras/vendedoras/laterais) e sua evolução no tempo"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# ===============================
+# NOVAS FUNÇÕES PARA ESTATÍSTICA DE BARRAS - SEPARADAS POR CATEGORIA
+# ===============================
+def codificar_padroes(barras, max_sequencia):
+    """
+    Gera, para cada tamanho 1..max_sequencia, o código inteiro do padrão das barras anteriores
+    a cada posição i (bit mais significativo = barra mais antiga; "011" -> 3).
+    Cada item é (tamanho, posições i, códigos), só com as posições i em que o padrão cabe
+    (i >= tamanho) e existe próxima barra para contar (i <= n - 2), como na contagem original.
+    """
+    barras = np.asarray(barras, dtype=np.int64)
+    n = len(barras)
+    codigo = np.zeros(n, dtype=np.int64)
+    
+    for tamanho in range(1, max_sequencia + 1):
+        if n - 1 <= tamanho:
+            break
+        # Padrão de tamanho t = padrão de tamanho t-1 + a barra mais antiga como novo bit alto
+        codigo[tamanho:] += barras[:n - tamanho] << (tamanho - 1)
+        yield tamanho, np.arange(tamanho, n - 1), codigo[tamanho:n - 1]
+
+def contar_padroes(barras, max_sequencia):
+    """
+    Conta cada padrão anterior (por tamanho) e as barras seguintes, com bincount sobre os códigos.
+    Retorna Tamanho, Codigo, Ocorrencias, Proximas_Compradoras e Primeira (1ª posição em que apareceu).
+    """
+    barras = np.asarray(barras, dtype=np.int64)
+    tabelas = []
+    
+    for tamanho, posicoes, codigos in codificar_padroes(barras, max_sequencia):
+        proximas = barras[posicoes]
+        contagem = np.bincount(codigos * 2 + proximas, minlength=2 ** (tamanho + 1)).reshape(-1, 2)
+        
+        # Primeira ocorrência de cada código (define a ordem de desempate da tabela).
+        # Ordenação estável em uint16 usa radix sort: linear mesmo com milhões de barras
+        tipo = np.uint16 if tamanho <= 16 else np.int64
+        ordem = np.argsort(codigos.astype(tipo), kind='stable')
+        ordenados = codigos[ordem]
+        inicio_grupo = np.flatnonzero(np.r_[True, ordenados[1:] != ordenados[:-1]])
+        presentes = ordenados[inicio_grupo]
+        
+        tabelas.append(pd.DataFrame({
+            'Tamanho': tamanho,
+            'Codigo': presentes,
+            'Ocorrencias': contagem[presentes].sum(axis=1),
+            'Proximas_Compradoras': contagem[presentes, 1],
+            'Primeira': posicoes[ordem[inicio_grupo]]
+        }))
+    
+    if not tabelas:
+        return pd.DataFrame(columns=['Tamanho', 'Codigo', 'Ocorrencias', 'Proximas_Compradoras', 'Primeira'])
+    return pd.concat(tabelas, ignore_index=True)
+
+def _arredondar(valores, casas=2):
+    """np.round vetorizado, com round() do Python só nos casos próximos de meio (mesmo resultado do round)"""
+    arredondados = np.round(valores, casas)
+    escalados = valores * 10 ** casas
+    ambiguos = np.flatnonzero(np.abs(escalados - np.floor(escalados) - 0.5) < 1e-6)
+    arredondados[ambiguos] = [round(valor, casas) for valor in valores[ambiguos].tolist()]
+    return arredondados
+
+def analisar_sequencias_barras_por_categoria(candles, max_sequencia=5):
+    """
+    Analisa as probabilidades de sequências de barras separadas por categoria
+    Retorna 3 DataFrames: laterais, compradoras e vendedoras
+    """
+    padroes = contar_padroes(candles['Barras'].to_numpy(), max_sequencia)
+    
+    # Mesma ordem em que os padrões apareceriam percorrendo as barras (desempate da ordenação)
+    padroes = padroes.sort_values(['Primeira', 'Tamanho'], kind='mergesort').reset_index(drop=True)
+    
+    total = padroes['Ocorrencias'].to_numpy()
+    compradoras = padroes['Proximas_Compradoras'].to_numpy()
+    prob_compradora = compradoras / total * 100
+    prob_vendedora = (total - compradoras) / total * 100
+    
+    resultados = pd.DataFrame({
+        'Sequência Anterior': [format(codigo, f'0{tamanho}b') for codigo, tamanho in zip(padroes['Codigo'], padroes['Tamanho'])],
+        'Tamanho Sequência': padroes['Tamanho'].astype(int),
+        'Ocorrências': total,
+        'Próxima Compradora': compradoras,
+        'Próxima Vendedora': total - compradoras,
+        'Prob. Compradora (%)': _arredondar(prob_compradora),
+        'Prob. Vendedora (%)': _arredondar(prob_vendedora),
+        'Viés': np.where(prob_compradora > 60, 'Comprador', np.where(prob_vendedora > 60, 'Vendedor', 'Neutro'))
+    })
+    
+    # Classificar em categorias: só 1s (compradora), só 0s (vendedora) ou mista (lateral)
+    so_compradoras = padroes['Codigo'] == 2 ** padroes['Tamanho'] - 1
+    so_vendedoras = padroes['Codigo'] == 0
+    categorias = [
+        resultados[~so_compradoras & ~so_vendedoras],
+        resultados[so_compradoras],
+        resultados[so_vendedoras]
+    ]
+    
+    # Converter para DataFrames e ordenar
+    df_laterais, df_compradoras, df_vendedoras = [
+        categoria.reset_index(drop=True).sort_values(['Tamanho Sequência', 'Ocorrências'], ascending=[True, False])
+        for categoria in categorias
+    ]
+    
+    return df_laterais, df_compradoras, df_vendedoras
+
+def calcular_frequencia_barras(candles):
+    """Calcula a frequência simples de barras compradoras e vendedoras"""
+    barras = candles['Barras'].tolist()
+    total = len(barras)
+    compradoras = sum(barras)
+    vendedoras = total - compradoras
+    
+    return {
+        'Total Barras': total,
+        'Compradoras': compradoras,
+        'Vendedoras': vendedoras,
+        '% Compradoras': round((compradoras / total) * 100, 2),
+        '% Vendedoras': round((vendedoras / total) * 100, 2)
+    }
+
+# ===============================
+# FUNÇÃO CORRIGIDA PARA EVOLUÇÃO TEMPORAL DE PROBABILIDADES
+# ===============================
+MAX_TABELAS_POR_DIA = 4
+# Tamanhos de padrão guardados por tabela: cada um tem até uma linha por barra
+MAX_TAMANHOS_POR_TABELA = 4
+
+_tabelas_por_dia = OrderedDict()
+_trava = threading.Lock()
+
+def _barras_por_dia(candles):
+    """Barras em ordem cronológica, o dia de cada uma e as datas, base das contagens por dia"""
+    candles = candles.sort_values('Data', kind='mergesort')
+    datas = candles['Data']
+    dia_por_barra, dias = pd.factorize(datas.dt.normalize(), sort=True)
+    return {
+        'barras': candles['Barras'].to_numpy(dtype=np.int64),
+        'dia_por_barra': dia_por_barra,
+        'datas': datas.to_numpy(),
+        'dias': dias.date
+    }
+
+def _contar_por_dia(base, tamanhos):
+    """Contagens padrão x dia (ver contar_padroes_por_dia) só dos tamanhos pedidos"""
+    barras, dia_por_barra = base['barras'], base['dia_por_barra']
+    
+    blocos = []
+    for tamanho, posicoes, codigos in codificar_padroes(barras, max(tamanhos, default=0)):
+        if tamanho not in tamanhos:
+            continue
+        # Posições já estão em ordem de dia: ordenar só pelo código (estável) agrupa por (código, dia)
+        tipo = np.uint16 if tamanho <= 16 else np.int64
+        ordem = np.argsort(codigos.astype(tipo), kind='stable')
+        codigos_ordenados = codigos[ordem]
+        dias_ordenados = dia_por_barra[posicoes[ordem]]
+        
+        inicio = np.flatnonzero(np.r_[True, (codigos_ordenados[1:] != codigos_ordenados[:-1]) |
+                                            (dias_ordenados[1:] != dias_ordenados[:-1])])
+        blocos.append(pd.DataFrame({
+            'Chave': (codigos_ordenados[inicio] + 2 ** tamanho).astype(np.int32),
+            'Dia': dias_ordenados[inicio].astype(np.int32),
+            'Ocorrencias': np.diff(np.r_[inicio, len(ordem)]).astype(np.int32),
+            'Compradoras': np.add.reduceat(barras[posicoes[ordem]], inicio).astype(np.int32),
+            'Primeira': posicoes[ordem[inicio]].astype(np.int32)
+        }))
+    
+    if blocos:
+        contagens = pd.concat(blocos, ignore_index=True)
+    else:
+        contagens = pd.DataFrame({coluna: np.array([], dtype=tipo) for coluna, tipo in
+                                  [('Chave', np.int32), ('Dia', np.int32), ('Ocorrencias', np.int32),
+                                   ('Compradoras', np.int32), ('Primeira', np.int32)]})
+    
+    return {'tamanhos': frozenset(tamanhos), 'datas': base['datas'], 'dias': base['dias'], 'contagens': contagens}
+
+def contar_padroes_por_dia(candles, max_sequencia):
+    """
+    Conta, numa única passada em ordem cronológica, as ocorrências diárias de todos os padrões
+    de tamanho 1..max_sequencia e quantas foram seguidas de barra compradora.
+    Retorna um dict com 'tamanhos' (os contados), 'datas' (das barras, em ordem), 'dias' (data
+    de cada dia) e 'contagens' (Chave, Dia, Ocorrencias, Compradoras, Primeira = 1ª barra do
+    padrão no dia), ordenadas por Chave e Dia. Chave = 2**tamanho + código do padrão, então cada
+    padrão ocupa um bloco contínuo de linhas.
+    """
+    return _contar_por_dia(_barras_por_dia(candles), range(1, max_sequencia + 1))
+
+def tabela_padroes_por_dia(candles, tamanho, chave=None):
+    """
+    Contagens padrão x dia só dos padrões de um tamanho, com cache por chave (arquivo, ano,
+    horário, período...): a ordenação das barras é feita uma vez por chave e cada tamanho é
+    contado na primeira vez em que é pedido.
+    """
+    if chave is None:
+        return _contar_por_dia(_barras_por_dia(candles), [tamanho])
+    
+    with _trava:
+        entrada = _tabelas_por_dia.get(chave)
+        if entrada is not None:
+            _tabelas_por_dia.move_to_end(chave)
+            tabela = entrada['tamanhos'].get(tamanho)
+            if tabela is not None:
+                entrada['tamanhos'].move_to_end(tamanho)
+                return tabela
+    
+    if entrada is None:
+        entrada = {'base': _barras_por_dia(candles), 'tamanhos': OrderedDict()}
+    tabela = _contar_por_dia(entrada['base'], [tamanho])
+    
+    with _trava:
+        entrada = _tabelas_por_dia.setdefault(chave, entrada)
+        entrada['tamanhos'][tamanho] = tabela
+        while len(entrada['tamanhos']) > MAX_TAMANHOS_POR_TABELA:
+            entrada['tamanhos'].popitem(last=False)
+        _tabelas_por_dia.move_to_end(chave)
+        while len(_tabelas_por_dia) > MAX_TABELAS_POR_DIA:
+            _tabelas_por_dia.popitem(last=False)
+    
+    return tabela
+
+def evolucao_do_padrao(tabela, sequencia_alvo, tipo_probabilidade='Compradora', janela_dias=7):
+    """Evolução diária, média móvel e acumulada de um padrão, a partir da tabela padrão x dia"""
+    tamanho_sequencia = len(sequencia_alvo)
+    if tamanho_sequencia == 0 or tamanho_sequencia not in tabela['tamanhos']:
+        return pd.DataFrame()
+    
+    chave = 2 ** tamanho_sequencia + int(sequencia_alvo, 2)
+    contagens = tabela['contagens']
+    inicio, fim = np.searchsorted(contagens['Chave'].to_numpy(), [chave, chave + 1])
+    if inicio == fim:
+        return pd.DataFrame()
+    
+    linhas = contagens.iloc[inicio:fim]
+    ocorrencias = linhas['Ocorrencias'].to_numpy(dtype=np.int64)
+    sucessos = linhas['Compradoras'].to_numpy(dtype=np.int64)
+    if tipo_probabilidade == 'Vendedora':
+        sucessos = ocorrencias - sucessos
+    elif tipo_probabilidade != 'Compradora':
+        sucessos = np.zeros_like(ocorrencias)
+    
+    df_diario = pd.DataFrame({
+        'Data': tabela['dias'][linhas['Dia'].to_numpy()],
+        'Total_Ocorrencias': ocorrencias,
+        'Total_Sucessos': sucessos,
+        'Data_Ref': tabela['datas'][linhas['Primeira'].to_numpy()]
+    })
+    
+    # Calcular probabilidade diária
+    df_diario['Probabilidade_Diaria'] = (df_diario['Total_Sucessos'] / df_diario['Total_Ocorrencias']) * 100
+    
+    # Média móvel sobre probabilidades diárias
+    df_diario['Probabilidade_Media_Movel'] = df_diario['Probabilidade_Diaria'].rolling(
+        window=min(janela_dias, len(df_diario)),
+        min_periods=1
+    ).mean()
+    
+    # Totais acumulados
+    df_diario['Ocorrencias_Acumuladas'] = df_diario['Total_Ocorrencias'].cumsum()
+    df_diario['Sucessos_Acumulados'] = df_diario['Total_Sucessos'].cumsum()
+    df_diario['Probabilidade_Acumulada'] = (df_diario['Sucessos_Acumulados'] / df_diario['Ocorrencias_Acumuladas']) * 100
+    
+    return df_diario
+
+def calcular_evolucao_probabilidade_sequencia(candles, sequencia_alvo, tipo_probabilidade='Compradora', janela_dias=7):
+    """
+    Calcula a evolução temporal da probabilidade para uma sequência específica
+    (para várias sequências, use tabela_padroes_por_dia + evolucao_do_padrao)
+    """
+    if candles.empty or 'Data' not in candles.columns:
+        return pd.DataFrame()
+    
+    tabela = tabela_padroes_por_dia(candles, len(sequencia_alvo))
+    return evolucao_do_padrao(tabela, sequencia_alvo, tipo_probabilidade, janela_dias)
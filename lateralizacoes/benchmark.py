@@ -0,0 +1,284 @@
+"""
+Benchmarks das rotinas principais sobre candles sintéticos de 1 minuto (WIN/WDO) gerados de forma
+determinística. Mede tempo de parede e pico de memória de cada função em cada tamanho e grava
+o resultado em JSON, para comparar execuções entre commits.
+
+Exemplo:
+    python -m lateralizacoes.benchmark --tamanhos 10000 100000 1000000 --saida benchmark.json
+    python -m lateralizacoes.benchmark --saida novo.json --comparar benchmark.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, time as horario
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from lateralizacoes.barras import analisar_sequencias_barras_por_categoria, calcular_evolucao_probabilidade_sequencia
+from lateralizacoes.ingestao import normalizar_candles
+from lateralizacoes.janelas import walk_forward
+from lateralizacoes.range_diario import calcular_range_diario
+from lateralizacoes.risco import risco_do_nivel
+from lateralizacoes.simulacao import (
+    detectar_alternancias,
+    detectar_alternancias_paralelo,
+    indexar_dias,
+    precificar,
+    preparar_para_simulacao,
+    simular,
+    valores_por_ativo,
+)
+from lateralizacoes.tempos_graficos import TEMPOS_GRAFICOS_PADRAO, reamostrar
+
+# Muda quando o formato do JSON muda
+VERSAO_RESULTADO = 2
+
+TAMANHOS_PADRAO = [10_000, 100_000, 1_000_000]
+
+# ===============================
+# Gerador de candles sintéticos
+# ===============================
+PREGOES = {
+    "WIN": {
+        "ativo": "Mini Índice (WIN)", "abertura": horario(9, 0), "fechamento": horario(18, 25),
+        "preco": 110_000, "tick": 5, "corpo_medio": 6, "sombra_media": 3, "variacao_diaria": 220
+    },
+    "WDO": {
+        "ativo": "Mini Dólar (WDO)", "abertura": horario(9, 0), "fechamento": horario(18, 30),
+        "preco": 5_000, "tick": 0.5, "corpo_medio": 2, "sombra_media": 2, "variacao_diaria": 100
+    }
+}
+
+def gerar_candles(linhas, ativo="WIN", densidade_alternancia=0.6, inicio="2018-01-02", semente=0):
+    """
+    Candles de 1 minuto em ordem cronológica, como viriam da planilha (Data, Abertura, Máxima,
+    Mínima, Fechamento, Barras): só dias úteis e o horário do pregão do ativo, com quantos dias
+    forem necessários para somar 'linhas' barras (vários anos nos tamanhos maiores).
+    densidade_alternancia é a probabilidade de a barra seguinte ter a cor oposta, o que controla
+    a frequência e o tamanho das alternâncias. Mesmos parâmetros, mesmos candles.
+    """
+    pregao = PREGOES[ativo]
+    rng = np.random.default_rng(semente)
+    
+    abertura = pregao["abertura"].hour * 60 + pregao["abertura"].minute
+    fechamento = pregao["fechamento"].hour * 60 + pregao["fechamento"].minute
+    minutos = np.arange(abertura, fechamento + 1).astype("timedelta64[m]")
+    dias = pd.bdate_range(inicio, periods=-(-linhas // len(minutos))).to_numpy().astype("datetime64[m]")
+    datas = (dias[:, None] + minutos[None, :]).ravel()[:linhas]
+    dia = np.arange(linhas) // len(minutos)
+    
+    # Cor das barras (1 = compradora): cadeia que troca de cor com probabilidade densidade_alternancia
+    troca = rng.random(linhas) < densidade_alternancia
+    barras = ((np.cumsum(troca) + rng.integers(0, 2)) % 2).astype(np.int64)
+    
+    # Nível de abertura de cada dia: passeio com reversão à média, para não derivar em vários anos
+    nivel = np.zeros(len(dias))
+    variacoes = rng.normal(0, pregao["variacao_diaria"], len(dias))
+    for i in range(1, len(dias)):
+        nivel[i] = 0.98 * nivel[i - 1] + variacoes[i]
+    
+    # Preços em ticks: corpo no sentido da cor, abertura colada ao fechamento anterior e sombras
+    tick = pregao["tick"]
+    corpo = rng.geometric(1 / pregao["corpo_medio"], linhas) * np.where(barras == 1, 1, -1)
+    movimento = np.cumsum(rng.integers(-1, 2, linhas) + corpo)
+    inicio_do_dia = np.flatnonzero(np.r_[True, dia[1:] != dia[:-1]])
+    fechamento_ticks = movimento - (movimento - corpo)[inicio_do_dia][dia] + np.round(nivel).astype(np.int64)[dia]
+    abertura_ticks = fechamento_ticks - corpo
+    maxima_ticks = np.maximum(abertura_ticks, fechamento_ticks) + rng.geometric(1 / pregao["sombra_media"], linhas) - 1
+    minima_ticks = np.minimum(abertura_ticks, fechamento_ticks) - rng.geometric(1 / pregao["sombra_media"], linhas) + 1
+    
+    def preco(ticks):
+        return pregao["preco"] + ticks * tick
+    
+    return pd.DataFrame({
+        "Data": datas.astype("datetime64[ns]"),
+        "Abertura": preco(abertura_ticks),
+        "Máxima": preco(maxima_ticks),
+        "Mínima": preco(minima_ticks),
+        "Fechamento": preco(fechamento_ticks),
+        "Barras": barras
+    })
+
+# ===============================
+# Medição
+# ===============================
+def medir(funcao, repeticoes=3):
+    """
+    Tempo de parede (menor e mediana de 'repeticoes' execuções) e pico de memória alocada
+    (tracemalloc, que também enxerga os arrays do NumPy) numa execução à parte, para que o
+    rastreamento não entre no tempo
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        'tempo_min_s': round(min(tempos), 6),
+        'tempo_mediana_s': round(statistics.median(tempos), 6),
+        'pico_memoria_bytes': int(pico)
+    }
+
+def nivel_com_mais_ganhos(livro):
+    """Nível com mais ganhos no livro (o que tem mais ciclos para o Monte Carlo), ou None sem ganhos"""
+    niveis = livro.loc[livro['Pontos'] > 0, 'Nivel']
+    return int(niveis.value_counts().idxmax()) if len(niveis) else None
+
+def casos(candles, ativo="WIN"):
+    """
+    Funções medidas sobre os candles normalizados, com os argumentos usados pela página. Cada caso
+    é uma fábrica: montar as entradas (filtro do horário, detecção, livro...) fica fora da medição e
+    só acontece para os casos escolhidos, uma vez por entrada. A fábrica levanta ValueError quando
+    o caso não se aplica aos candles gerados.
+    """
+    pregao = PREGOES[ativo]
+    precificacao = dict(tabela_pontos=valores_por_ativo[pregao["ativo"]], ativo_escolhido=pregao["ativo"])
+    entradas = {}
+    
+    def entrada(nome, montar):
+        if nome not in entradas:
+            entradas[nome] = montar()
+        return entradas[nome]
+    
+    def dados():
+        return entrada("dados", lambda: preparar_para_simulacao(candles, pregao["abertura"], pregao["fechamento"]))
+    
+    def eventos():
+        return entrada("eventos", lambda: detectar_alternancias(dados(), window=6))
+    
+    def livro():
+        return entrada("livro", lambda: precificar(eventos(), **precificacao))
+    
+    def risco():
+        nivel = nivel_com_mais_ganhos(livro())
+        if nivel is None:
+            raise ValueError("Nenhum nível com ganho no livro: não há ciclos para o Monte Carlo")
+        return partial(risco_do_nivel, livro(), nivel, capital=10_000, limite_stops=20)
+    
+    return {
+        "simular": lambda: partial(simular, dados(), window=6, **precificacao),
+        "detectar_alternancias": lambda: partial(detectar_alternancias, dados(), window=6),
+        "detectar_alternancias_paralelo": lambda: partial(detectar_alternancias_paralelo, dados(), window=6),
+        "precificar": lambda: partial(precificar, eventos(), **precificacao),
+        "walk_forward": lambda: partial(walk_forward, indexar_dias(dados(), window=6), 60, 5, **precificacao),
+        "reamostrar": lambda: partial(reamostrar, candles, TEMPOS_GRAFICOS_PADRAO, pregao["abertura"], pregao["fechamento"]),
+        "risco_do_nivel": risco,
+        "analisar_sequencias_barras_por_categoria": lambda: partial(analisar_sequencias_barras_por_categoria, candles, 5),
+        "calcular_evolucao_probabilidade_sequencia": lambda: partial(calcular_evolucao_probabilidade_sequencia, candles, "10101"),
+        "calcular_range_diario": lambda: partial(calcular_range_diario, candles)
+    }
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=10, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def executar(tamanhos=TAMANHOS_PADRAO, ativo="WIN", densidade_alternancia=0.6, semente=0, repeticoes=3, funcoes=None):
+    """
+    Roda os benchmarks e devolve o documento gravado no JSON (ambiente, gerador, resultados e os
+    casos ignorados, com o motivo)
+    """
+    resultados, ignorados = [], []
+    for linhas in tamanhos:
+        candles = normalizar_candles(gerar_candles(linhas, ativo, densidade_alternancia, semente=semente))
+        for nome, fabrica in casos(candles, ativo).items():
+            if funcoes and nome not in funcoes:
+                continue
+            try:
+                funcao = fabrica()
+            except ValueError as erro:
+                ignorados.append({'funcao': nome, 'linhas': linhas, 'motivo': str(erro)})
+                print(f"{nome} | {linhas} linhas | ignorado: {erro}", file=sys.stderr)
+                continue
+            medida = medir(funcao, repeticoes)
+            resultados.append({'funcao': nome, 'linhas': linhas, **medida})
+            print(f"{nome} | {linhas} linhas | {medida['tempo_min_s']:.3f}s | "
+                  f"{medida['pico_memoria_bytes'] / 1024 ** 2:.1f} MB", file=sys.stderr)
+    
+    return {
+        'versao': VERSAO_RESULTADO,
+        'commit': _commit(),
+        'data': datetime.now().isoformat(timespec="seconds"),
+        'ambiente': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'plataforma': platform.platform(),
+            'nucleos': os.cpu_count()
+        },
+        'gerador': {
+            'ativo': ativo,
+            'densidade_alternancia': densidade_alternancia,
+            'semente': semente,
+            'repeticoes': repeticoes
+        },
+        'resultados': resultados,
+        'ignorados': ignorados
+    }
+
+def comparar(anterior, atual):
+    """Tempo e memória de duas execuções lado a lado, por função e tamanho (razão > 1 = ficou mais lento)"""
+    chaves = ['funcao', 'linhas']
+    tabela = pd.DataFrame(anterior['resultados']).merge(
+        pd.DataFrame(atual['resultados']), on=chaves, suffixes=('_antes', '_depois')
+    )
+    tabela['razao_tempo'] = (tabela['tempo_min_s_depois'] / tabela['tempo_min_s_antes']).round(3)
+    tabela['razao_memoria'] = (tabela['pico_memoria_bytes_depois'] / tabela['pico_memoria_bytes_antes']).round(3)
+    return tabela[chaves + ['tempo_min_s_antes', 'tempo_min_s_depois', 'razao_tempo',
+                            'pico_memoria_bytes_antes', 'pico_memoria_bytes_depois', 'razao_memoria']]
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m lateralizacoes.benchmark",
+        description="Mede simular (detecção e precificação), a análise de sequências, a evolução de probabilidade e o range diário sobre candles sintéticos."
+    )
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=TAMANHOS_PADRAO, help="quantidades de linhas")
+    parser.add_argument("--ativo", choices=sorted(PREGOES), default="WIN")
+    parser.add_argument("--densidade", type=float, default=0.6, help="probabilidade de troca de cor entre barras")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--funcoes", nargs="+", help="medir só estas funções (padrão: todas)")
+    parser.add_argument("--saida", default="benchmark.json", help="arquivo JSON com os resultados")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para comparar")
+    return parser
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    
+    documento = executar(args.tamanhos, args.ativo, args.densidade, args.semente, args.repeticoes, args.funcoes)
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(documento, arquivo, ensure_ascii=False, indent=2)
+    print(f"Gravado {args.saida} ({len(documento['resultados'])} medições)", file=sys.stderr)
+    
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            anterior = json.load(arquivo)
+        print(comparar(anterior, documento).to_string(index=False))
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
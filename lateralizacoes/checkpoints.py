@@ -0,0 +1,87 @@
+"""
+Checkpoints da simulação cronológica, retomados quando o mesmo histórico volta com novas sessões.
+O checkpoint é da detecção: tabela de pontos e contratos só entram na precificação. Cada checkpoint
+guarda a impressão (hash) das barras que processou, e só é retomado por dados que comecem por elas.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from lateralizacoes.simulacao import detectar_incremental, precificar
+
+MAX_CHECKPOINTS = 32
+
+# Colunas que a detecção lê: duas barras com os mesmos valores nelas dão os mesmos eventos
+COLUNAS_IMPRESSAO = ["Data", "DataApenas", "Barras"]
+
+_checkpoints = OrderedDict()
+_trava = threading.Lock()
+
+def impressao_do_historico(candles_cronologicos, linhas):
+    """Hash das colunas da detecção nas primeiras 'linhas' barras"""
+    impressao = hashlib.blake2b(digest_size=16)
+    for coluna in COLUNAS_IMPRESSAO:
+        valores = candles_cronologicos[coluna].to_numpy()[:linhas]
+        impressao.update(valores.dtype.str.encode())
+        impressao.update(np.ascontiguousarray(valores).tobytes())
+    return impressao.hexdigest()
+
+def continua_historico(candles_cronologicos, estado, impressao):
+    """
+    Confere se os dados começam exatamente pelas barras que o estado já processou: a última data
+    processada (teste rápido) e a impressão de todas as barras até ela
+    """
+    linhas = estado['linhas_recebidas']
+    if linhas == 0:
+        return True
+    if linhas > len(candles_cronologicos):
+        return False
+    if candles_cronologicos['Data'].iloc[linhas - 1] != estado['ultima_data']:
+        return False
+    return impressao_do_historico(candles_cronologicos, linhas) == impressao
+
+def detectar_cronologico(candles_cronologicos, chave, max_levels=350, window=6, arquivo=None):
+    """
+    Detecta os eventos em ordem cronológica reaproveitando um checkpoint guardado em chave: se os
+    dados continuam o histórico já processado, só as barras novas são processadas. Os checkpoints
+    ficam por (arquivo, chave); o do próprio arquivo é tentado primeiro e os de outros arquivos com
+    a mesma chave (o histórico antes das novas sessões) só valem se a impressão das barras bater.
+    """
+    with _trava:
+        candidatos = [
+            valor for (arquivo_salvo, chave_salva), valor in reversed(_checkpoints.items())
+            if chave_salva == chave and arquivo_salvo != arquivo
+        ]
+        if (arquivo, chave) in _checkpoints:
+            candidatos.insert(0, _checkpoints[(arquivo, chave)])
+    
+    parametros = dict(max_levels=max_levels, window=window)
+    
+    estado = next(
+        (estado for estado, impressao in candidatos if continua_historico(candles_cronologicos, estado, impressao)),
+        None
+    )
+    novos = candles_cronologicos if estado is None else candles_cronologicos.iloc[estado['linhas_recebidas']:]
+    
+    try:
+        eventos, estado = detectar_incremental(novos, estado, **parametros)
+    except ValueError:
+        # Checkpoint de outros parâmetros na mesma chave: recomeça do zero
+        eventos, estado = detectar_incremental(candles_cronologicos, None, **parametros)
+    
+    impressao = impressao_do_historico(candles_cronologicos, estado['linhas_recebidas'])
+    with _trava:
+        _checkpoints[(arquivo, chave)] = (estado, impressao)
+        _checkpoints.move_to_end((arquivo, chave))
+        while len(_checkpoints) > MAX_CHECKPOINTS:
+            _checkpoints.popitem(last=False)
+    
+    return eventos
+
+def simular_cronologico(candles_cronologicos, chave, max_levels=350, window=6, contratos=1,
+                        tabela_pontos=None, ativo_escolhido=None, arquivo=None):
+    """detectar_cronologico com os eventos precificados (livro de operações)"""
+    eventos = detectar_cronologico(candles_cronologicos, chave, max_levels, window, arquivo)
+    return precificar(eventos, tabela_pontos, contratos, ativo_escolhido=ativo_escolhido)
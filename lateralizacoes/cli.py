@@ -0,0 +1,197 @@
+"""
+Execução em lote, sem o Streamlit: roda a simulação, as estatísticas por nível e o range
+diário sobre todos os arquivos de uma pasta e uma matriz de configurações.
+
+Exemplo:
+    python -m lateralizacoes dados/ --saida resultados/ --ativo WIN --window 4 6 8 \\
+        --horario 09:00-12:02 09:00-17:00 --contratos 1 2 --jobs 8
+"""
+import argparse
+import fnmatch
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from lateralizacoes.estatisticas import calcular_estatisticas_por_nivel, resumir_operacoes
+from lateralizacoes.ingestao import carregar_candles
+from lateralizacoes.paralelo import criar_pool, numero_de_processos
+from lateralizacoes.range_diario import calcular_media_range_por_periodo, calcular_range_diario, resumir_dias
+from lateralizacoes.sessoes import construir_indice_sessoes, selecionar_sessoes
+from lateralizacoes.simulacao import COLUNAS_SIMULACAO, simular, valores_por_ativo
+
+ATALHOS_ATIVO = {
+    "WIN": "Mini Índice (WIN)",
+    "WDO": "Mini Dólar (WDO)"
+}
+
+def _ativo(valor):
+    ativo = ATALHOS_ATIVO.get(valor.upper(), valor)
+    if ativo not in valores_por_ativo:
+        raise argparse.ArgumentTypeError(f"ativo desconhecido: {valor} (use {', '.join(ATALHOS_ATIVO)})")
+    return ativo
+
+def _horario(valor):
+    try:
+        inicio, fim = (datetime.strptime(parte.strip(), "%H:%M").time() for parte in valor.split("-"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"horário inválido: {valor} (use HH:MM-HH:MM)")
+    return inicio, fim
+
+def _ler_arquivo(caminho):
+    with open(caminho, "rb") as arquivo:
+        return carregar_candles(arquivo.read())
+
+def _anos(candles, anos):
+    disponiveis = sorted(candles["Ano"].dropna().unique())
+    return [ano for ano in disponiveis if not anos or ano in anos]
+
+def processar_configuracao(candles, indice, arquivo, ativo, window, hora_inicio, hora_fim, contratos, anos=None):
+    """Simula os candles de um arquivo numa configuração, ano a ano; devolve as linhas de resumo e de níveis"""
+    configuracao = {
+        'Arquivo': arquivo,
+        'Ativo': ativo,
+        'Window': window,
+        'Hora Inicial': hora_inicio.strftime("%H:%M"),
+        'Hora Final': hora_fim.strftime("%H:%M"),
+        'Contratos': contratos
+    }
+    
+    resumos, niveis = [], []
+    for ano in _anos(candles, anos):
+        operacoes = simular(
+            selecionar_sessoes(candles, indice, hora_inicio, hora_fim, ano, colunas=COLUNAS_SIMULACAO),
+            window=window,
+            contratos=contratos,
+            tabela_pontos=valores_por_ativo[ativo],
+            ativo_escolhido=ativo
+        )
+        resumos.append({**configuracao, 'Ano': ano, **resumir_operacoes(operacoes)})
+        
+        resumo_niveis, _ = calcular_estatisticas_por_nivel(operacoes)
+        for nivel, linha in resumo_niveis.iterrows():
+            niveis.append({
+                **configuracao,
+                'Ano': ano,
+                'Nível': nivel,
+                'Probabilidade de Ganho (%)': linha['Probabilidade de Ganho (%)'],
+                'Ganhos': int(linha['Ganhos']),
+                'Stops': int(linha['Stops']),
+                'Saldo (pontos)': int(linha['Saldo']),
+                'Média Stops entre Ganhos': linha['Média Stops entre Ganhos'],
+                'Máximo Stops entre Ganhos': int(linha['Máximo Stops entre Ganhos'])
+            })
+    
+    return resumos, niveis
+
+def processar_range(candles, arquivo, anos=None):
+    """Range diário médio por ano do arquivo (vazio se não houver Máxima/Mínima)"""
+    resumo = resumir_dias(candles)
+    linhas = []
+    for ano in _anos(candles, anos):
+        range_ano = calcular_range_diario(candles, ano, resumo)
+        if range_ano is None or range_ano.empty:
+            continue
+        linhas.append({
+            'Arquivo': arquivo,
+            'Ano': ano,
+            'Dias': len(range_ano),
+            'Range Médio': round(range_ano['Range_Diario'].mean(), 2),
+            'Maior Range': range_ano['Range_Diario'].max(),
+            'Menor Range': range_ano['Range_Diario'].min(),
+            'Média 30 Dias': calcular_media_range_por_periodo(candles, 30, ano, resumo),
+            'Média 3 Meses': calcular_media_range_por_periodo(candles, 90, ano, resumo),
+            'Média 6 Meses': calcular_media_range_por_periodo(candles, 180, ano, resumo)
+        })
+    return linhas
+
+def processar_arquivo(caminho, configuracoes, anos=None):
+    """
+    Todas as configurações e o range diário de um arquivo, lido e indexado uma única vez
+    (executado nos workers, um arquivo por tarefa). Configurações são tuplas (ativo, window,
+    (hora_inicio, hora_fim), contratos); devolve (resumos, níveis, ranges).
+    """
+    candles = _ler_arquivo(caminho)
+    arquivo = os.path.basename(caminho)
+    indice = construir_indice_sessoes(candles)
+    
+    resumos, niveis = [], []
+    for ativo, window, (hora_inicio, hora_fim), contratos in configuracoes:
+        resumos_configuracao, niveis_configuracao = processar_configuracao(
+            candles, indice, arquivo, ativo, window, hora_inicio, hora_fim, contratos, anos
+        )
+        resumos.extend(resumos_configuracao)
+        niveis.extend(niveis_configuracao)
+    
+    return resumos, niveis, processar_range(candles, arquivo, anos)
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m lateralizacoes",
+        description="Executa o detector de lateralizações em lote sobre uma pasta de arquivos de candles."
+    )
+    parser.add_argument("entrada", help="pasta com os arquivos de candles")
+    parser.add_argument("--padrao", default="*.xlsx", help="padrão dos arquivos na pasta (padrão: *.xlsx)")
+    parser.add_argument("--saida", default="resultados", help="pasta onde as tabelas serão gravadas")
+    parser.add_argument("--ativo", nargs="+", type=_ativo, default=[_ativo("WIN")], help="WIN, WDO ou o nome completo")
+    parser.add_argument("--window", nargs="+", type=int, default=[6])
+    parser.add_argument("--horario", nargs="+", type=_horario, default=[_horario("09:00-12:02")], help="HH:MM-HH:MM")
+    parser.add_argument("--contratos", nargs="+", type=int, default=[1])
+    parser.add_argument("--anos", nargs="+", type=int, help="anos a analisar (padrão: todos)")
+    parser.add_argument("--jobs", type=int, default=None, help="processos em paralelo (padrão: todos os núcleos)")
+    return parser
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    
+    arquivos = sorted(
+        os.path.join(args.entrada, nome) for nome in os.listdir(args.entrada)
+        if not nome.startswith("~$") and fnmatch.fnmatch(nome, args.padrao)
+    )
+    if not arquivos:
+        print(f"Nenhum arquivo '{args.padrao}' em {args.entrada}", file=sys.stderr)
+        return 1
+    
+    configuracoes = list(itertools.product(args.ativo, args.window, args.horario, args.contratos))
+    total = len(arquivos)
+    print(f"{len(arquivos)} arquivo(s), {len(arquivos) * len(configuracoes)} simulação(ões), "
+          f"{numero_de_processos(args.jobs)} processo(s)", file=sys.stderr)
+    
+    resumos, niveis, ranges = [], [], []
+    inicio = time.perf_counter()
+    with criar_pool(args.jobs) as pool:
+        futuros = {
+            pool.submit(processar_arquivo, caminho, configuracoes, args.anos): os.path.basename(caminho)
+            for caminho in arquivos
+        }
+        
+        for concluidos, futuro in enumerate(as_completed(futuros), start=1):
+            descricao = futuros[futuro]
+            try:
+                resumos_arquivo, niveis_arquivo, ranges_arquivo = futuro.result()
+            except Exception as erro:
+                print(f"[{concluidos}/{total}] ERRO {descricao}: {erro}", file=sys.stderr)
+                continue
+            
+            resumos.extend(resumos_arquivo)
+            niveis.extend(niveis_arquivo)
+            ranges.extend(ranges_arquivo)
+            print(f"[{concluidos}/{total}] {descricao}: {len(configuracoes)} configuração(ões) e range diário "
+                  f"({time.perf_counter() - inicio:.1f}s)", file=sys.stderr)
+    
+    os.makedirs(args.saida, exist_ok=True)
+    chaves = ['Arquivo', 'Ativo', 'Window', 'Hora Inicial', 'Hora Final', 'Contratos', 'Ano']
+    tabelas = {
+        "resumo.csv": pd.DataFrame(resumos).sort_values(chaves) if resumos else pd.DataFrame(),
+        "niveis.csv": pd.DataFrame(niveis).sort_values(chaves + ['Nível']) if niveis else pd.DataFrame(),
+        "range_diario.csv": pd.DataFrame(ranges).sort_values(['Arquivo', 'Ano']) if ranges else pd.DataFrame()
+    }
+    for nome, tabela in tabelas.items():
+        tabela.to_csv(os.path.join(args.saida, nome), index=False, encoding="utf-8-sig")
+        print(f"Gravado {os.path.join(args.saida, nome)} ({len(tabela)} linhas)", file=sys.stderr)
+    
+    return 0
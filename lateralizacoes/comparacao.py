@@ -0,0 +1,88 @@
+"""
+Simulação ano a ano para a comparação entre anos, com execução paralela. O cache guarda os
+eventos detectados (que não dependem de tabela de pontos, ativo ou contratos), então mudar
+só a precificação não roda a detecção de novo.
+"""
+import threading
+from collections import OrderedDict
+
+from lateralizacoes.paralelo import criar_pool, numero_de_processos
+from lateralizacoes.sessoes import indice_sessoes, selecionar_sessoes
+from lateralizacoes.simulacao import (
+    COLUNAS_SIMULACAO,
+    LINHAS_MINIMAS_PARALELO,
+    detectar_alternancias,
+    detectar_alternancias_paralelo,
+    precificar,
+)
+
+MAX_RESULTADOS_CACHE = 256
+
+_cache_anos = OrderedDict()
+_trava = threading.Lock()
+
+def _chave(chave_arquivo, ano, window, hora_inicio, hora_fim):
+    return (chave_arquivo, ano, window, hora_inicio, hora_fim)
+
+def detectar_ano(dados_ano, window):
+    """Detecta os eventos de um ano já filtrado no horário e invertido (executado nos workers)"""
+    return detectar_alternancias(dados_ano, window=window)
+
+def eventos_anos(candles, chave_arquivo, anos, window, hora_inicio, hora_fim, max_workers=None):
+    """
+    Retorna {ano: eventos de detectar_alternancias} para os anos pedidos.
+    Anos já detectados com o mesmo window e horário vêm do cache; os demais rodam em paralelo.
+    """
+    chaves = {ano: _chave(chave_arquivo, ano, window, hora_inicio, hora_fim) for ano in anos}
+    
+    resultados = {}
+    with _trava:
+        for ano, chave in chaves.items():
+            if chave in _cache_anos:
+                _cache_anos.move_to_end(chave)
+                resultados[ano] = _cache_anos[chave]
+    
+    faltantes = [ano for ano in anos if ano not in resultados]
+    
+    # Cada ano é selecionado no índice de sessões do arquivo, sem varrer Ano/horário
+    indice = indice_sessoes(candles, chave_arquivo)
+    
+    def dados_do_ano(ano):
+        return selecionar_sessoes(candles, indice, hora_inicio, hora_fim, ano, colunas=COLUNAS_SIMULACAO)
+    
+    if len(faltantes) == 1:
+        # Um único ano só sobe o pool de processos quando é grande o bastante para dividir os dias
+        ano = faltantes[0]
+        dados = dados_do_ano(ano)
+        if len(dados) >= LINHAS_MINIMAS_PARALELO and numero_de_processos(max_workers) > 1:
+            resultados[ano] = detectar_alternancias_paralelo(dados, window=window, max_workers=max_workers)
+        else:
+            resultados[ano] = detectar_ano(dados, window)
+    elif faltantes:
+        with criar_pool(min(numero_de_processos(max_workers), len(faltantes))) as pool:
+            futuros = {
+                ano: pool.submit(detectar_ano, dados_do_ano(ano), window)
+                for ano in faltantes
+            }
+            for ano, futuro in futuros.items():
+                resultados[ano] = futuro.result()
+    
+    with _trava:
+        for ano in faltantes:
+            _cache_anos[chaves[ano]] = resultados[ano]
+        while len(_cache_anos) > MAX_RESULTADOS_CACHE:
+            _cache_anos.popitem(last=False)
+    
+    return {ano: resultados[ano] for ano in anos}
+
+def simular_anos(candles, chave_arquivo, anos, window, hora_inicio, hora_fim, contratos=1,
+                 tabela_pontos=None, ativo_escolhido=None, max_workers=None):
+    """
+    Retorna {ano: livro de operações} para os anos pedidos: os eventos de eventos_anos
+    precificados com a tabela de pontos, o ativo e os contratos.
+    """
+    eventos = eventos_anos(candles, chave_arquivo, anos, window, hora_inicio, hora_fim, max_workers)
+    return {
+        ano: precificar(eventos[ano], tabela_pontos, contratos, ativo_escolhido=ativo_escolhido)
+        for ano in anos
+    }
@@ -0,0 +1,127 @@
+"""
+Diagnóstico de desempenho por etapa: tempo de parede, linhas processadas e, opcionalmente,
+pico de memória (tracemalloc). Cada etapa concluída também vai para o log como uma linha JSON,
+que só é escrita depois de configurar_log (ou com o logging configurado pela aplicação).
+
+O tempo é só um perf_counter por etapa e pode ficar sempre ligado; o tracemalloc deixa as
+alocações do Python mais lentas, por isso a memória só é medida quando pedida.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+NIVEL_LOG_PADRAO = "INFO"
+
+# O tracemalloc é do processo inteiro: as etapas abertas de todas as execuções (sessões da página,
+# threads) ficam aqui por id, para que o pico zerado por uma não se perca para as outras
+_medicoes_abertas = {}
+_rastreamento_proprio = False
+_trava = threading.Lock()
+
+def configurar_log(nivel=None):
+    """
+    Escreve as linhas JSON das etapas na saída de erro, no nível pedido ou no da variável de
+    ambiente DETECTOR_LOG_LEVEL (padrão: INFO; WARNING desliga as etapas). Pode ser chamada a
+    cada rerun da página: o handler só é criado uma vez.
+    """
+    logger.setLevel((nivel or os.environ.get("DETECTOR_LOG_LEVEL") or NIVEL_LOG_PADRAO).upper())
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+        logger.addHandler(handler)
+        # Sem repetir as linhas num handler da raiz configurado pela aplicação
+        logger.propagate = False
+
+def _abrir_medicao(registro):
+    """Liga o tracemalloc na primeira etapa aberta e zera o pico para medir esta; devolve a memória atual"""
+    global _rastreamento_proprio
+    with _trava:
+        if not _medicoes_abertas:
+            # Se alguém já rastreava, não é este módulo que desliga
+            _rastreamento_proprio = not tracemalloc.is_tracing()
+            if _rastreamento_proprio:
+                tracemalloc.start()
+        atual, pico = tracemalloc.get_traced_memory()
+        # As etapas abertas (de fora desta ou de outras execuções) guardam o que já tinham alcançado
+        for aberta in _medicoes_abertas.values():
+            aberta['_pico'] = max(aberta['_pico'], pico)
+        tracemalloc.reset_peak()
+        registro['_pico'] = atual
+        _medicoes_abertas[id(registro)] = registro
+    return atual
+
+def _fechar_medicao(registro):
+    """Pico da etapa desde que foi aberta; a última etapa fechada desliga o tracemalloc que ligou"""
+    with _trava:
+        pico = max(tracemalloc.get_traced_memory()[1], registro.pop('_pico'))
+        del _medicoes_abertas[id(registro)]
+        if not _medicoes_abertas and _rastreamento_proprio:
+            tracemalloc.stop()
+    return pico
+
+def novo_diagnostico(medir_memoria=False):
+    """Registro das etapas de uma execução (uma por rerun da página ou por chamada em lote)"""
+    return {
+        'execucao': uuid.uuid4().hex[:8],
+        'medir_memoria': medir_memoria,
+        'etapas': [],
+        'pilha': []
+    }
+
+@contextmanager
+def etapa(diagnostico, nome, linhas=None):
+    """
+    Mede o bloco como uma etapa do diagnóstico (sem diagnóstico, não faz nada). Etapas dentro
+    de etapas ficam um nível abaixo; as linhas podem ser informadas depois, no registro devolvido.
+    """
+    if diagnostico is None:
+        yield {}
+        return
+    
+    pilha = diagnostico['pilha']
+    registro = {'etapa': nome, 'nivel': len(pilha), 'linhas': linhas, 'tempo_s': None, 'pico_memoria_bytes': None}
+    diagnostico['etapas'].append(registro)
+    
+    medir_memoria = diagnostico['medir_memoria']
+    if medir_memoria:
+        atual = _abrir_medicao(registro)
+    
+    pilha.append(registro)
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro['tempo_s'] = time.perf_counter() - inicio
+        pilha.pop()
+        
+        if medir_memoria:
+            registro['pico_memoria_bytes'] = max(0, _fechar_medicao(registro) - atual)
+        
+        logger.info(json.dumps({'execucao': diagnostico['execucao'], **registro}, ensure_ascii=False, default=str))
+
+def tabela_diagnostico(diagnostico):
+    """Etapas na ordem em que começaram, com o nível de aninhamento indicado no nome"""
+    return pd.DataFrame({
+        'Etapa': [
+            "   " * (registro['nivel'] - 1) + "└ " * (registro['nivel'] > 0) + registro['etapa']
+            for registro in diagnostico['etapas']
+        ],
+        'Linhas': pd.array([registro['linhas'] for registro in diagnostico['etapas']], dtype="Int64"),
+        'Tempo (ms)': [
+            registro['tempo_s'] * 1000 if registro['tempo_s'] is not None else None
+            for registro in diagnostico['etapas']
+        ],
+        'Pico de Memória (MB)': [
+            registro['pico_memoria_bytes'] / 1024 ** 2 if registro['pico_memoria_bytes'] is not None else None
+            for registro in diagnostico['etapas']
+        ]
+    })
@@ -0,0 +1,205 @@
+"""Estatísticas por nível: sobre o livro de operações (nível, sequência, pontos) ou a matriz Nível x Sequência"""
+import numpy as np
+import pandas as pd
+
+# ===============================
+# Kernel das estatísticas por nível
+# ===============================
+def _kernel_por_nivel(niveis, sequencias, pontos):
+    """
+    Uma passada vetorizada sobre as operações (linear no nº de operações, fora a ordenação):
+    contagens por nível e os stops antes de cada ganho, mais os stops finais de cada nível.
+    Operações com pontos zero não contam, como nas funções sobre a matriz.
+    """
+    if len(niveis) and np.issubdtype(niveis.dtype, np.integer):
+        # Níveis inteiros e poucos: contagem em vez de ordenação para achar os rótulos
+        minimo = int(niveis.min())
+        deslocados = niveis.astype(np.int64) - minimo
+        rotulos = np.flatnonzero(np.bincount(deslocados)) + minimo
+        posicao = np.zeros(int(deslocados.max()) + 1, dtype=np.int64)
+        posicao[rotulos - minimo] = np.arange(len(rotulos))
+        grupo_todas = posicao[deslocados]
+    else:
+        rotulos = np.unique(niveis)
+        grupo_todas = np.searchsorted(rotulos, niveis)
+    quantidade = len(rotulos)
+
+    # Operações reais de cada nível, na ordem das sequências
+    if len(sequencias) and np.all(sequencias[1:] >= sequencias[:-1]):
+        # Livro já em ordem de sequência (saída de simular): basta uma ordenação estável por nível
+        ordem = np.argsort(grupo_todas.astype(np.int16) if quantidade < 2**15 else grupo_todas, kind='stable')
+    else:
+        ordem = np.lexsort((sequencias, grupo_todas))
+    ordem = ordem[pontos[ordem] != 0]
+    grupo = grupo_todas[ordem]
+    ganho = pontos[ordem] > 0
+
+    operacoes = np.bincount(grupo, minlength=quantidade)
+    ganhos = np.bincount(grupo, weights=ganho, minlength=quantidade).astype(np.int64)
+    saldo = np.bincount(grupo_todas, weights=pontos, minlength=quantidade).round().astype(np.int64)
+    inicio = np.searchsorted(grupo, np.arange(quantidade), side='left')
+    fim = np.searchsorted(grupo, np.arange(quantidade), side='right')
+
+    # Stops antes de cada ganho = distância até o ganho anterior do mesmo nível (ou o início do nível)
+    posicao_ganho = np.flatnonzero(ganho)
+    grupo_ganho = grupo[posicao_ganho]
+    primeiro_do_nivel = np.r_[True, grupo_ganho[1:] != grupo_ganho[:-1]]
+    anterior = np.where(primeiro_do_nivel, inicio[grupo_ganho] - 1, np.r_[-1, posicao_ganho[:-1]])
+    stops_antes = posicao_ganho - anterior - 1
+
+    # Stops depois do último ganho de cada nível (entram no fim da lista quando existem)
+    ultimo_ganho = inicio - 1
+    ultimo_do_nivel = np.r_[grupo_ganho[1:] != grupo_ganho[:-1], True] if len(grupo_ganho) else np.array([], dtype=bool)
+    ultimo_ganho[grupo_ganho[ultimo_do_nivel]] = posicao_ganho[ultimo_do_nivel]
+    stops_finais = fim - ultimo_ganho - 1
+    com_finais = np.flatnonzero(stops_finais > 0)
+
+    # Lista de stops entre ganhos de todos os níveis, já na ordem de cada nível
+    grupo_lista = np.r_[grupo_ganho, com_finais]
+    stops_lista = np.r_[stops_antes, stops_finais[com_finais]]
+    chave = np.r_[2 * posicao_ganho, 2 * fim[com_finais] - 1]
+    ordem_lista = np.argsort(chave, kind='stable')
+    grupo_lista, stops_lista = grupo_lista[ordem_lista], stops_lista[ordem_lista]
+
+    return rotulos, operacoes, ganhos, saldo, grupo_lista, stops_lista
+
+def calcular_estatisticas_por_nivel(operacoes):
+    """
+    Todas as estatísticas por nível a partir do livro de operações, numa única passada vetorizada.
+    Retorna (resumo por nível, stops entre ganhos):
+      - resumo: Operações, Ganhos, Stops, Saldo, Probabilidade de Ganho (%),
+        Média e Máximo de Stops entre Ganhos, indexado por "Nível"
+      - stops entre ganhos: Nível, Ordem e Stops entre Ganhos (formato longo)
+    """
+    rotulos, contagem, ganhos, saldo, grupo_lista, stops_lista = _kernel_por_nivel(
+        operacoes['Nivel'].to_numpy(), operacoes['Sequencia'].to_numpy(), operacoes['Pontos'].to_numpy()
+    )
+
+    quantidade = len(rotulos)
+    listas = np.bincount(grupo_lista, minlength=quantidade)
+    soma_stops = np.bincount(grupo_lista, weights=stops_lista, minlength=quantidade)
+    inicio_nivel = np.cumsum(listas) - listas
+    
+    # A lista vem agrupada por nível: o máximo de cada nível é um reduceat sobre o seu trecho
+    maximo_stops = np.zeros(quantidade, dtype=np.int64)
+    com_lista = np.flatnonzero(listas)
+    if len(com_lista):
+        maximo_stops[com_lista] = np.maximum.reduceat(stops_lista, inicio_nivel[com_lista])
+
+    resumo = pd.DataFrame({
+        'Operações': contagem.astype(np.int64),
+        'Ganhos': ganhos,
+        'Stops': (contagem - ganhos).astype(np.int64),
+        'Saldo': saldo,
+        'Probabilidade de Ganho (%)': np.where(contagem > 0, ganhos / np.maximum(contagem, 1) * 100, 0),
+        'Média Stops entre Ganhos': np.where(listas > 0, soma_stops / np.maximum(listas, 1), 0),
+        'Máximo Stops entre Ganhos': maximo_stops
+    }, index=pd.Index(rotulos.astype(np.int64), name="Nível"))
+
+    stops = pd.DataFrame({
+        'Nível': rotulos[grupo_lista].astype(np.int64),
+        'Ordem': np.arange(len(grupo_lista)) - inicio_nivel[grupo_lista] + 1,
+        'Stops entre Ganhos': stops_lista.astype(np.int64)
+    })
+
+    return resumo, stops
+
+def stops_do_nivel(stops, nivel):
+    """Lista de stops entre ganhos de um nível, da tabela longa de calcular_estatisticas_por_nivel"""
+    return stops.loc[stops['Nível'] == nivel, 'Stops entre Ganhos'].tolist()
+
+# ===============================
+# Estatísticas sobre a matriz Nível x Sequência (mesmo kernel)
+# ===============================
+def stops_entre_ganhos(pontos):
+    """Quantidade de stops antes de cada ganho (mais os stops finais, se houver) numa sequência de pontos"""
+    pontos = np.asarray(pontos)
+    pontos = pontos[pontos != 0]
+    _, _, _, _, _, stops_lista = _kernel_por_nivel(
+        np.zeros(len(pontos), dtype=np.int64), np.arange(len(pontos)), pontos
+    )
+    return stops_lista.tolist()
+
+def _kernel_da_matriz(df, com_total=False):
+    """Aplica o kernel às linhas da matriz (NaN e zeros são ignorados); os níveis são as posições das linhas"""
+    valores = (df if com_total else df.drop(columns='Total por Linha', errors='ignore')).to_numpy(dtype=float)
+    linhas, colunas = np.nonzero(np.nan_to_num(valores) != 0)
+    return _kernel_por_nivel(
+        np.r_[np.arange(len(df)), linhas], np.r_[np.full(len(df), -1), colunas],
+        np.r_[np.zeros(len(df)), valores[linhas, colunas]]
+    )
+
+def calcular_media_stops_entre_ganhos_por_linha(df):
+    """Calcula a média de stops entre ganhos, considerando apenas operações reais"""
+    _, _, _, _, grupo_lista, stops_lista = _kernel_da_matriz(df)
+    listas = np.bincount(grupo_lista, minlength=len(df))
+    soma = np.bincount(grupo_lista, weights=stops_lista, minlength=len(df))
+
+    # Média apenas se houve stops/ganhos na linha; senão zero
+    return [soma[i] / listas[i] if listas[i] else 0 for i in range(len(df))]
+
+def extrair_stops_entre_gains_por_nivel(df, nivel):
+    """Extrai sequência de stops entre gains para um nível específico"""
+    return stops_entre_ganhos(df.loc[nivel].drop('Total por Linha', errors='ignore').fillna(0).to_numpy())
+
+def calcular_probabilidade_ganho_por_nivel(df_numerico):
+    """Calcula a probabilidade de ganho para cada nível considerando apenas operações reais"""
+    # Como antes, todas as colunas da linha entram na contagem (inclusive 'Total por Linha')
+    _, contagem, ganhos, _, _, _ = _kernel_da_matriz(df_numerico, com_total=True)
+
+    return {
+        nivel: (ganhos[i] / contagem[i]) * 100 if contagem[i] else 0
+        for i, nivel in enumerate(df_numerico.index)
+        if nivel != "TOTAL"
+    }
+
+# ===============================
+# Atalhos sobre o livro de operações
+# ===============================
+def resumo_por_nivel(operacoes):
+    """Operações reais (pontos diferentes de zero), ganhos, stops, saldo e probabilidade de ganho por nível"""
+    return calcular_estatisticas_por_nivel(operacoes)[0]
+
+def totais_por_nivel(operacoes):
+    """Saldo de pontos por nível com a linha TOTAL, como a coluna 'Total por Linha' da tabela"""
+    totais = operacoes.groupby('Nivel')['Pontos'].sum().rename("Total por Linha").to_frame()
+    totais.index = totais.index.astype(object)
+    totais.index.name = "Nível"
+    totais.loc["TOTAL"] = totais["Total por Linha"].sum()
+    return totais
+
+def stops_entre_ganhos_por_nivel(operacoes):
+    """{nível: stops entre ganhos}, percorrendo as operações reais de cada nível na ordem das sequências"""
+    resumo, stops = calcular_estatisticas_por_nivel(operacoes)
+    por_nivel = {nivel: [] for nivel in resumo.index}
+    for nivel, valores in stops.groupby('Nível')['Stops entre Ganhos']:
+        por_nivel[nivel] = valores.tolist()
+    return por_nivel
+
+def medias_stops_entre_ganhos(operacoes):
+    """Média de stops entre ganhos por nível (zero onde não houve operação)"""
+    return calcular_estatisticas_por_nivel(operacoes)[0]['Média Stops entre Ganhos']
+
+def resumir_operacoes(operacoes):
+    """Resumo geral de uma simulação: pontos, operações, probabilidade de ganho e média de stops entre ganhos"""
+    if operacoes.empty:
+        return {
+            'Total Pontos': 0, 'Operações': 0, 'Ganhos': 0, 'Stops': 0,
+            'Prob. Ganho (%)': 0.0, 'Média Stops entre Ganhos': 0.0
+        }
+
+    total = len(operacoes)
+    ganhos = int((operacoes['Pontos'] > 0).sum())
+
+    # Mesma média geral da aba de estatísticas: apenas linhas que tiveram ganhos
+    medias = medias_stops_entre_ganhos(operacoes)
+    medias_com_ganhos = medias[medias > 0].tolist()
+
+    return {
+        'Total Pontos': int(operacoes['Pontos'].sum()),
+        'Operações': total,
+        'Ganhos': ganhos,
+        'Stops': total - ganhos,
+        'Prob. Ganho (%)': ganhos / total * 100,
+        'Média Stops entre Ganhos': sum(medias_com_ganhos) / len(medias_com_ganhos) if medias_com_ganhos else 0.0
+    }
@@ -0,0 +1,167 @@
+"""
+Leitura das planilhas de candles com cache pelo hash do conteúdo:
+memória (LRU com limite de tamanho) e arquivo Parquet em disco
+"""
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from lateralizacoes.diagnostico import etapa
+
+LIMITE_CACHE_BYTES = 1024 * 1024 * 1024
+PASTA_CACHE = os.environ.get(
+    "DETECTOR_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "detector-lateralizacoes")
+)
+COLUNAS_DERIVADAS = ["Ano", "DataApenas", "Hora"]
+
+# Muda quando o formato das colunas derivadas muda (invalida os Parquet antigos)
+VERSAO_SIDECAR = 2
+
+_cache = OrderedDict()
+_trava = threading.Lock()
+
+def hash_conteudo(conteudo):
+    """Identifica o arquivo pelo SHA-256 dos bytes enviados"""
+    return hashlib.sha256(conteudo).hexdigest()
+
+def compactar_colunas(candles):
+    """
+    Reduz as colunas numéricas do arquivo ao menor tipo que guarda exatamente os mesmos valores:
+    inteiros (Barras -> int8), preços inteiros -> int32 e preços que cabem em float32 -> float32
+    """
+    for coluna in candles.columns:
+        valores = candles[coluna]
+        if pd.api.types.is_bool_dtype(valores) or not pd.api.types.is_numeric_dtype(valores):
+            continue
+        
+        if pd.api.types.is_integer_dtype(valores):
+            candles[coluna] = pd.to_numeric(valores, downcast="integer")
+        elif valores.notna().all() and (valores == np.round(valores)).all() \
+                and valores.abs().max() < np.iinfo(np.int32).max:
+            candles[coluna] = pd.to_numeric(valores.astype(np.int64), downcast="integer")
+        elif (valores.astype(np.float32).astype(valores.dtype) == valores)[valores.notna()].all():
+            candles[coluna] = valores.astype(np.float32)
+    
+    return candles
+
+def normalizar_candles(candles):
+    """
+    Limpa os nomes das colunas, compacta as colunas numéricas e adiciona, a partir de 'Data':
+    Ano (int16), DataApenas (dia como int32, dias desde 1970-01-01) e Hora (minutos do dia, int16).
+    Dia/horário NaT ficam como -1. Textos de data para exibição são formatados só na hora de mostrar.
+    """
+    candles.columns = candles.columns.str.strip()
+    
+    if "Data" in candles.columns:
+        candles["Data"] = pd.to_datetime(candles["Data"], dayfirst=True, errors="coerce")
+    candles = compactar_colunas(candles)
+    
+    if "Data" in candles.columns:
+        datas = candles["Data"].to_numpy()
+        validas = ~np.isnat(datas)
+        dias = datas.astype("datetime64[D]")
+        minutos = (datas - dias).astype("timedelta64[m]").astype(np.int64)
+        
+        candles["Ano"] = candles["Data"].dt.year
+        if validas.all():
+            candles["Ano"] = candles["Ano"].astype(np.int16)
+        candles["DataApenas"] = np.where(validas, dias.astype(np.int64), -1).astype(np.int32)
+        candles["Hora"] = np.where(validas, minutos, -1).astype(np.int16)
+    
+    return candles
+
+def microssegundos_do_horario(hora):
+    return ((hora.hour * 60 + hora.minute) * 60 + hora.second) * 1_000_000 + hora.microsecond
+
+def mascara_horario(candles, hora_inicio, hora_fim):
+    """
+    Linhas com horário entre hora_inicio e hora_fim (inclusive), comparando o horário exato de
+    'Data' em microssegundos, vetorizado (mesmo resultado da comparação com datetime.time)
+    """
+    datas = candles["Data"].to_numpy()
+    horario = (datas - datas.astype("datetime64[D]")).astype("timedelta64[us]").astype(np.int64)
+    validas = ~np.isnat(datas)
+    return validas & (horario >= microssegundos_do_horario(hora_inicio)) & (horario <= microssegundos_do_horario(hora_fim))
+
+def ler_planilha(conteudo):
+    """Lê o Excel a partir dos bytes e normaliza as colunas"""
+    return normalizar_candles(pd.read_excel(io.BytesIO(conteudo)))
+
+def _caminho_sidecar(chave):
+    return os.path.join(PASTA_CACHE, f"{chave}.v{VERSAO_SIDECAR}.parquet")
+
+def _ler_sidecar(chave):
+    caminho = _caminho_sidecar(chave)
+    if not os.path.exists(caminho):
+        return None
+    try:
+        return pd.read_parquet(caminho)
+    except Exception:
+        # Arquivo corrompido ou de versão incompatível: refaz a leitura do Excel
+        return None
+
+def _gravar_sidecar(chave, candles):
+    caminho = _caminho_sidecar(chave)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(PASTA_CACHE, exist_ok=True)
+        candles.to_parquet(temporario, index=False)
+        os.replace(temporario, caminho)
+    except Exception:
+        # Colunas que o Parquet não aceita (tipos mistos, nomes não textuais):
+        # segue só com o cache em memória
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+def _guardar_em_memoria(chave, candles):
+    tamanho = int(candles.memory_usage(deep=True).sum())
+    if tamanho > LIMITE_CACHE_BYTES:
+        return
+    
+    _cache[chave] = (candles, tamanho)
+    _cache.move_to_end(chave)
+    
+    # Remove os menos usados até caber no limite
+    total = sum(t for _, t in _cache.values())
+    while total > LIMITE_CACHE_BYTES:
+        _, (_, tamanho_removido) = _cache.popitem(last=False)
+        total -= tamanho_removido
+
+def carregar_candles(conteudo, chave=None, diagnostico=None):
+    """
+    Retorna os candles normalizados do arquivo, lendo o Excel só na primeira vez.
+    O DataFrame devolvido é compartilhado pelo cache e não deve ser alterado.
+    Com diagnóstico, a leitura do Parquet e a do Excel aparecem como etapas.
+    """
+    if chave is None:
+        chave = hash_conteudo(conteudo)
+    
+    with _trava:
+        if chave in _cache:
+            _cache.move_to_end(chave)
+            return _cache[chave][0]
+    
+    with etapa(diagnostico, "Leitura do Parquet em disco") as medida:
+        candles = _ler_sidecar(chave)
+        medida['linhas'] = None if candles is None else len(candles)
+    if candles is None:
+        with etapa(diagnostico, "Leitura do Excel (read_excel)") as medida:
+            candles = ler_planilha(conteudo)
+            medida['linhas'] = len(candles)
+        _gravar_sidecar(chave, candles)
+    
+    with _trava:
+        _guardar_em_memoria(chave, candles)
+    return candles
+
+def limpar_cache():
+    """Esvazia o cache em memória (os arquivos Parquet permanecem em disco)"""
+    with _trava:
+        _cache.clear()
@@ -0,0 +1,110 @@
+"""
+Walk-forward: janelas de N pregões que avançam de P em P pregões por todo o histórico, cada uma
+com o resultado de simular só os seus dias. Todas saem do mesmo índice de dias (indexar_dias),
+percorrido uma vez, em vez de filtrar e simular o histórico de novo a cada janela.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from lateralizacoes.estatisticas import calcular_estatisticas_por_nivel
+from lateralizacoes.sessoes import selecionar_sessoes
+from lateralizacoes.simulacao import COLUNAS_SIMULACAO, detectar_dias, indexar_dias, precificar, preparar_para_simulacao
+
+MAX_INDICES_CACHE = 8
+
+_cache_indices = OrderedDict()
+_trava = threading.Lock()
+
+def limites_das_janelas(dias, treino, passo):
+    """
+    Janelas em ordem cronológica sobre 'dias' pregões: (início, fim, fim fora da amostra) em
+    posições cronológicas de dia, com 'treino' pregões cada, avançando 'passo' pregões. Fora da
+    amostra são os até 'passo' pregões seguintes à janela (vazio na última).
+    """
+    if treino < 1 or passo < 1:
+        raise ValueError("O tamanho da janela e o passo precisam ser de ao menos 1 pregão")
+    return [
+        (inicio, inicio + treino, min(inicio + treino + passo, dias))
+        for inicio in range(0, dias - treino + 1, passo)
+    ]
+
+def indice_do_historico(candles, hora_inicio, hora_fim, window, indice=None, chave=None):
+    """
+    indexar_dias sobre todo o histórico no horário (ordem da simulação, mais recente primeiro).
+    Com o índice de sessões, as linhas são selecionadas por busca binária; com a chave do arquivo,
+    o índice de dias fica em cache pelo horário e window.
+    """
+    if chave is not None:
+        chave = (chave, hora_inicio, hora_fim, window)
+        with _trava:
+            if chave in _cache_indices:
+                _cache_indices.move_to_end(chave)
+                return _cache_indices[chave]
+    
+    if indice is not None:
+        dados = selecionar_sessoes(candles, indice, hora_inicio, hora_fim, colunas=COLUNAS_SIMULACAO)
+    else:
+        dados = preparar_para_simulacao(candles, hora_inicio, hora_fim)
+    indice_dias = indexar_dias(dados, window)
+    
+    if chave is not None:
+        with _trava:
+            _cache_indices[chave] = indice_dias
+            while len(_cache_indices) > MAX_INDICES_CACHE:
+                _cache_indices.popitem(last=False)
+    
+    return indice_dias
+
+def walk_forward(indice_dias, treino, passo, contratos=1, tabela_pontos=None, ativo_escolhido=None, max_levels=350):
+    """
+    Resultado de cada janela do walk-forward sobre o índice de dias. Retorna (janelas, níveis, stops):
+      - janelas: Janela, Início, Fim, Pregões, Operações, Ganhos, Stops, Saldo, Prob. Ganho (%) e
+        Saldo Fora da Amostra (os pregões seguintes simulados sozinhos)
+      - níveis: o resumo de calcular_estatisticas_por_nivel de cada janela, com a coluna Janela
+      - stops: os stops entre ganhos de cada janela (Janela, Nível, Ordem, Stops entre Ganhos)
+    """
+    limites = indice_dias['limites']
+    dias = len(limites) - 1
+    rotulos = pd.to_datetime(indice_dias['horarios'][limites[:-1]]).normalize()
+    precificacao = dict(tabela_pontos=tabela_pontos, contratos=contratos, ativo_escolhido=ativo_escolhido)
+    
+    def livro(inicio, fim):
+        # Posições cronológicas -> faixa de dias na ordem da simulação (mais recente primeiro)
+        return precificar(detectar_dias(indice_dias, dias - fim, dias - inicio, max_levels, resumido=True), **precificacao)
+    
+    linhas, niveis, stops = [], [], []
+    for numero, (inicio, fim, fim_fora) in enumerate(limites_das_janelas(dias, treino, passo), start=1):
+        operacoes = livro(inicio, fim)
+        resumo, stops_janela = calcular_estatisticas_por_nivel(operacoes)
+        ganhos = int(resumo['Ganhos'].sum())
+        linhas.append({
+            'Janela': numero,
+            'Início': rotulos[dias - inicio - 1].date(),
+            'Fim': rotulos[dias - fim].date(),
+            'Pregões': fim - inicio,
+            'Operações': len(operacoes),
+            'Ganhos': ganhos,
+            'Stops': len(operacoes) - ganhos,
+            'Saldo': int(operacoes['Pontos'].sum()),
+            'Prob. Ganho (%)': ganhos / len(operacoes) * 100 if len(operacoes) else 0.0,
+            'Saldo Fora da Amostra': int(livro(fim, fim_fora)['Pontos'].sum()) if fim_fora > fim else np.nan
+        })
+        niveis.append(resumo.reset_index().assign(Janela=numero))
+        stops.append(stops_janela.assign(Janela=numero))
+    
+    colunas_janelas = ['Janela', 'Início', 'Fim', 'Pregões', 'Operações', 'Ganhos', 'Stops', 'Saldo',
+                       'Prob. Ganho (%)', 'Saldo Fora da Amostra']
+    janelas = pd.DataFrame(linhas, columns=colunas_janelas)
+    if not linhas:
+        return janelas, pd.DataFrame(), pd.DataFrame()
+    
+    niveis = pd.concat(niveis, ignore_index=True)
+    stops = pd.concat(stops, ignore_index=True)
+    return (
+        janelas,
+        niveis[['Janela'] + [coluna for coluna in niveis.columns if coluna != 'Janela']],
+        stops[['Janela', 'Nível', 'Ordem', 'Stops entre Ganhos']]
+    )
@@ -0,0 +1,20 @@
+"""Pool de processos compartilhado pelas rotinas paralelas"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+def numero_de_processos(max_workers=None):
+    """Usa todos os núcleos quando a quantidade não é informada"""
+    return max_workers or os.cpu_count() or 1
+
+def criar_pool(max_workers=None, initializer=None, initargs=()):
+    """
+    Cria o pool com 'spawn': cada worker importa apenas o pacote (pandas/NumPy),
+    sem herdar as threads do servidor do Streamlit
+    """
+    return ProcessPoolExecutor(
+        max_workers=numero_de_processos(max_workers),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initializer,
+        initargs=initargs
+    )
@@ -0,0 +1,86 @@
+"""Filtros por período (30 dias, 3 e 6 meses) e simulação do período"""
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+import pandas as pd
+
+from lateralizacoes.ingestao import mascara_horario
+from lateralizacoes.sessoes import selecionar_sessoes, ultima_data
+from lateralizacoes.simulacao import COLUNAS_SIMULACAO, detectar_alternancias, precificar
+
+MAX_PERIODOS_CACHE = 32
+
+_cache_periodos = OrderedDict()
+_trava = threading.Lock()
+
+# ===============================
+# NOVA FUNÇÃO PARA FILTRAR POR PERÍODO
+# ===============================
+def inicio_do_periodo(data_atual, periodo):
+    """Data inicial do período (30 dias, 3 meses, 6 meses) que termina em data_atual; None no ano completo"""
+    if periodo == '30 dias':
+        return data_atual - timedelta(days=30)
+    elif periodo == '3 meses':
+        return data_atual - timedelta(days=90)
+    elif periodo == '6 meses':
+        return data_atual - timedelta(days=180)
+    return None
+
+def filtrar_por_periodo(candles, periodo):
+    """
+    Filtra os candles por período (30 dias, 3 meses, 6 meses)
+    """
+    if candles.empty or 'Data' not in candles.columns:
+        return candles
+    
+    data_inicio = inicio_do_periodo(candles['Data'].max(), periodo)
+    if data_inicio is None:  # Ano completo
+        return candles
+    
+    candles_filtrado = candles[candles['Data'] >= data_inicio]
+    return candles_filtrado
+
+# ===============================
+# NOVA FUNÇÃO PARA CALCULAR ESTATÍSTICAS POR PERÍODO
+# ===============================
+def calcular_estatisticas_por_periodo(candles, periodo, hora_inicio, hora_fim, window, contratos, tabela_pontos, ativo_escolhido,
+                                      indice=None, ano=None, chave=None):
+    """
+    Simula um período específico e retorna o livro de operações (as estatísticas por nível saem dele).
+    Com o índice de sessões do arquivo (candles completos), o ano e o período são selecionados por busca binária.
+    Com a chave do arquivo, os eventos detectados ficam em cache pelo período, horário e window,
+    e só a precificação (tabela de pontos, contratos, ativo) roda de novo.
+    """
+    precificacao = dict(tabela_pontos=tabela_pontos, contratos=contratos, ativo_escolhido=ativo_escolhido)
+    if chave is not None:
+        chave = (chave, ano, periodo, hora_inicio, hora_fim, window)
+        with _trava:
+            if chave in _cache_periodos:
+                _cache_periodos.move_to_end(chave)
+                return precificar(_cache_periodos[chave], **precificacao)
+    
+    if indice is not None:
+        data_atual = ultima_data(indice, ano)
+        data_inicio = inicio_do_periodo(pd.Timestamp(data_atual), periodo) if data_atual is not None else None
+        dados_periodo = selecionar_sessoes(candles, indice, hora_inicio, hora_fim, ano, data_inicio, COLUNAS_SIMULACAO)
+    else:
+        # Filtrar por período
+        dados_periodo = filtrar_por_periodo(candles, periodo)
+        
+        # Aplicar filtros adicionais
+        dados_periodo = dados_periodo[mascara_horario(dados_periodo, hora_inicio, hora_fim)]
+        
+        # Inverter ordem
+        dados_periodo = dados_periodo.iloc[::-1].reset_index(drop=True)
+    
+    # Executar simulação: detecção (guardada no cache) e precificação
+    eventos = detectar_alternancias(dados_periodo, window=window)
+    
+    if chave is not None:
+        with _trava:
+            _cache_periodos[chave] = eventos
+            while len(_cache_periodos) > MAX_PERIODOS_CACHE:
+                _cache_periodos.popitem(last=False)
+    
+    return precificar(eventos, **precificacao)
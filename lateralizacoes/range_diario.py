@@ -0,0 +1,132 @@
+"""Range diário (maior máxima - menor mínima) e médias por período"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+MAX_RESUMOS = 8
+
+_resumos = OrderedDict()
+_trava = threading.Lock()
+
+def encontrar_colunas_maxima_minima(candles):
+    """Encontra as colunas de Máxima e Mínima"""
+    colunas_maxima = ['Máxima', 'Maxima', 'MAXIMA', 'Máxima ', 'Maxima ']
+    colunas_minima = ['Mínima', 'Minima', 'MINIMA', 'Mínima ', 'Minima ']
+    
+    coluna_maxima = None
+    coluna_minima = None
+    
+    for col in colunas_maxima:
+        if col in candles.columns:
+            coluna_maxima = col
+            break
+    
+    for col in colunas_minima:
+        if col in candles.columns:
+            coluna_minima = col
+            break
+    
+    return coluna_maxima, coluna_minima
+
+def resumir_dias(candles):
+    """
+    Resumo diário calculado uma vez para o arquivo inteiro: Ano, maior máxima, menor mínima,
+    Range_Diario, nº de barras, primeiro/último horário e o intervalo [Inicio, Fim) do dia em
+    'ordem' (posições das linhas de candles agrupadas por dia, na ordem original dentro do dia).
+    Retorna um dict com 'dias', 'ordem' e as colunas de máxima/mínima, ou None sem essas colunas.
+    """
+    coluna_maxima, coluna_minima = encontrar_colunas_maxima_minima(candles)
+    
+    if not coluna_maxima or not coluna_minima:
+        return None
+    
+    dias = candles['Data'].dt.normalize()
+    validos = np.flatnonzero(dias.notna().to_numpy())
+    ordem = validos[np.argsort(dias.to_numpy()[validos], kind='stable')]
+    
+    # Agrupar por dia e encontrar a MAIOR máxima e MENOR mínima de cada dia
+    resumo = candles.groupby(dias).agg(**{
+        coluna_maxima: (coluna_maxima, 'max'),
+        coluna_minima: (coluna_minima, 'min'),
+        'Barras': ('Data', 'size'),
+        'Primeira': ('Data', 'min'),
+        'Ultima': ('Data', 'max')
+    })
+    resumo.insert(0, 'Ano', resumo.index.year)
+    resumo.insert(3, 'Range_Diario', resumo[coluna_maxima] - resumo[coluna_minima])
+    fim = np.cumsum(resumo['Barras'].to_numpy())
+    resumo['Inicio'] = fim - resumo['Barras'].to_numpy()
+    resumo['Fim'] = fim
+    resumo.index = pd.Index(resumo.index.date, name='Data')
+    
+    return {'dias': resumo, 'ordem': ordem, 'coluna_maxima': coluna_maxima, 'coluna_minima': coluna_minima}
+
+def resumo_diario(candles, chave=None):
+    """resumir_dias com cache pela chave do arquivo (o resumo vale para todos os anos e períodos)"""
+    if chave is not None:
+        with _trava:
+            if chave in _resumos:
+                _resumos.move_to_end(chave)
+                return _resumos[chave]
+    
+    resumo = resumir_dias(candles)
+    
+    if chave is not None:
+        with _trava:
+            _resumos[chave] = resumo
+            while len(_resumos) > MAX_RESUMOS:
+                _resumos.popitem(last=False)
+    
+    return resumo
+
+def linhas_do_dia(candles, resumo, dia):
+    """Linhas de candles de um dia, pelo intervalo do dia no resumo (sem varrer o arquivo)"""
+    if dia not in resumo['dias'].index:
+        return candles.iloc[0:0]
+    
+    inicio, fim = resumo['dias'].loc[dia, ['Inicio', 'Fim']]
+    return candles.iloc[resumo['ordem'][inicio:fim]]
+
+def calcular_range_diario(candles, ano=None, resumo=None):
+    """Calcula o range diário (MAIOR Máxima do dia - MENOR Mínima do dia)"""
+    if resumo is None:
+        resumo = resumir_dias(candles)
+    if resumo is None:
+        return None
+    
+    range_por_dia = resumo['dias']
+    
+    # Filtrar por ano se especificado
+    if ano is not None:
+        range_por_dia = range_por_dia[range_por_dia['Ano'] == ano]
+    
+    return range_por_dia[[resumo['coluna_maxima'], resumo['coluna_minima'], 'Range_Diario']].copy()
+
+def obter_dias_por_periodo(candles, periodo_dias, ano=None, resumo=None):
+    """Obtém os dias específicos usados no cálculo do range para um período"""
+    # Calcular range diário
+    range_diario_completo = calcular_range_diario(candles, ano, resumo)
+    if range_diario_completo is None:
+        return pd.DataFrame()
+    
+    # Ordenar por data (do mais recente para o mais antigo)
+    range_diario_completo = range_diario_completo.sort_index(ascending=False)
+    
+    # Pegar os N dias mais recentes (últimos N dias úteis)
+    range_periodo = range_diario_completo.head(periodo_dias)
+    
+    return range_periodo
+
+def calcular_media_range_por_periodo(candles, periodo_dias, ano=None, resumo=None):
+    """Calcula a média do range para um período específico (últimos N dias úteis)"""
+    # Obter os dias do período
+    range_periodo = obter_dias_por_periodo(candles, periodo_dias, ano, resumo)
+    
+    if range_periodo.empty:
+        return 0
+    
+    # Calcular média do range no período
+    media_range = range_periodo['Range_Diario'].mean()
+    return round(media_range, 2)
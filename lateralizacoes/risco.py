@@ -0,0 +1,106 @@
+"""
+Risco por nível via Monte Carlo: caminhos sintéticos montados por bootstrap dos ciclos observados
+de um nível (os stops seguidos até um ganho e o ganho), sorteados em lotes de arrays do NumPy.
+Dentro de um ciclo o saldo só desce até o fim dos stops e só sobe no ganho, então vales, picos,
+drawdown e ruína saem de somas acumuladas por ciclo, sem percorrer operação por operação.
+"""
+import numpy as np
+import pandas as pd
+
+CAMINHOS_PADRAO = 100_000
+
+# Ciclos sorteados por lote (caminhos x ciclos), para a memória não crescer com o nº de caminhos
+CICLOS_POR_LOTE = 2_000_000
+
+PERCENTIS = (50, 90, 95, 99)
+
+def ciclos_do_nivel(operacoes, nivel):
+    """
+    Ciclos observados do nível no livro de operações, na ordem das sequências: (stops antes de
+    cada ganho, pontos de cada ganho, pontos perdidos por stop). Os stops depois do último ganho
+    ficam de fora, porque esse ciclo ainda não terminou.
+    """
+    do_nivel = operacoes[(operacoes['Nivel'] == nivel) & (operacoes['Pontos'] != 0)]
+    pontos = do_nivel.sort_values('Sequencia', kind='stable')['Pontos'].to_numpy()
+    
+    posicao_ganho = np.flatnonzero(pontos > 0)
+    stops_antes = np.diff(np.r_[-1, posicao_ganho]) - 1
+    perdas = -pontos[pontos < 0]
+    return stops_antes, pontos[posicao_ganho], float(perdas.mean()) if len(perdas) else 0.0
+
+def simular_caminhos(stops_antes, ganhos, perda_por_stop, ciclos=None, caminhos=CAMINHOS_PADRAO, semente=0):
+    """
+    Sorteia 'caminhos' caminhos de 'ciclos' ciclos (padrão: os observados), cada ciclo escolhido
+    com reposição entre os observados (stops e ganho do mesmo ciclo andam juntos). Retorna, por
+    caminho: Drawdown Máximo (pontos, a partir do maior saldo anterior), Pior Saldo (a partir do
+    início), Maior Sequência de Stops e Saldo Final.
+    """
+    stops_antes = np.asarray(stops_antes, dtype=np.int64)
+    ganhos = np.asarray(ganhos, dtype=float)
+    if not len(stops_antes):
+        raise ValueError("O nível não tem ganhos: não há ciclos para sortear")
+    ciclos = ciclos or len(stops_antes)
+    
+    gerador = np.random.default_rng(semente)
+    resultado = {
+        'Drawdown Máximo': np.empty(caminhos),
+        'Pior Saldo': np.empty(caminhos),
+        'Maior Sequência de Stops': np.empty(caminhos, dtype=np.int64),
+        'Saldo Final': np.empty(caminhos)
+    }
+    
+    por_lote = max(1, CICLOS_POR_LOTE // ciclos)
+    for inicio in range(0, caminhos, por_lote):
+        fim = min(inicio + por_lote, caminhos)
+        sorteados = gerador.integers(0, len(stops_antes), size=(fim - inicio, ciclos))
+        stops, ganho = stops_antes[sorteados], ganhos[sorteados]
+        
+        # Saldo no fim de cada ciclo e no vale de cada ciclo (depois dos stops, antes do ganho)
+        saldo = np.cumsum(ganho - perda_por_stop * stops, axis=1)
+        vales = saldo - ganho
+        
+        # Maior saldo antes de cada ciclo (o início conta como zero)
+        picos = np.zeros_like(saldo)
+        picos[:, 1:] = saldo[:, :-1]
+        np.maximum.accumulate(np.maximum(picos, 0), axis=1, out=picos)
+        
+        resultado['Drawdown Máximo'][inicio:fim] = (picos - vales).max(axis=1)
+        resultado['Pior Saldo'][inicio:fim] = np.minimum(vales.min(axis=1), 0)
+        resultado['Maior Sequência de Stops'][inicio:fim] = stops.max(axis=1)
+        resultado['Saldo Final'][inicio:fim] = saldo[:, -1]
+    
+    return resultado
+
+def resumir_caminhos(resultado, capital=None, limite_stops=None, percentis=PERCENTIS):
+    """
+    Resumo dos caminhos de simular_caminhos: (métricas, percentis). Risco de ruína = caminhos cujo
+    saldo chega a -capital; exceder o limite = caminhos com mais stops seguidos que limite_stops.
+    """
+    drawdown = resultado['Drawdown Máximo']
+    resumo = {
+        'Caminhos': len(drawdown),
+        'Saldo Final Médio': float(resultado['Saldo Final'].mean()) if len(drawdown) else 0.0,
+        'Drawdown Máximo Médio': float(drawdown.mean()) if len(drawdown) else 0.0
+    }
+    if capital:
+        resumo['Risco de Ruína (%)'] = float((resultado['Pior Saldo'] <= -capital).mean() * 100)
+    if limite_stops:
+        resumo['Probabilidade de Exceder o Limite (%)'] = float(
+            (resultado['Maior Sequência de Stops'] > limite_stops).mean() * 100
+        )
+    
+    tabela = pd.DataFrame({'Percentil': list(percentis)})
+    for coluna in ['Drawdown Máximo', 'Maior Sequência de Stops', 'Saldo Final']:
+        tabela[coluna] = np.percentile(resultado[coluna], percentis) if len(drawdown) else np.nan
+    return resumo, tabela
+
+def risco_do_nivel(operacoes, nivel, caminhos=CAMINHOS_PADRAO, ciclos=None, capital=None, limite_stops=None, semente=0):
+    """
+    Monte Carlo de um nível do livro de operações: ciclos_do_nivel, simular_caminhos e
+    resumir_caminhos. O resumo traz também a maior sequência de stops observada, para comparar.
+    """
+    stops_antes, ganhos, perda_por_stop = ciclos_do_nivel(operacoes, nivel)
+    resultado = simular_caminhos(stops_antes, ganhos, perda_por_stop, ciclos, caminhos, semente)
+    resumo, tabela = resumir_caminhos(resultado, capital, limite_stops)
+    resumo['Maior Sequência de Stops Observada'] = int(stops_antes.max())
+    return resumo, tabela
@@ -0,0 +1,103 @@
+"""
+Índice dos pregões por dia: as linhas ficam ordenadas por 'Data' uma única vez e qualquer janela
+(ano ou período, hora inicial, hora final) é selecionada por busca binária em cada dia
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from lateralizacoes.ingestao import microssegundos_do_horario
+
+MAX_INDICES = 8
+
+_indices = OrderedDict()
+_trava = threading.Lock()
+
+def construir_indice_sessoes(candles):
+    """
+    Ordena as linhas válidas por 'Data' e guarda, para cada dia, o intervalo [inicio, fim) dessas
+    linhas, o dia (datetime64[D]) e o ano. Dentro de cada dia 'datas' fica ordenado por horário,
+    então a janela de horário de um dia é achada com searchsorted.
+    """
+    datas = candles["Data"].to_numpy()
+    validas = np.flatnonzero(~np.isnat(datas))
+    ordem = validas[np.argsort(datas[validas], kind="stable")]
+    datas_ordenadas = datas[ordem]
+    
+    dia_por_linha = datas_ordenadas.astype("datetime64[D]")
+    inicio = np.flatnonzero(np.r_[True, dia_por_linha[1:] != dia_por_linha[:-1]]) if len(ordem) else np.array([], dtype=np.int64)
+    dias = dia_por_linha[inicio]
+    
+    return {
+        'ordem': ordem,
+        'datas': datas_ordenadas,
+        'dias': dias,
+        'inicio': inicio,
+        'fim': np.r_[inicio[1:], len(ordem)].astype(np.int64),
+        'anos': dias.astype("datetime64[Y]").astype(np.int64) + 1970,
+        # Arquivo já em ordem cronológica: as posições saem ordenadas sem precisar de sort
+        'cronologico': bool(np.all(ordem[1:] > ordem[:-1]))
+    }
+
+def indice_sessoes(candles, chave=None):
+    """construir_indice_sessoes com cache pela chave do arquivo"""
+    if chave is not None:
+        with _trava:
+            if chave in _indices:
+                _indices.move_to_end(chave)
+                return _indices[chave]
+    
+    indice = construir_indice_sessoes(candles)
+    
+    if chave is not None:
+        with _trava:
+            _indices[chave] = indice
+            while len(_indices) > MAX_INDICES:
+                _indices.popitem(last=False)
+    
+    return indice
+
+def ultima_data(indice, ano=None):
+    """Último horário com dados (do ano, se informado), ou None"""
+    fins = indice['fim'] if ano is None else indice['fim'][indice['anos'] == ano]
+    if len(fins) == 0:
+        return None
+    return indice['datas'][fins[-1] - 1]
+
+def posicoes_sessoes(indice, hora_inicio, hora_fim, ano=None, desde=None):
+    """
+    Posições (na ordem do arquivo) das linhas do ano com horário entre hora_inicio e hora_fim,
+    inclusive, e Data >= desde quando informado. Mesmo resultado de filtrar por 'Ano' e
+    mascara_horario, sem varrer as linhas.
+    """
+    dias = indice['dias']
+    if ano is not None:
+        dias = dias[indice['anos'] == ano]
+    dias = dias.astype("datetime64[ns]")
+    
+    # Janela [dia + hora_inicio, dia + hora_fim + 1µs): o horário comparado tem resolução de µs
+    abertura = dias + np.timedelta64(microssegundos_do_horario(hora_inicio) * 1000, "ns")
+    fechamento = dias + np.timedelta64((microssegundos_do_horario(hora_fim) + 1) * 1000, "ns")
+    if desde is not None:
+        abertura = np.maximum(abertura, np.datetime64(desde, "ns"))
+    
+    primeira = np.searchsorted(indice['datas'], abertura, side="left")
+    ultima = np.maximum(np.searchsorted(indice['datas'], fechamento, side="left"), primeira)
+    
+    # Concatena os intervalos [primeira, ultima) de cada dia
+    tamanhos = ultima - primeira
+    deslocamento = np.repeat(primeira - (np.cumsum(tamanhos) - tamanhos), tamanhos)
+    posicoes = indice['ordem'][np.arange(tamanhos.sum()) + deslocamento]
+    
+    return posicoes if indice['cronologico'] else np.sort(posicoes)
+
+def selecionar_sessoes(candles, indice, hora_inicio, hora_fim, ano=None, desde=None, colunas=None):
+    """
+    Linhas da janela em ordem invertida (mais recente primeiro) e índice refeito, como
+    preparar_para_simulacao sobre o ano filtrado, copiando só as linhas e colunas pedidas
+    """
+    posicoes = posicoes_sessoes(indice, hora_inicio, hora_fim, ano, desde)[::-1]
+    if colunas is None:
+        return candles.iloc[posicoes].reset_index(drop=True)
+    return candles.iloc[posicoes, candles.columns.get_indexer(colunas)].reset_index(drop=True)
@@ -0,0 +1,743 @@
+"""
+Detecção das alternâncias, simulação das operações e livro de operações.
+
+A detecção (quais alternâncias viram stop ou gain, em que nível e sequência) depende só das
+barras, dos dias e do window; a precificação (tabela de pontos, stop, contratos) é aplicada
+depois, de forma vetorizada, sobre os eventos detectados.
+"""
+import numpy as np
+import pandas as pd
+
+from lateralizacoes.ingestao import mascara_horario
+from lateralizacoes.paralelo import criar_pool, numero_de_processos
+
+# Colunas de que a simulação precisa (o que é enviado aos workers)
+COLUNAS_SIMULACAO = ["Data", "Barras", "DataApenas"]
+
+# ===============================
+# Tabelas de pontos por ativo
+# ===============================
+valores_por_ativo = {
+    "Mini Índice (WIN)": {3:200,4:600,5:1600,6:3000,7:6200,8:12600,9:25400,10:51000},
+    "Mini Dólar (WDO)": {3:5,4:15,5:35,6:75,7:155,8:315,9:635,10:1275}
+}
+
+# ===============================
+# Detecção das alternâncias e simulação
+# ===============================
+def construir_indice_alternancia(candles, window=6):
+    """
+    Calcula numa única passada vetorizada o tamanho da alternância de cada linha
+    (a mesma contagem de contar_alternancia), limitada pelo window e cortada na virada do dia
+    """
+    barras = candles['Barras'].to_numpy()
+    datas = candles['DataApenas'].to_numpy()
+    n = len(barras)
+    indice = np.zeros(n, dtype=np.int64)
+    if n < 2:
+        return indice
+    
+    # Quebra em k: a linha k+1 não continua a alternância iniciada antes dela
+    quebra = np.ones(n, dtype=bool)
+    quebra[:-1] = (datas[1:] != datas[:-1]) | (barras[1:] == barras[:-1])
+    
+    # Próxima quebra a partir de cada linha -> tamanho da alternância que começa ali
+    posicoes = np.arange(n)
+    proxima_quebra = np.minimum.accumulate(np.where(quebra, posicoes, n)[::-1])[::-1]
+    tamanho = proxima_quebra - posicoes + 1
+    
+    # A contagem só para no window quando ele é maior que 2 (a 1ª checagem já ocorre com 3 barras)
+    if window > 2:
+        tamanho = np.minimum(tamanho, window)
+    
+    # Contagem da linha i usa a alternância que começa em i-1
+    indice[1:] = np.where(tamanho[:-1] >= 2, tamanho[:-1], 0)
+    return indice
+
+def contar_alternancia(candles, i, window=6, indice=None):
+    if indice is None:
+        indice = construir_indice_alternancia(candles, window)
+    
+    contagem = int(indice[i])
+    if contagem == 0:
+        return 0, [], []
+    
+    seq = candles['Barras'].iloc[i-1:i-1+contagem].tolist()
+    usados = candles.index[i-1:i-1+contagem].tolist()
+    
+    return contagem, seq, usados
+
+def pontos_por_alternancias(n, tabela_pontos):
+    return tabela_pontos.get(n, tabela_pontos.get(6, 3000))
+
+def stop_do_ativo(ativo_escolhido):
+    """Pontos perdidos por contrato num stop: 5 no dólar, 200 no índice"""
+    return 5 if ativo_escolhido and "Dólar" in ativo_escolhido else 200
+
+def _estado_inicial(max_levels, window):
+    """Estado da detecção antes da primeira linha"""
+    return {
+        'parametros': {
+            'max_levels': max_levels,
+            'window': window
+        },
+        'i': 0,
+        'nivel': 1,
+        'seq': {},
+        'posicoes_seq': [],
+        'proxima_posicao': 0,
+        'esperar_reset': False,
+        'candles_mesmo_lado': 0,
+        'ultimo_lado': None,
+        'usados': set(),
+        'registros': []
+    }
+
+def _executar_simulacao(estado, barras, datas, horarios, indice, inicio=0, parar_se_incompleto=False):
+    """
+    Laço da simulação a partir de estado['i'], sobre as linhas inicio .. inicio + len(barras) - 1.
+    
+    Cada sequência aberta (seq) guarda as posições de coluna em que foi anexada; ao ser substituída,
+    suas operações viram registros dos eventos. Cada operação registra só se foi gain ou stop: os
+    pontos ficam para precificar. Com parar_se_incompleto, o laço para na primeira alternância que
+    chega ao fim dos dados e ainda poderia crescer com novas barras.
+    """
+    max_levels, window = estado['parametros']['max_levels'], estado['parametros']['window']
+    
+    i, nivel, seq, posicoes_seq = estado['i'], estado['nivel'], estado['seq'], estado['posicoes_seq']
+    proxima_posicao, esperar_reset = estado['proxima_posicao'], estado['esperar_reset']
+    candles_mesmo_lado, ultimo_lado = estado['candles_mesmo_lado'], estado['ultimo_lado']
+    usados_totais, registros = estado['usados'], estado['registros']
+    fim = inicio + len(barras)
+    
+    def fechar_seq(seq, posicoes_seq):
+        for posicao in posicoes_seq:
+            for nivel_op, operacao in seq.items():
+                registros.append((posicao, nivel_op) + operacao)
+    
+    while i < fim:
+        local = i - inicio
+        if i in usados_totais:
+            if i - 1 in usados_totais:
+                pass
+            else:
+                i += 1
+                continue
+        
+        if esperar_reset:
+            lado_atual = barras[local]
+            lado_anterior = barras[local-1] if i > 0 else None
+            
+            if lado_atual == lado_anterior:
+                if lado_atual == ultimo_lado:
+                    candles_mesmo_lado += 1
+                else:
+                    candles_mesmo_lado, ultimo_lado = 1, lado_atual
+                
+                if candles_mesmo_lado >= 2:
+                    esperar_reset, candles_mesmo_lado, ultimo_lado = False, 0, None
+            else:
+                candles_mesmo_lado, ultimo_lado = 1, lado_atual
+            
+            i += 1
+            continue
+        
+        alternados = int(indice[local])
+        if parar_se_incompleto and alternados > 1 and local - 1 + alternados == len(barras) and (window <= 2 or alternados < window):
+            break
+        
+        if nivel > max_levels:
+            fechar_seq(seq, posicoes_seq)
+            nivel, seq, posicoes_seq = 1, {}, [proxima_posicao]
+            proxima_posicao += 1
+        
+        if alternados > 1:
+            usados = range(i - 1, i - 1 + alternados)
+            if all(idx in usados_totais for idx in usados):
+                i += 1
+                continue
+            
+            padrao = ''.join(map(str, barras[local-1:local-1+alternados].tolist()))
+            if alternados >= window:
+                seq[nivel] = (True, alternados, i - 1, padrao, datas[local], horarios[local])
+                posicoes_seq.append(proxima_posicao)
+                proxima_posicao += 1
+                fechar_seq(seq, posicoes_seq)
+                seq, posicoes_seq = {}, []
+                nivel = 1
+                usados_totais.update(usados)
+                esperar_reset, candles_mesmo_lado, ultimo_lado = True, 0, None
+                i = usados[-2] if len(usados) > 1 else usados[-1]
+                continue
+            else:
+                seq[nivel] = (False, alternados, i - 1, padrao, datas[local], horarios[local])
+                nivel += 1
+                usados_totais.update(usados)
+                i = usados[-1] + 1
+                continue
+        
+        i += 1
+    
+    estado.update(
+        i=i, nivel=nivel, seq=seq, posicoes_seq=posicoes_seq, proxima_posicao=proxima_posicao,
+        esperar_reset=esperar_reset, candles_mesmo_lado=candles_mesmo_lado, ultimo_lado=ultimo_lado
+    )
+
+def _encerrar_simulacao(estado):
+    """Anexa a sequência aberta (como no fim dos dados) e devolve os registros ordenados por sequência"""
+    registros = list(estado['registros'])
+    posicoes_seq = list(estado['posicoes_seq'])
+    if estado['seq']:
+        posicoes_seq.append(estado['proxima_posicao'])
+    for posicao in posicoes_seq:
+        for nivel_op, operacao in estado['seq'].items():
+            registros.append((posicao, nivel_op) + operacao)
+    registros.sort(key=lambda registro: registro[0])
+    return registros
+
+def _colunas_simulacao(candles):
+    return candles["Barras"].to_numpy(), candles["DataApenas"].to_numpy(), candles["Data"].to_numpy()
+
+def detectar_alternancias(candles, max_levels=350, window=6):
+    """
+    Eventos da simulação, sem preço: um registro por stop ou gain (sequência, nível, Ganho,
+    padrão, linhas usadas, dia e horário). Serve para qualquer tabela de pontos, stop e contratos.
+    """
+    estado = _estado_inicial(max_levels, window)
+    
+    # Índice de alternâncias e colunas extraídos uma única vez
+    indice = construir_indice_alternancia(candles, window)
+    _executar_simulacao(estado, *_colunas_simulacao(candles), indice)
+    
+    return montar_eventos(_encerrar_simulacao(estado))
+
+def _tabela_como_vetor(tabela_pontos, maior_alternancia):
+    """Pontos do gain por nº de alternâncias (posição = alternâncias), com o mesmo padrão de pontos_por_alternancias"""
+    tabela_pontos = tabela_pontos or {}
+    return np.array(
+        [pontos_por_alternancias(n, tabela_pontos) for n in range(maior_alternancia + 1)], dtype=np.int64
+    )
+
+def _contratos_por_evento(eventos, contratos, contratos_por_nivel):
+    """Contratos de cada evento: os do nível em contratos_por_nivel ({nível: contratos}) ou o padrão"""
+    if not contratos_por_nivel:
+        return np.full(len(eventos), contratos, dtype=np.int64)
+    
+    niveis = eventos['Nivel'].to_numpy().astype(np.int64)
+    por_nivel = np.full(max(int(niveis.max(initial=0)), max(contratos_por_nivel)) + 1, contratos, dtype=np.int64)
+    por_nivel[list(contratos_por_nivel)] = list(contratos_por_nivel.values())
+    return por_nivel[niveis]
+
+def precificar(eventos, tabela_pontos=None, contratos=1, stop=None, ativo_escolhido=None, contratos_por_nivel=None):
+    """
+    Livro de operações a partir dos eventos de detectar_alternancias, numa operação vetorizada:
+    o gain vale a tabela de pontos pelo nº de alternâncias e o stop vale -stop (padrão: o do
+    ativo), tudo vezes os contratos (ou os do nível, com contratos_por_nivel).
+    """
+    if stop is None:
+        stop = stop_do_ativo(ativo_escolhido)
+    
+    alternancias = eventos['Alternancias'].to_numpy().astype(np.int64)
+    tabela = _tabela_como_vetor(tabela_pontos, int(alternancias.max(initial=0)))
+    pontos = np.where(eventos['Ganho'].to_numpy(), tabela[alternancias], -stop)
+    pontos = pontos * _contratos_por_evento(eventos, contratos, contratos_por_nivel)
+    
+    livro = eventos.drop(columns='Ganho')
+    livro.insert(2, 'Pontos', pontos.astype(np.int64))
+    return livro
+
+def comparar_tabelas_pontos(eventos, tabelas, contratos=1, stops=None, ativo_escolhido=None, contratos_por_nivel=None):
+    """
+    Resultado dos mesmos eventos com várias tabelas de pontos ({nome: tabela}) de uma vez, sem
+    montar um livro por tabela: os gains são somados por nº de alternâncias (pesados pelos
+    contratos) e cada tabela vira um produto escalar. stops ({nome: stop}) troca o stop de
+    tabelas específicas. Uma linha por tabela, na ordem recebida.
+    """
+    stops = stops or {}
+    ganho = eventos['Ganho'].to_numpy()
+    alternancias = eventos['Alternancias'].to_numpy().astype(np.int64)
+    quantidade = _contratos_por_evento(eventos, contratos, contratos_por_nivel)
+    
+    maior = int(alternancias.max(initial=0))
+    contratos_em_ganhos = np.bincount(alternancias[ganho], weights=quantidade[ganho], minlength=maior + 1)
+    contratos_em_stops = int(quantidade[~ganho].sum())
+    operacoes = len(eventos)
+    
+    linhas = []
+    for nome, tabela in tabelas.items():
+        pontos_ganhos = int(round(_tabela_como_vetor(tabela, maior) @ contratos_em_ganhos))
+        pontos_stops = -stops.get(nome, stop_do_ativo(ativo_escolhido)) * contratos_em_stops
+        linhas.append({
+            'Tabela': nome,
+            'Saldo': pontos_ganhos + pontos_stops,
+            'Pontos em Ganhos': pontos_ganhos,
+            'Pontos em Stops': pontos_stops,
+            'Saldo por Operação': (pontos_ganhos + pontos_stops) / operacoes if operacoes else 0.0
+        })
+    
+    return pd.DataFrame(linhas, columns=['Tabela', 'Saldo', 'Pontos em Ganhos', 'Pontos em Stops', 'Saldo por Operação'])
+
+def simular(candles, max_levels=350, window=6, contratos=1, tabela_pontos=None, ativo_escolhido=None):
+    """
+    Simula as operações e retorna o livro de operações: um registro por stop ou gain
+    (sequência, nível, pontos, padrão, linhas usadas, dia e horário)
+    """
+    return precificar(
+        detectar_alternancias(candles, max_levels, window),
+        tabela_pontos=tabela_pontos,
+        contratos=contratos,
+        ativo_escolhido=ativo_escolhido
+    )
+
+def detectar_incremental(candles_novos, estado=None, max_levels=350, window=6):
+    """
+    Detecção retomável em ordem cronológica (mais antigo primeiro): recebe apenas as barras
+    novas e o estado devolvido pela chamada anterior, e processa só essas barras.
+    
+    Retorna (eventos, novo estado). Os eventos são iguais aos de detectar_alternancias() sobre
+    todas as barras já recebidas, na mesma ordem cronológica. O estado é um dicionário
+    serializável (pickle) com nível, sequência aberta, espera de reset, linhas usadas na
+    fronteira e as barras ainda pendentes de confirmação; não tem preço, então serve para
+    qualquer tabela de pontos, ativo ou nº de contratos.
+    """
+    if estado is None:
+        estado = _estado_inicial(max_levels, window)
+        estado.update(
+            pendentes=candles_novos.iloc[:0][["Barras", "DataApenas", "Data"]],
+            inicio_pendentes=0, linhas_recebidas=0, ultima_data=None
+        )
+    elif estado['parametros']['window'] != window or estado['parametros']['max_levels'] != max_levels:
+        raise ValueError("O estado foi gerado com outros parâmetros de simulação")
+    
+    # Cópia rasa: o estado recebido continua válido para ser retomado de novo
+    estado = dict(
+        estado,
+        seq=dict(estado['seq']),
+        posicoes_seq=list(estado['posicoes_seq']),
+        usados=set(estado['usados']),
+        registros=list(estado['registros'])
+    )
+    
+    # Barras pendentes (a partir de i-1) + barras novas, numeradas a partir de inicio_pendentes
+    inicio = estado['inicio_pendentes']
+    buffer = pd.concat(
+        [estado['pendentes'], candles_novos[["Barras", "DataApenas", "Data"]]],
+        ignore_index=True
+    )
+    barras, datas, horarios = _colunas_simulacao(buffer)
+    indice = construir_indice_alternancia(buffer, window)
+    _executar_simulacao(estado, barras, datas, horarios, indice, inicio, parar_se_incompleto=True)
+    
+    # Fronteira: linhas anteriores a i-1 nunca mais são consultadas
+    fronteira = max(estado['i'] - 1, inicio)
+    estado['usados'] = {linha for linha in estado['usados'] if linha >= fronteira}
+    
+    # O livro final trata as barras pendentes como fim dos dados, sem alterar o estado salvo
+    provisorio = dict(estado, seq=dict(estado['seq']), posicoes_seq=list(estado['posicoes_seq']),
+                      usados=set(estado['usados']), registros=[])
+    _executar_simulacao(provisorio, barras, datas, horarios, indice, inicio)
+    registros = estado['registros'] + _encerrar_simulacao(provisorio)
+    
+    estado['pendentes'] = buffer.iloc[fronteira - inicio:].reset_index(drop=True)
+    estado['inicio_pendentes'] = fronteira
+    estado['linhas_recebidas'] = estado['linhas_recebidas'] + len(candles_novos)
+    if len(candles_novos):
+        estado['ultima_data'] = candles_novos['Data'].iloc[-1]
+    
+    return montar_eventos(registros), estado
+
+def simular_incremental(candles_novos, estado=None, max_levels=350, window=6, contratos=1,
+                        tabela_pontos=None, ativo_escolhido=None):
+    """
+    detectar_incremental com os eventos precificados: retorna (livro de operações, novo estado),
+    com o livro igual ao de simular() sobre todas as barras já recebidas
+    """
+    eventos, estado = detectar_incremental(candles_novos, estado, max_levels, window)
+    return precificar(eventos, tabela_pontos, contratos, ativo_escolhido=ativo_escolhido), estado
+
+# ===============================
+# Detecção paralela por blocos de dias
+# ===============================
+# Uma alternância nunca atravessa a virada do dia e o laço sempre entra num dia pela primeira
+# linha, então de um dia para o outro só passa a espera de reset (esperar_reset,
+# candles_mesmo_lado, ultimo_lado); níveis e sequências não mudam o caminho do laço
+SEM_ESPERA = (False, 0, None)
+BLOCOS_POR_PROCESSO = 4
+
+# Abaixo disso a detecção sequencial termina antes de o pool de processos subir
+LINHAS_MINIMAS_PARALELO = 1_000_000
+
+def _percorrer_bloco(barras, indice, inicios_dia, inicio, window, reset, referencia=None, fim=None):
+    """
+    O caminho de _executar_simulacao sobre um bloco de dias (de inicio até fim ou o fim dos dados)
+    a partir de um estado de reset, sem níveis nem sequências. Cada evento é (alternâncias, linha
+    inicial, padrão). Retorna (eventos, reset na saída, {linha de início de dia: (reset, eventos
+    até ali)}, linha de convergência). Com referencia (as entradas de outro caminho), para no
+    primeiro dia em que entra com o mesmo reset: dali em diante os dois caminhos são iguais.
+    """
+    esperar_reset, candles_mesmo_lado, ultimo_lado = reset
+    usados_totais = set()
+    eventos, entradas = [], {}
+    i, fim = inicio, len(barras) if fim is None else fim
+    
+    while i < fim:
+        if inicios_dia[i]:
+            entrada = (esperar_reset, candles_mesmo_lado, ultimo_lado)
+            if referencia is not None and i != inicio and referencia.get(i, (None,))[0] == entrada:
+                return eventos, None, entradas, i
+            entradas[i] = (entrada, len(eventos))
+        
+        if i in usados_totais and i - 1 not in usados_totais:
+            i += 1
+            continue
+        
+        if esperar_reset:
+            lado_atual = barras[i]
+            lado_anterior = barras[i-1] if i > 0 else None
+            
+            if lado_atual == lado_anterior:
+                if lado_atual == ultimo_lado:
+                    candles_mesmo_lado += 1
+                else:
+                    candles_mesmo_lado, ultimo_lado = 1, lado_atual
+                
+                if candles_mesmo_lado >= 2:
+                    esperar_reset, candles_mesmo_lado, ultimo_lado = False, 0, None
+            else:
+                candles_mesmo_lado, ultimo_lado = 1, lado_atual
+            
+            i += 1
+            continue
+        
+        alternados = indice[i]
+        if alternados > 1:
+            usados = range(i - 1, i - 1 + alternados)
+            if all(idx in usados_totais for idx in usados):
+                i += 1
+                continue
+            
+            eventos.append((alternados, i - 1, ''.join(map(str, barras[i-1:i-1+alternados]))))
+            usados_totais.update(usados)
+            if alternados >= window:
+                esperar_reset, candles_mesmo_lado, ultimo_lado = True, 0, None
+                i = usados[-2] if len(usados) > 1 else usados[-1]
+            else:
+                i = usados[-1] + 1
+            continue
+        
+        i += 1
+    
+    return eventos, (esperar_reset, candles_mesmo_lado, ultimo_lado), entradas, None
+
+def detectar_bloco(dados, window, contexto, resets=None):
+    """
+    Caminhos de um bloco de dias (executado nos workers). Com contexto, a primeira linha de dados
+    é a última do bloco anterior, só para a comparação da espera de reset. Retorna {reset de
+    entrada: (eventos, convergência, reset na saída)} para SEM_ESPERA e para cada reset em resets
+    (padrão: todos os que um bloco anterior pode deixar). Quando o caminho converge com o sem
+    espera, seus eventos continuam nos de SEM_ESPERA a partir da posição 'convergência', que não
+    são copiados. A linha inicial dos eventos é relativa a dados.
+    """
+    barras = dados['Barras'].tolist()
+    datas = dados['DataApenas'].to_numpy()
+    indice = construir_indice_alternancia(dados, window).tolist()
+    inicios_dia = np.r_[True, datas[1:] != datas[:-1]].tolist() if len(datas) else []
+    inicio = 1 if contexto else 0
+    
+    if resets is None:
+        resets = [(True, 0, None)] + [(True, 1, lado) for lado in dict.fromkeys(barras)]
+    
+    eventos, saida, entradas, _ = _percorrer_bloco(barras, indice, inicios_dia, inicio, window, SEM_ESPERA)
+    caminhos = {SEM_ESPERA: (eventos, None, saida)}
+    for reset in resets:
+        alternativos, saida_alternativa, _, linha = _percorrer_bloco(
+            barras, indice, inicios_dia, inicio, window, reset, referencia=entradas
+        )
+        if linha is None:
+            caminhos[reset] = (alternativos, None, saida_alternativa)
+        else:
+            # Do dia da convergência em diante, os eventos e a saída são os do caminho sem espera
+            caminhos[reset] = (alternativos, entradas[linha][1], saida)
+    
+    return caminhos
+
+def _blocos_de_dias(dias, quantidade):
+    """Limites (início, fim) de até 'quantidade' blocos de dias inteiros com nº de linhas parecido"""
+    total = len(dias)
+    inicios_dia = np.flatnonzero(np.r_[True, dias[1:] != dias[:-1]]) if total else np.array([], dtype=np.int64)
+    alvos = np.linspace(0, total, quantidade + 1)[1:-1]
+    escolhidos = np.searchsorted(inicios_dia, alvos)
+    limites = np.unique(inicios_dia[escolhidos[escolhidos < len(inicios_dia)]])
+    limites = [0] + [int(limite) for limite in limites if 0 < limite < total] + [total]
+    return [(inicio, fim) for inicio, fim in zip(limites[:-1], limites[1:]) if fim > inicio]
+
+def _completar_eventos(encadeados, window, datas, horarios, inicio=0):
+    """
+    Eventos (alternâncias, linha, padrão) no formato de _executar_simulacao, com a linha contada a
+    partir de inicio. Dia e horário vêm da linha seguinte à inicial, como no laço sequencial.
+    """
+    return [
+        (alternados >= window, alternados, linha - inicio, padrao, datas[linha + 1], horarios[linha + 1])
+        for alternados, linha, padrao in encadeados
+    ]
+
+def _costurar(eventos, max_levels, window, total_linhas):
+    """
+    Numera os eventos em níveis e sequências como _executar_simulacao, em ordem. Um stop que
+    passa de max_levels fecha a sequência na iteração seguinte do laço, que sempre ocorre antes
+    do próximo evento e, depois do último, só se sobrar alguma linha para percorrer.
+    """
+    estado = _estado_inicial(max_levels, window)
+    registros = estado['registros']
+    nivel, seq, posicoes_seq, proxima_posicao = 1, {}, [], 0
+    
+    def fechar_seq(seq, posicoes_seq):
+        for posicao in posicoes_seq:
+            for nivel_op, operacao in seq.items():
+                registros.append((posicao, nivel_op) + operacao)
+    
+    for evento in eventos:
+        if nivel > max_levels:
+            fechar_seq(seq, posicoes_seq)
+            nivel, seq, posicoes_seq = 1, {}, [proxima_posicao]
+            proxima_posicao += 1
+        
+        seq[nivel] = evento
+        if evento[0]:
+            posicoes_seq.append(proxima_posicao)
+            proxima_posicao += 1
+            fechar_seq(seq, posicoes_seq)
+            seq, posicoes_seq, nivel = {}, [], 1
+        else:
+            nivel += 1
+    
+    if nivel > max_levels and eventos and eventos[-1][2] + eventos[-1][1] < total_linhas:
+        fechar_seq(seq, posicoes_seq)
+        nivel, seq, posicoes_seq = 1, {}, [proxima_posicao]
+        proxima_posicao += 1
+    
+    estado.update(nivel=nivel, seq=seq, posicoes_seq=posicoes_seq, proxima_posicao=proxima_posicao)
+    return _encerrar_simulacao(estado)
+
+def detectar_alternancias_paralelo(candles, max_levels=350, window=6, max_workers=None, blocos=None):
+    """
+    Mesmos eventos de detectar_alternancias, com os dias divididos em blocos percorridos num pool
+    de processos. Cada bloco devolve seus eventos candidatos para cada espera de reset com que pode
+    começar; uma passada sequencial encadeia os blocos pela espera deixada pelo anterior e numera
+    níveis e sequências. Com um único processo, os blocos rodam aqui mesmo, sem pool.
+    """
+    dados = candles[COLUNAS_SIMULACAO].reset_index(drop=True)
+    limites = _blocos_de_dias(dados['DataApenas'].to_numpy(), blocos or numero_de_processos(max_workers) * BLOCOS_POR_PROCESSO)
+    
+    partes = [dados.iloc[max(inicio - 1, 0):fim] for inicio, fim in limites]
+    contextos = [inicio > 0 for inicio, _ in limites]
+    processos = min(numero_de_processos(max_workers), len(partes))
+    if processos > 1:
+        with criar_pool(processos) as pool:
+            caminhos = list(pool.map(detectar_bloco, partes, [window] * len(partes), contextos))
+    else:
+        caminhos = [detectar_bloco(parte, window, contexto) for parte, contexto in zip(partes, contextos)]
+    
+    encadeados, reset = [], SEM_ESPERA
+    for (inicio, _), parte, contexto, caminhos_bloco in zip(limites, partes, contextos, caminhos):
+        if reset not in caminhos_bloco:
+            # Espera de reset não prevista (lado que não aparece no bloco): percorre o bloco de novo
+            caminhos_bloco = detectar_bloco(parte, window, contexto, resets=[reset])
+        eventos_bloco, convergencia, reset = caminhos_bloco[reset]
+        if convergencia is not None:
+            eventos_bloco = eventos_bloco + caminhos_bloco[SEM_ESPERA][0][convergencia:]
+        deslocamento = inicio - 1 if contexto else inicio
+        encadeados.extend((alternados, linha + deslocamento, padrao) for alternados, linha, padrao in eventos_bloco)
+    
+    eventos = _completar_eventos(encadeados, window, dados['DataApenas'].to_numpy(), dados['Data'].to_numpy())
+    return montar_eventos(_costurar(eventos, max_levels, window, len(dados)))
+
+def simular_paralelo(candles, max_levels=350, window=6, contratos=1, tabela_pontos=None, ativo_escolhido=None,
+                     max_workers=None):
+    """simular() com a detecção de detectar_alternancias_paralelo"""
+    return precificar(
+        detectar_alternancias_paralelo(candles, max_levels, window, max_workers),
+        tabela_pontos=tabela_pontos,
+        contratos=contratos,
+        ativo_escolhido=ativo_escolhido
+    )
+
+# ===============================
+# Detecção de faixas de dias sobre um índice compartilhado
+# ===============================
+def indexar_dias(candles, window=6):
+    """
+    Índice para detectar qualquer faixa de dias inteiros dos candles (na ordem da simulação) sem
+    percorrer tudo de novo: colunas extraídas, índice de alternâncias, limites de cada dia e os
+    caminhos de cada dia por espera de reset na entrada. Os caminhos da sequência completa são
+    percorridos aqui; os de outras entradas, na primeira vez em que uma faixa precisar deles.
+    """
+    datas = candles['DataApenas'].to_numpy()
+    inicios = np.flatnonzero(np.r_[True, datas[1:] != datas[:-1]]) if len(datas) else np.array([], dtype=np.int64)
+    
+    indice_dias = {
+        'window': window,
+        'barras': candles['Barras'].tolist(),
+        'indice': construir_indice_alternancia(candles, window).tolist(),
+        'inicios_dia': np.r_[True, datas[1:] != datas[:-1]].tolist() if len(datas) else [],
+        'limites': np.r_[inicios, len(datas)].astype(np.int64),
+        'datas': datas,
+        'horarios': candles['Data'].to_numpy(),
+        'caminhos': {}
+    }
+    
+    reset = SEM_ESPERA
+    for dia in range(len(inicios)):
+        _, reset = _caminho_do_dia(indice_dias, dia, reset)
+    return indice_dias
+
+def _caminho_do_dia(indice_dias, dia, reset):
+    """(eventos, reset na saída) do dia (posição na ordem da simulação) entrando com reset, memorizados no índice"""
+    caminhos = indice_dias['caminhos']
+    if (dia, reset) not in caminhos:
+        limites = indice_dias['limites']
+        eventos, saida, _, _ = _percorrer_bloco(
+            indice_dias['barras'], indice_dias['indice'], indice_dias['inicios_dia'], int(limites[dia]),
+            indice_dias['window'], reset, fim=int(limites[dia + 1])
+        )
+        caminhos[(dia, reset)] = (eventos, saida)
+    return caminhos[(dia, reset)]
+
+def detectar_dias(indice_dias, primeiro, ultimo, max_levels=350, resumido=False):
+    """
+    Eventos de detectar_alternancias sobre os dias primeiro .. ultimo - 1 (posições na ordem da
+    simulação) como se só eles tivessem sido recebidos, com as linhas contadas a partir do primeiro.
+    Cada dia sai do índice pela espera de reset deixada pelo anterior; os dias só são percorridos
+    quando essa entrada ainda não foi vista. Com resumido, só as colunas que a precificação e as
+    estatísticas por nível usam (Sequencia, Nivel, Ganho, Alternancias e Linha_Inicial).
+    """
+    encadeados, reset = [], SEM_ESPERA
+    for dia in range(primeiro, ultimo):
+        eventos_dia, reset = _caminho_do_dia(indice_dias, dia, reset)
+        encadeados.extend(eventos_dia)
+    
+    window = indice_dias['window']
+    limites = indice_dias['limites']
+    inicio = int(limites[primeiro]) if ultimo > primeiro else 0
+    total_linhas = int(limites[ultimo]) - inicio if ultimo > primeiro else 0
+    
+    if resumido:
+        eventos = [(alternados >= window, alternados, linha - inicio) for alternados, linha, _ in encadeados]
+        return _montar_eventos_resumidos(_costurar(eventos, max_levels, window, total_linhas))
+    
+    eventos = _completar_eventos(encadeados, window, indice_dias['datas'], indice_dias['horarios'], inicio)
+    return montar_eventos(_costurar(eventos, max_levels, window, total_linhas))
+
+def _montar_eventos_resumidos(registros):
+    """Registros (sequência, nível, ganho, alternâncias, linha inicial) com os mesmos tipos de montar_eventos"""
+    valores = np.array(registros, dtype=np.int64).reshape(-1, 5)
+    return pd.DataFrame({
+        'Sequencia': valores[:, 0].astype(np.int32),
+        'Nivel': valores[:, 1].astype(np.int16),
+        'Ganho': valores[:, 2].astype(bool),
+        'Alternancias': valores[:, 3].astype(np.int8),
+        'Linha_Inicial': valores[:, 4]
+    })
+
+def _rotulos_dia(dias):
+    """Dia como texto AAAA-MM-DD (DataApenas é o nº de dias desde 1970-01-01)"""
+    dias = np.asarray(dias)
+    if not np.issubdtype(dias.dtype, np.integer):
+        return dias
+    return np.where(dias >= 0, dias.astype(np.int64).astype("datetime64[D]").astype(str), "NaT")
+
+def montar_eventos(registros):
+    """Converte os registros (sequência, nível, ganho, alternâncias, linha inicial, padrão, dia, horário) em colunas tipadas"""
+    colunas = ['Sequencia', 'Nivel', 'Ganho', 'Alternancias', 'Linha_Inicial', 'Padrao', 'Dia', 'Data']
+    valores = list(zip(*registros)) if registros else [[] for _ in colunas]
+    brutos = dict(zip(colunas, valores))
+    
+    alternancias = np.asarray(brutos['Alternancias'], dtype=np.int64)
+    linha_inicial = np.asarray(brutos['Linha_Inicial'], dtype=np.int64)
+    
+    return pd.DataFrame({
+        'Sequencia': np.asarray(brutos['Sequencia'], dtype=np.int32),
+        'Nivel': np.asarray(brutos['Nivel'], dtype=np.int16),
+        'Ganho': np.asarray(brutos['Ganho'], dtype=bool),
+        'Padrao': pd.Categorical(brutos['Padrao']),
+        'Alternancias': alternancias.astype(np.int8),
+        'Linha_Inicial': linha_inicial,
+        'Linha_Final': linha_inicial + alternancias - 1,
+        'Dia': pd.Categorical(_rotulos_dia(brutos['Dia'])),
+        'Data': pd.Series(np.asarray(brutos['Data'], dtype='datetime64[ns]'))
+    })
+
+def matriz_por_sequencia(operacoes):
+    """Monta a matriz numérica Nível x Sequência (0 onde não houve operação)"""
+    if operacoes.empty:
+        return pd.DataFrame()
+    
+    matriz = operacoes.pivot(index='Nivel', columns='Sequencia', values='Pontos')
+    matriz = matriz.fillna(0).astype(np.int64)
+    matriz.index.name = "Nível"
+    matriz.columns.name = None
+    return matriz
+
+def formatar_operacoes(operacoes):
+    """Monta a tabela Nível x Sequência com o texto de cada operação (pontos, padrão, linhas e dia)"""
+    if operacoes.empty:
+        return pd.DataFrame()
+    
+    textos = [
+        f"{pontos:+d} | Seq: {padrao} | Linhas: {list(range(ini, fim + 1))} | Dia: {dia}"
+        for pontos, padrao, ini, fim, dia in zip(
+            operacoes['Pontos'], operacoes['Padrao'], operacoes['Linha_Inicial'],
+            operacoes['Linha_Final'], operacoes['Dia']
+        )
+    ]
+    tabela = operacoes[['Nivel', 'Sequencia']].assign(Texto=textos)
+    tabela = tabela.pivot(index='Nivel', columns='Sequencia', values='Texto')
+    tabela.index.name = "Nível"
+    tabela.columns.name = None
+    return tabela
+
+def total_de_sequencias(eventos, total_linhas, max_levels=350):
+    """
+    Nº de colunas da tabela Nível x Sequência dos eventos de uma detecção sobre total_linhas
+    linhas. Além das sequências com operações, a simulação abre uma sequência vazia quando a
+    última passa de max_levels stops e ainda sobram linhas, como em _costurar.
+    """
+    if eventos.empty:
+        return 0
+    
+    ultimo = eventos.iloc[-1]
+    total = int(ultimo['Sequencia']) + 1
+    if ultimo['Nivel'] == max_levels and not ultimo['Ganho'] and ultimo['Linha_Inicial'] + ultimo['Alternancias'] < total_linhas:
+        total += 1
+    return total
+
+def montar_tabela_resultado(operacoes, sequencias=None):
+    """
+    Retorna a tabela de exibição (com 'Total por Linha' e linha TOTAL) e a matriz numérica.
+    Com sequencias (ids de Sequencia, por exemplo range(total_de_sequencias(...))), são montadas
+    exatamente essas colunas, vazias onde não houve operação; 'Total por Linha' continua somando
+    todas as operações de cada nível.
+    """
+    total_por_nivel = operacoes.groupby('Nivel')['Pontos'].sum()
+    if sequencias is not None:
+        operacoes = operacoes[operacoes['Sequencia'].isin(sequencias)]
+    
+    resultado = formatar_operacoes(operacoes)
+    resultado_numerico = matriz_por_sequencia(operacoes)
+    if sequencias is not None:
+        # Níveis e sequências sem operação nas colunas mostradas continuam na tabela
+        niveis = total_por_nivel.index.rename("Nível")
+        resultado = resultado.reindex(index=niveis, columns=list(sequencias))
+        resultado_numerico = resultado_numerico.reindex(index=niveis, columns=list(sequencias), fill_value=0)
+    
+    resultado["Total por Linha"] = total_por_nivel
+    total_linha = resultado_numerico.sum()
+    total_linha["Total por Linha"] = resultado["Total por Linha"].sum()
+    resultado.loc["TOTAL"] = total_linha
+    
+    return resultado, resultado_numerico
+
+def preparar_para_simulacao(candles, hora_inicio, hora_fim):
+    """Filtra o horário de negociação e inverte a ordem (mais recente primeiro), como a simulação espera"""
+    dados = candles[mascara_horario(candles, hora_inicio, hora_fim)]
+    return dados.iloc[::-1].reset_index(drop=True)
@@ -0,0 +1,75 @@
+"""
+Janela paginada de tabelas grandes: filtro, ordenação e busca de dia feitos aqui, sobre posições
+das linhas, para que só as linhas da página exibida sejam copiadas, formatadas e enviadas ao navegador
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+LINHAS_POR_PAGINA = 50
+
+_COMPARACAO = re.compile(r"^\s*(>=|<=|==|=|>|<)?\s*(-?\d+(?:[.,]\d+)?)\s*$")
+
+def filtrar_posicoes(df, posicoes, coluna, filtro):
+    """
+    Posições (entre as informadas) cujas linhas passam no filtro da coluna. Em colunas numéricas
+    o filtro é um número ou uma comparação ('>= 500', '<0', '=1'); nas demais, um trecho do texto
+    (sem diferenciar maiúsculas). Filtro vazio não filtra.
+    """
+    if not coluna or not filtro or not str(filtro).strip():
+        return posicoes
+    
+    valores = df[coluna].iloc[posicoes]
+    if pd.api.types.is_numeric_dtype(valores) and not pd.api.types.is_bool_dtype(valores):
+        comparacao = _COMPARACAO.match(str(filtro))
+        if comparacao is None:
+            raise ValueError(f"Filtro inválido para '{coluna}': use um número ou uma comparação como >= 500")
+        operador, numero = comparacao.group(1) or '=', float(comparacao.group(2).replace(',', '.'))
+        valores = valores.to_numpy()
+        mascara = {
+            '>=': valores >= numero, '<=': valores <= numero, '>': valores > numero,
+            '<': valores < numero, '=': valores == numero, '==': valores == numero
+        }[operador]
+    else:
+        mascara = valores.astype(str).str.contains(str(filtro).strip(), case=False, regex=False).to_numpy()
+    
+    return posicoes[mascara]
+
+def ordenar_posicoes(df, posicoes, coluna, crescente=True):
+    """Posições na ordem da coluna (estável, vazios no fim); sem coluna, mantém a ordem da tabela"""
+    if not coluna:
+        return posicoes
+    
+    valores = df[coluna].iloc[posicoes].reset_index(drop=True)
+    ordem = valores.sort_values(ascending=crescente, kind='stable', na_position='last').index.to_numpy()
+    return posicoes[ordem]
+
+def posicoes_da_tabela(df, ordenar_por=None, crescente=True, filtro_coluna=None, filtro=None):
+    """Posições das linhas do df filtradas e ordenadas, na ordem em que serão exibidas"""
+    posicoes = np.arange(len(df))
+    posicoes = filtrar_posicoes(df, posicoes, filtro_coluna, filtro)
+    return ordenar_posicoes(df, posicoes, ordenar_por, crescente)
+
+def total_de_paginas(quantidade, linhas_por_pagina=LINHAS_POR_PAGINA):
+    """Quantidade de páginas para 'quantidade' linhas (ao menos uma, mesmo vazia)"""
+    return max(1, -(-quantidade // linhas_por_pagina))
+
+def pagina_do_dia(df, posicoes, coluna_data, dia, linhas_por_pagina=LINHAS_POR_PAGINA):
+    """Página (a partir de 1) da primeira linha exibida do dia, ou None se o dia não aparece"""
+    if not len(posicoes):
+        return None
+    
+    datas = df[coluna_data].iloc[posicoes]
+    if not pd.api.types.is_datetime64_any_dtype(datas):
+        # Datas como objetos date (índice do resumo diário) ou texto
+        datas = pd.to_datetime(datas, errors='coerce')
+    encontradas = np.flatnonzero(datas.to_numpy().astype('datetime64[D]') == np.datetime64(pd.Timestamp(dia).date(), 'D'))
+    if not len(encontradas):
+        return None
+    return int(encontradas[0]) // linhas_por_pagina + 1
+
+def linhas_da_pagina(df, posicoes, pagina, linhas_por_pagina=LINHAS_POR_PAGINA):
+    """Linhas da página (a partir de 1) na ordem das posições; só essa fatia é copiada"""
+    inicio = (pagina - 1) * linhas_por_pagina
+    return df.iloc[posicoes[inicio:inicio + linhas_por_pagina]]
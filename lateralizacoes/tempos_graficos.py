@@ -0,0 +1,203 @@
+"""
+Reamostragem das barras de 1 minuto para tempos gráficos maiores (2, 5, 15 minutos...) e a
+simulação e a análise de sequências de vários tempos gráficos em paralelo, para comparar lado a
+lado se a lateralização se mantém em barras maiores sem exportar novos arquivos da plataforma
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from lateralizacoes.barras import analisar_sequencias_barras_por_categoria
+from lateralizacoes.estatisticas import resumir_operacoes
+from lateralizacoes.ingestao import mascara_horario, normalizar_candles
+from lateralizacoes.paralelo import criar_pool, numero_de_processos
+from lateralizacoes.range_diario import encontrar_colunas_maxima_minima
+from lateralizacoes.simulacao import detectar_alternancias, precificar, preparar_para_simulacao
+
+TEMPOS_GRAFICOS_PADRAO = (1, 2, 5, 15)
+
+# Mesmo padrão do tamanho máximo de sequência da seção de estatística de barras
+MAX_SEQUENCIA_PADRAO = 3
+
+CATEGORIAS_SEQUENCIA = ['Lateral', 'Compradora', 'Vendedora']
+
+COLUNAS_ABERTURA = ['Abertura', 'ABERTURA', 'Abertura ']
+COLUNAS_FECHAMENTO = ['Fechamento', 'FECHAMENTO', 'Fechamento ']
+
+MAX_RESULTADOS_CACHE = 64
+
+_cache_tempos = OrderedDict()
+_trava = threading.Lock()
+
+def encontrar_colunas_precos(candles):
+    """Colunas (abertura, máxima, mínima, fechamento) do arquivo, com None nas que não existem"""
+    coluna_maxima, coluna_minima = encontrar_colunas_maxima_minima(candles)
+    coluna_abertura = next((coluna for coluna in COLUNAS_ABERTURA if coluna in candles.columns), None)
+    coluna_fechamento = next((coluna for coluna in COLUNAS_FECHAMENTO if coluna in candles.columns), None)
+    return coluna_abertura, coluna_maxima, coluna_minima, coluna_fechamento
+
+def reamostrar(candles, tempos=TEMPOS_GRAFICOS_PADRAO, hora_inicio=None, hora_fim=None):
+    """
+    {minutos: candles do tempo gráfico} para cada tempo em 'tempos', a partir de uma única
+    ordenação das linhas. Cada barra junta os minutos [início, início + minutos) contados a partir
+    de hora_inicio (ou da meia-noite), sem atravessar a virada do dia e, com horário, só com as
+    linhas entre hora_inicio e hora_fim.
+    
+    Os preços que existirem viram Abertura (primeira), Máxima (maior), Mínima (menor) e Fechamento
+    (último). Barras = 1 (compradora) se fechou acima da abertura e 0 se abaixo; sem abertura e
+    fechamento no arquivo, ou no empate, vale a cor da maioria das barras do grupo e, se empatar, a
+    da última. Ano, DataApenas e Hora são refeitos como em normalizar_candles.
+    """
+    datas = candles['Data'].to_numpy()
+    if hora_inicio is None:
+        mascara = ~np.isnat(datas)
+    else:
+        mascara = mascara_horario(candles, hora_inicio, hora_fim)
+    posicoes = np.flatnonzero(mascara)
+    posicoes = posicoes[np.argsort(datas[posicoes], kind='stable')]
+    
+    minutos_absolutos = datas[posicoes].astype('datetime64[m]').astype(np.int64)
+    dias = minutos_absolutos // 1440
+    origem = 0 if hora_inicio is None else hora_inicio.hour * 60 + hora_inicio.minute
+    
+    barras = candles['Barras'].to_numpy()[posicoes]
+    coluna_abertura, coluna_maxima, coluna_minima, coluna_fechamento = encontrar_colunas_precos(candles)
+    precos = {
+        coluna: candles[coluna].to_numpy()[posicoes]
+        for coluna in (coluna_abertura, coluna_maxima, coluna_minima, coluna_fechamento) if coluna
+    }
+    
+    resultado = {}
+    for minutos in tempos:
+        # Início de cada barra em minutos desde 1970, sempre dentro do próprio dia
+        grupo = dias * 1440 + origem + (minutos_absolutos - dias * 1440 - origem) // minutos * minutos
+        inicio = np.flatnonzero(np.r_[True, grupo[1:] != grupo[:-1]]) if len(grupo) else np.array([], dtype=np.int64)
+        ultima = np.r_[inicio[1:], len(grupo)] - 1
+        
+        quantidade = ultima - inicio + 1
+        compradoras = np.add.reduceat(barras.astype(np.int64), inicio) if len(inicio) else np.array([], dtype=np.int64)
+        cor = np.where(2 * compradoras > quantidade, 1, np.where(2 * compradoras < quantidade, 0, barras[ultima]))
+        if coluna_abertura and coluna_fechamento:
+            abertura, fechamento = precos[coluna_abertura][inicio], precos[coluna_fechamento][ultima]
+            cor = np.where(fechamento > abertura, 1, np.where(fechamento < abertura, 0, cor))
+        
+        colunas = {'Data': (grupo[inicio] * 60_000_000_000).astype('datetime64[ns]')}
+        if coluna_abertura:
+            colunas[coluna_abertura] = precos[coluna_abertura][inicio]
+        if coluna_maxima:
+            colunas[coluna_maxima] = np.maximum.reduceat(precos[coluna_maxima], inicio) if len(inicio) else precos[coluna_maxima]
+        if coluna_minima:
+            colunas[coluna_minima] = np.minimum.reduceat(precos[coluna_minima], inicio) if len(inicio) else precos[coluna_minima]
+        if coluna_fechamento:
+            colunas[coluna_fechamento] = precos[coluna_fechamento][ultima]
+        colunas['Barras'] = cor.astype(barras.dtype)
+        
+        resultado[minutos] = normalizar_candles(pd.DataFrame(colunas))
+    
+    return resultado
+
+def estatisticas_das_barras(candles):
+    """
+    Nº de barras, % de compradoras e probabilidade de a barra seguinte (no mesmo dia) trocar de
+    cor, que é o que alimenta as alternâncias
+    """
+    barras = candles['Barras'].to_numpy()
+    dias = candles['DataApenas'].to_numpy()
+    mesmo_dia = dias[1:] == dias[:-1]
+    trocas = (barras[1:] != barras[:-1]) & mesmo_dia
+    pares = int(mesmo_dia.sum())
+    
+    return {
+        'Barras': len(barras),
+        '% Compradoras': float(barras.mean() * 100) if len(barras) else 0.0,
+        'Prob. Alternância (%)': float(trocas.sum() / pares * 100) if pares else 0.0
+    }
+
+def sequencias_por_categoria(candles, max_sequencia=MAX_SEQUENCIA_PADRAO):
+    """
+    analisar_sequencias_barras_por_categoria numa única tabela, com a coluna Categoria (Lateral,
+    Compradora ou Vendedora) antes das colunas da análise
+    """
+    categorias = analisar_sequencias_barras_por_categoria(candles, max_sequencia)
+    return pd.concat(
+        [tabela.assign(Categoria=categoria) for categoria, tabela in zip(CATEGORIAS_SEQUENCIA, categorias)],
+        ignore_index=True
+    )[['Categoria'] + list(categorias[0].columns)]
+
+def detectar_tempo_grafico(candles, minutos, hora_inicio, hora_fim, window, max_sequencia=MAX_SEQUENCIA_PADRAO):
+    """
+    Reamostra, detecta as alternâncias e analisa as sequências de barras de um tempo gráfico
+    (executado nos workers). O tempo de 1 minuto usa as barras do próprio arquivo e as sequências
+    são lidas na ordem da simulação (mais recente primeiro), como nas seções da página. Retorna
+    (eventos, estatísticas das barras, sequências por categoria).
+    """
+    if minutos == 1:
+        barras = candles[mascara_horario(candles, hora_inicio, hora_fim)]
+    else:
+        barras = reamostrar(candles, [minutos], hora_inicio, hora_fim)[minutos]
+    
+    dados = preparar_para_simulacao(barras, hora_inicio, hora_fim)
+    eventos = detectar_alternancias(dados, window=window)
+    return eventos, estatisticas_das_barras(barras), sequencias_por_categoria(dados, max_sequencia)
+
+def simular_tempos_graficos(candles, tempos, hora_inicio, hora_fim, window, contratos=1, tabela_pontos=None,
+                            ativo_escolhido=None, chave=None, max_workers=None, max_sequencia=MAX_SEQUENCIA_PADRAO):
+    """
+    Simula e analisa as sequências de barras dos candles (já restritos ao ano, por exemplo) em cada
+    tempo gráfico, com os tempos que faltam no cache rodando em paralelo, um por worker. Retorna:
+      - {minutos: livro de operações}
+      - comparação lado a lado: estatísticas das barras, nº de sequências com viés e
+        resumir_operacoes de cada tempo gráfico
+      - sequências: sequencias_por_categoria de todos os tempos gráficos, com a coluna Tempo Gráfico
+    Com a chave (arquivo, ano...), eventos e sequências ficam em cache e só a precificação roda de novo.
+    """
+    chaves = {minutos: (chave, minutos, window, hora_inicio, hora_fim, max_sequencia) for minutos in tempos}
+    
+    detectados = {}
+    if chave is not None:
+        with _trava:
+            for minutos, chave_tempo in chaves.items():
+                if chave_tempo in _cache_tempos:
+                    _cache_tempos.move_to_end(chave_tempo)
+                    detectados[minutos] = _cache_tempos[chave_tempo]
+    
+    faltantes = [minutos for minutos in tempos if minutos not in detectados]
+    colunas = ['Data', 'Barras', 'DataApenas'] + [coluna for coluna in encontrar_colunas_precos(candles) if coluna]
+    dados = candles[colunas]
+    
+    if len(faltantes) == 1:
+        # Um único tempo gráfico não compensa subir o pool de processos
+        detectados[faltantes[0]] = detectar_tempo_grafico(dados, faltantes[0], hora_inicio, hora_fim, window, max_sequencia)
+    elif faltantes:
+        with criar_pool(min(numero_de_processos(max_workers), len(faltantes))) as pool:
+            futuros = {
+                minutos: pool.submit(detectar_tempo_grafico, dados, minutos, hora_inicio, hora_fim, window, max_sequencia)
+                for minutos in faltantes
+            }
+            for minutos, futuro in futuros.items():
+                detectados[minutos] = futuro.result()
+    
+    if chave is not None:
+        with _trava:
+            for minutos in faltantes:
+                _cache_tempos[chaves[minutos]] = detectados[minutos]
+            while len(_cache_tempos) > MAX_RESULTADOS_CACHE:
+                _cache_tempos.popitem(last=False)
+    
+    livros, linhas, sequencias = {}, [], []
+    for minutos in tempos:
+        eventos, barras, sequencias_tempo = detectados[minutos]
+        livros[minutos] = precificar(eventos, tabela_pontos, contratos, ativo_escolhido=ativo_escolhido)
+        linhas.append({
+            'Tempo Gráfico': f"{minutos} min",
+            **barras,
+            'Sequências com Viés': int((sequencias_tempo['Viés'] != 'Neutro').sum()),
+            **resumir_operacoes(livros[minutos])
+        })
+        sequencias.append(pd.concat([pd.Series(f"{minutos} min", index=sequencias_tempo.index, name='Tempo Gráfico'),
+                                     sequencias_tempo], axis=1))
+    
+    sequencias = pd.concat(sequencias, ignore_index=True) if sequencias else pd.DataFrame()
+    return livros, pd.DataFrame(linhas), sequencias
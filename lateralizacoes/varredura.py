@@ -0,0 +1,80 @@
+"""Varredura de parâmetros (window x hora inicial x hora final) em paralelo"""
+from concurrent.futures import as_completed
+from datetime import datetime, timedelta
+
+from lateralizacoes.estatisticas import resumir_operacoes
+from lateralizacoes.paralelo import criar_pool
+from lateralizacoes.sessoes import construir_indice_sessoes, selecionar_sessoes
+from lateralizacoes.simulacao import COLUNAS_SIMULACAO, preparar_para_simulacao, simular
+
+# Candles recebidos uma única vez por worker (via initializer), e não a cada combinação,
+# com o índice de sessões montado ali para que cada horário seja só uma busca binária
+_candles_worker = None
+_indice_worker = None
+
+def _iniciar_worker(candles):
+    global _candles_worker, _indice_worker
+    _candles_worker = candles
+    _indice_worker = construir_indice_sessoes(candles)
+
+def faixa_horarios(inicio, fim, passo_minutos):
+    """Lista de horários de inicio até fim (inclusive), de passo_minutos em passo_minutos"""
+    atual = datetime.combine(datetime.min, inicio)
+    limite = datetime.combine(datetime.min, fim)
+    horarios = []
+    while atual <= limite:
+        horarios.append(atual.time())
+        atual += timedelta(minutes=passo_minutos)
+    return horarios
+
+def montar_grade(windows, horas_inicio, horas_fim):
+    """Todas as combinações (window, hora inicial, hora final) com hora inicial antes da final"""
+    return [
+        (window, hora_inicio, hora_fim)
+        for window in windows
+        for hora_inicio in horas_inicio
+        for hora_fim in horas_fim
+        if hora_inicio < hora_fim
+    ]
+
+def avaliar_combinacao(candles, window, hora_inicio, hora_fim, contratos=1, tabela_pontos=None, ativo_escolhido=None,
+                       indice=None):
+    """Simula uma combinação de parâmetros e devolve o resumo numa linha"""
+    if indice is not None:
+        dados = selecionar_sessoes(candles, indice, hora_inicio, hora_fim)
+    else:
+        dados = preparar_para_simulacao(candles, hora_inicio, hora_fim)
+    operacoes = simular(
+        dados,
+        window=window,
+        contratos=contratos,
+        tabela_pontos=tabela_pontos,
+        ativo_escolhido=ativo_escolhido
+    )
+    
+    return {
+        'Window': window,
+        'Hora Inicial': hora_inicio.strftime("%H:%M"),
+        'Hora Final': hora_fim.strftime("%H:%M"),
+        **resumir_operacoes(operacoes)
+    }
+
+def _avaliar_no_worker(parametros):
+    return avaliar_combinacao(_candles_worker, *parametros, indice=_indice_worker)
+
+def varrer_parametros(candles, grade, contratos=1, tabela_pontos=None, ativo_escolhido=None, max_workers=None):
+    """
+    Executa a simulação para cada combinação da grade num pool de processos.
+    É um gerador: cada resumo é devolvido assim que o worker termina, fora de ordem.
+    """
+    pool = criar_pool(max_workers, _iniciar_worker, (candles[COLUNAS_SIMULACAO],))
+    try:
+        futuros = [
+            pool.submit(_avaliar_no_worker, (window, hora_inicio, hora_fim, contratos, tabela_pontos, ativo_escolhido))
+            for window, hora_inicio, hora_fim in grade
+        ]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+    finally:
+        # Se a varredura for interrompida, descarta o que ainda não começou
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,1671 @@
+"""Página do Streamlit: entrada do arquivo, parâmetros e as abas de análise (cálculos em lateralizacoes)"""
+import streamlit as st 
+import pandas as pd 
+import plotly.express as px 
+import plotly.graph_objects as go
+
+from lateralizacoes.amostragem import reduzir_serie
+
+from lateralizacoes.barras import (
+    analisar_sequencias_barras_por_categoria,
+    calcular_frequencia_barras,
+    evolucao_do_padrao,
+    tabela_padroes_por_dia,
+)
+from lateralizacoes.checkpoints import detectar_cronologico
+from lateralizacoes.comparacao import eventos_anos, simular_anos
+from lateralizacoes.diagnostico import configurar_log, etapa, novo_diagnostico, tabela_diagnostico
+from lateralizacoes.estatisticas import (
+    calcular_estatisticas_por_nivel,
+    stops_do_nivel,
+    totais_por_nivel,
+)
+from lateralizacoes.ingestao import COLUNAS_DERIVADAS, carregar_candles, hash_conteudo
+from lateralizacoes.janelas import indice_do_historico, walk_forward
+from lateralizacoes.periodos import calcular_estatisticas_por_periodo, filtrar_por_periodo
+from lateralizacoes.range_diario import (
+    calcular_media_range_por_periodo,
+    calcular_range_diario,
+    encontrar_colunas_maxima_minima,
+    linhas_do_dia,
+    obter_dias_por_periodo,
+    resumo_diario,
+)
+from lateralizacoes.risco import CAMINHOS_PADRAO, ciclos_do_nivel, resumir_caminhos, simular_caminhos
+from lateralizacoes.sessoes import indice_sessoes, selecionar_sessoes
+from lateralizacoes.simulacao import (
+    comparar_tabelas_pontos,
+    montar_tabela_resultado,
+    precificar,
+    stop_do_ativo,
+    total_de_sequencias,
+    valores_por_ativo,
+)
+from lateralizacoes.tabelas import (
+    LINHAS_POR_PAGINA,
+    linhas_da_pagina,
+    pagina_do_dia,
+    posicoes_da_tabela,
+    total_de_paginas,
+)
+from lateralizacoes.tempos_graficos import (
+    CATEGORIAS_SEQUENCIA,
+    MAX_SEQUENCIA_PADRAO,
+    TEMPOS_GRAFICOS_PADRAO,
+    encontrar_colunas_precos,
+    simular_tempos_graficos,
+)
+from lateralizacoes.varredura import faixa_horarios, montar_grade, varrer_parametros
+
+# Colunas (sequências) da tabela Nível x Sequência montadas por vez
+SEQUENCIAS_POR_PAGINA = 100
+
+SECOES = [
+    "📈 Sequências", "📊 Estatísticas", "🎯 Probabilidades", "📊 Estatística de Barras", "🧪 Varredura", "🚶 Walk-forward",
+    "⏱ Tempos Gráficos"
+]
+
+# Seções que usam o livro de operações do ano
+SECOES_COM_SIMULACAO = SECOES[:3]
+
+ORDENS_SIMULACAO = ["Invertida (mais recente primeiro)", "Cronológica (retoma do último arquivo)"]
+
+# Pontos por linha nos gráficos de séries longas (pouco mais que a largura em pixels de um gráfico na página)
+PONTOS_POR_LINHA = 1500
+
+# A partir de quantos pontos na figura as linhas são desenhadas com WebGL (o mesmo corte do plotly express)
+PONTOS_WEBGL = 1000
+
+# Formato das colunas das tabelas de range diário
+FORMATOS_RANGE = {
+    'Maior Máxima': '{:.0f}',
+    'Menor Mínima': '{:.0f}',
+    'Range Diário': '{:.0f}'
+}
+
+# Controles de cada tabela paginada (chave da tabela + sufixo); o botão de ir ao dia não guarda estado
+CONTROLES_TABELA = ["ordem", "crescente", "filtro_coluna", "filtro", "dia", "pagina"]
+
+# Tabelas paginadas de cada seção
+TABELAS_POR_SECAO = {
+    SECOES[0]: ["tabela_dados"],
+    SECOES[2]: ["tabela_dias_30", "tabela_dias_90", "tabela_dias_180", "tabela_range_ano"],
+    SECOES[5]: ["tabela_walk_forward"]
+}
+
+# Widgets com chave de cada seção
+WIDGETS_POR_SECAO = {
+    SECOES[0]: ["ordem_simulacao", "pagina_sequencias"],
+    SECOES[1]: ["periodo_estatistica", "modo_visualizacao_estat", "limite_stops_estat",
+                "anos_comparacao_estat", "nivel_ref_estat", "nivel_selecionado_estat",
+                "caminhos_risco", "capital_risco"],
+    SECOES[2]: [],
+    SECOES[3]: ["periodo_analise_barras", "max_sequencia_barras", "sequencia_evolucao",
+                "tipo_prob_evolucao", "janela_media_evolucao"],
+    SECOES[4]: ["metrica_varredura"],
+    SECOES[5]: ["nivel_walk_forward"],
+    SECOES[6]: ["categoria_sequencia_tempos"]
+}
+
+# ===============================
+# 🎨 Estilo customizado
+# ===============================
+ESTILO_CSS = """
+<style>
+.main {
+    background-color: #1E1E1E;
+    color: #FAFAFA;
+}
+.css-1d391kg, .css-1lcbmhc {
+    background-color: #262730 !important;
+    border-radius: 10px;
+    padding: 10px;
+}
+.dataframe {
+    background-color: #2E2E2E;
+    color: #FAFAFA;
+    border-radius: 10px;
+    padding: 8px;
+}
+.stNumberInput, .stTimeInput, .stSelectbox, .stFileUploader {
+    border-radius: 10px !important;
+}
+h1, h2, h3, h4 {
+    color: #4CAF50 !important;
+    text-align: center;
+    font-weight: bold;
+}
+table td, table th {
+    text-align: center !important;
+}
+</style>
+"""
+
+# ===============================
+# GRÁFICO DA VARREDURA DE PARÂMETROS
+# ===============================
+def grafico_varredura(df_varredura, metrica):
+    """Mapa de calor Hora Inicial x Hora Final da métrica escolhida, um painel por window"""
+    fig = px.density_heatmap(
+        df_varredura.sort_values(['Hora Inicial', 'Hora Final']),
+        x='Hora Final',
+        y='Hora Inicial',
+        z=metrica,
+        facet_col='Window',
+        facet_col_wrap=3,
+        histfunc='avg',
+        color_continuous_scale='RdYlGn',
+        title=f'{metrica} por Window e Horário'
+    )
+    fig.for_each_annotation(lambda a: a.update(text=a.text.replace('Window=', 'Window ')))
+    return fig
+
+# ===============================
+# E SE: COMPARAÇÃO DE TABELAS DE PONTOS
+# ===============================
+def tabelas_de_pontos_padrao():
+    """Uma linha por tabela (nome, stop e pontos do gain por nº de alternâncias), começando pelas dos ativos"""
+    return pd.DataFrame([
+        {'Tabela': ativo, 'Stop': stop_do_ativo(ativo), **{str(n): pontos for n, pontos in tabela.items()}}
+        for ativo, tabela in valores_por_ativo.items()
+    ])
+
+def tabelas_do_editor(tabelas_editadas):
+    """({nome: tabela de pontos}, {nome: stop}) das linhas do editor; células vazias ficam de fora"""
+    tabelas, stops = {}, {}
+    for posicao, linha in enumerate(tabelas_editadas.to_dict('records'), start=1):
+        nome = linha.pop('Tabela') or f"Tabela {posicao}"
+        stop = linha.pop('Stop')
+        if pd.notna(stop):
+            stops[nome] = int(stop)
+        tabelas[nome] = {int(n): int(pontos) for n, pontos in linha.items() if pd.notna(pontos)}
+    return tabelas, stops
+
+def ler_contratos_por_nivel(texto):
+    """'1:1, 2:2, 3:4' -> {1: 1, 2: 2, 3: 4}; texto vazio -> None"""
+    if not texto or not texto.strip():
+        return None
+    
+    contratos_por_nivel = {}
+    for item in texto.split(","):
+        try:
+            nivel, quantidade = (int(parte) for parte in item.split(":"))
+        except ValueError:
+            raise ValueError(f"Contratos por nível inválidos em '{item.strip()}': use nível:contratos, separados por vírgula")
+        if nivel < 1 or quantidade < 0:
+            raise ValueError(f"Contratos por nível inválidos em '{item.strip()}': nível a partir de 1 e contratos não negativos")
+        contratos_por_nivel[nivel] = quantidade
+    return contratos_por_nivel
+
+# ===============================
+# GRÁFICOS DE SÉRIES LONGAS
+# ===============================
+def intervalo_do_grafico(df, x, chave, grupo=None):
+    """
+    Faixa do eixo x de um gráfico com mais de PONTOS_POR_LINHA pontos numa linha: a redução é
+    refeita só dentro dela, então uma faixa estreita volta à resolução completa. Séries curtas
+    são desenhadas inteiras, sem o controle.
+    """
+    maior_linha = df.groupby(grupo).size().max() if grupo else len(df)
+    if maior_linha <= PONTOS_POR_LINHA:
+        return None
+    
+    minimo, maximo = df[x].min(), df[x].max()
+    if isinstance(minimo, pd.Timestamp):
+        minimo, maximo = minimo.to_pydatetime(), maximo.to_pydatetime()
+    elif hasattr(minimo, 'item'):
+        minimo, maximo = minimo.item(), maximo.item()
+    return st.slider(
+        "🔍 Intervalo do gráfico (aproxime para ver todos os pontos)",
+        min_value=minimo, max_value=maximo, value=(minimo, maximo), key=chave
+    )
+
+def grafico_de_linha(df, x, y, chave, color=None, markers=False, colunas_reducao=(), **kwargs):
+    """
+    px.line para séries longas: cada linha é reduzida por LTTB a PONTOS_POR_LINHA pontos (também
+    pelas colunas_reducao, desenhadas depois com adicionar_linha), figuras grandes usam WebGL e os
+    marcadores ficam só nas figuras pequenas. Retorna a figura, as linhas usadas e se está em WebGL.
+    """
+    intervalo = intervalo_do_grafico(df, x, chave, color)
+    colunas_y = [y] if isinstance(y, str) else list(y)
+    reduzido = reduzir_serie(df, x, colunas_y + list(colunas_reducao), PONTOS_POR_LINHA, color, intervalo)
+    
+    webgl = len(reduzido) * (len(colunas_y) + len(colunas_reducao)) > PONTOS_WEBGL
+    fig = px.line(
+        reduzido, x=x, y=y, color=color, markers=markers and not webgl,
+        render_mode='webgl' if webgl else 'svg', **kwargs
+    )
+    return fig, reduzido, webgl
+
+def adicionar_linha(fig, x, y, webgl, **kwargs):
+    """add_scatter em modo linhas, em WebGL quando o resto da figura também está"""
+    fig.add_trace((go.Scattergl if webgl else go.Scatter)(x=x, y=y, mode='lines', **kwargs))
+
+# ===============================
+# TABELAS PAGINADAS
+# ===============================
+def tabela_paginada(df, chave, formatos=None, coluna_data=None, column_config=None, linhas_por_pagina=LINHAS_POR_PAGINA):
+    """
+    Mostra uma tabela grande uma página por vez. Filtro, ordenação e busca do dia rodam no servidor
+    sobre as posições das linhas; só a página exibida é copiada, formatada (Styler) e enviada
+    """
+    colunas = list(df.columns)
+    sem_coluna = "—"
+    
+    chave_pagina = f"{chave}_pagina"
+    
+    # Nova ordem ou novo filtro: volta para a primeira página
+    def voltar_ao_inicio():
+        st.session_state[chave_pagina] = 1
+    
+    col_ordem, col_sentido, col_filtro_coluna, col_filtro = st.columns([2, 1, 2, 2])
+    ordenar_por = col_ordem.selectbox("Ordenar por", [sem_coluna] + colunas, key=f"{chave}_ordem", on_change=voltar_ao_inicio)
+    crescente = col_sentido.checkbox("Crescente", value=True, key=f"{chave}_crescente", on_change=voltar_ao_inicio)
+    filtro_coluna = col_filtro_coluna.selectbox(
+        "Filtrar coluna", [sem_coluna] + colunas, key=f"{chave}_filtro_coluna", on_change=voltar_ao_inicio
+    )
+    filtro = col_filtro.text_input("Filtro (texto, número ou >= 500)", key=f"{chave}_filtro", on_change=voltar_ao_inicio)
+    
+    ordenar_por = None if ordenar_por == sem_coluna else ordenar_por
+    filtro_coluna = None if filtro_coluna == sem_coluna else filtro_coluna
+    try:
+        posicoes = posicoes_da_tabela(df, ordenar_por, crescente, filtro_coluna, filtro)
+    except ValueError as erro:
+        st.warning(str(erro))
+        posicoes = posicoes_da_tabela(df, ordenar_por, crescente)
+    
+    total_paginas = total_de_paginas(len(posicoes), linhas_por_pagina)
+    if coluna_data:
+        col_dia, col_ir, col_pagina = st.columns([2, 1, 2])
+        dia = col_dia.date_input("Ir para o dia", key=f"{chave}_dia", format="DD/MM/YYYY")
+        if col_ir.button("Ir", key=f"{chave}_ir"):
+            pagina_dia = pagina_do_dia(df, posicoes, coluna_data, dia, linhas_por_pagina)
+            if pagina_dia is None:
+                st.info(f"O dia {dia:%d/%m/%Y} não aparece na tabela.")
+            else:
+                # Ainda antes do campo de página nesta execução, então pode ser gravado na sessão
+                st.session_state[chave_pagina] = pagina_dia
+    else:
+        col_pagina = st
+    
+    # Página guardada além do fim (a tabela encolheu): vai para a última
+    if st.session_state.get(chave_pagina, 1) > total_paginas:
+        st.session_state[chave_pagina] = total_paginas
+    pagina = col_pagina.number_input("Página", min_value=1, step=1, key=chave_pagina)
+    
+    exibidas = linhas_da_pagina(df, posicoes, pagina, linhas_por_pagina)
+    st.dataframe(exibidas.style.format(formatos) if formatos else exibidas, column_config=column_config)
+    st.caption(f"Página {pagina} de {total_paginas} · {len(posicoes)} de {len(df)} linhas · {linhas_por_pagina} por página")
+
+# ===============================
+# SEÇÕES DA PÁGINA
+# ===============================
+def preservar_widgets_ocultos(secao_ativa):
+    """
+    O Streamlit descarta o estado dos widgets que não são desenhados numa execução: os valores
+    das outras seções são regravados na sessão para continuarem iguais quando a seção voltar
+    """
+    for secao, chaves in WIDGETS_POR_SECAO.items():
+        if secao == secao_ativa:
+            continue
+        chaves = chaves + [
+            f"{tabela}_{controle}" for tabela in TABELAS_POR_SECAO.get(secao, []) for controle in CONTROLES_TABELA
+        ]
+        for chave in chaves:
+            if chave in st.session_state:
+                st.session_state[chave] = st.session_state[chave]
+
+# ===============================
+# STREAMLIT APP
+# ===============================
+def main():
+    st.set_page_config(page_title="📊 Detector de Lateralizações", layout="wide")
+    configurar_log()
+    st.markdown(ESTILO_CSS, unsafe_allow_html=True)
+    
+    st.markdown("<h1>📊 Detector de Lateralizações (Ano a Ano, Ordem Invertida)</h1>", unsafe_allow_html=True)
+
+    uploaded_file = st.file_uploader("📂 Carregue seu arquivo Excel com os candles", type=["xlsx"])
+
+    if uploaded_file:
+        # Tempo de cada etapa desta execução (e pico de memória, se ligado no painel de diagnóstico)
+        diagnostico = novo_diagnostico(st.session_state.get("diagnostico_memoria", False))
+        
+        # Leitura com cache pelo hash do arquivo (colunas já limpas e derivadas de 'Data')
+        with etapa(diagnostico, "Carregar arquivo") as medida:
+            conteudo_arquivo = uploaded_file.getvalue()
+            chave_arquivo = hash_conteudo(conteudo_arquivo)
+            candles = carregar_candles(conteudo_arquivo, chave_arquivo, diagnostico)
+            medida['linhas'] = len(candles)
+        colunas_arquivo = [col for col in candles.columns if col not in COLUNAS_DERIVADAS]
+    
+        with st.expander("📋 Estrutura do Arquivo Lido"):
+            st.write("Colunas detectadas:", colunas_arquivo)
+            st.write("Dimensão (linhas, colunas):", (len(candles), len(colunas_arquivo)))
+    
+        if "Data" not in candles.columns:
+            st.error("⚠ Sua planilha precisa ter uma coluna chamada 'Data'.")
+        else:
+            ativo_escolhido = st.selectbox("💹 Selecione o Ativo:", list(valores_por_ativo.keys()))
+            tabela_pontos_ativa = valores_por_ativo[ativo_escolhido]
+        
+            anos_disponiveis = sorted(candles["Ano"].unique(), reverse=True)
+            ano_escolhido = st.selectbox("📅 Escolha o Ano para Analisar:", anos_disponiveis)
+        
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                window = st.number_input("🔢 Window (nº de alternâncias p/ Gain)", min_value=2, max_value=10, value=6)
+            with col2:
+                contratos = st.number_input("📑 Nº de Contratos", min_value=1, value=1)
+            with col3:
+                hora_inicio = st.time_input("⏰ Hora Inicial", value=pd.to_datetime("09:00").time())
+                hora_fim = st.time_input("⏰ Hora Final", value=pd.to_datetime("12:02").time())
+        
+            # Garantir que todas as colunas necessárias estejam presentes nos dados filtrados
+            colunas_necessarias = ["Data", "Barras", "DataApenas", "Hora", "Ano"]
+        
+            # Adicionar colunas de Máxima e Mínima se existirem
+            coluna_maxima, coluna_minima = encontrar_colunas_maxima_minima(candles)
+            if coluna_maxima and coluna_minima:
+                colunas_necessarias.extend([coluna_maxima, coluna_minima])
+                st.success(f"✅ Colunas detectadas: '{coluna_maxima}' e '{coluna_minima}'")
+        
+            # Ano e horário selecionados por busca binária no índice de sessões do arquivo (cache pelo hash)
+            with etapa(diagnostico, "Seleção de ano e horário") as medida:
+                indice = indice_sessoes(candles, chave_arquivo)
+                dados_filtrados = selecionar_sessoes(
+                    candles, indice, hora_inicio, hora_fim, ano_escolhido, colunas=colunas_necessarias
+                )
+                medida['linhas'] = len(dados_filtrados)
+        
+            # Só a seção escolhida é calculada e desenhada (st.tabs executaria todas a cada interação)
+            secao = st.radio("Seção:", SECOES, horizontal=True, key="secao_ativa", label_visibility="collapsed")
+            preservar_widgets_ocultos(secao)
+        
+            if secao in SECOES_COM_SIMULACAO:
+                # Eventos do ano (stops e gains detectados): com o mesmo window e horário vêm do cache
+                # (ou do checkpoint da ordem cronológica), então trocar de seção ou mexer em outros controles não detecta de novo
+                ordem_simulacao = st.session_state.get("ordem_simulacao", ORDENS_SIMULACAO[0])
+                with etapa(diagnostico, "Detecção das alternâncias", len(dados_filtrados)):
+                    if ordem_simulacao.startswith("Cronológica"):
+                        # Mesmo histórico + novas sessões: só as barras novas são processadas
+                        # (o checkpoint de outro arquivo só é retomado se as barras já processadas baterem).
+                        # Os eventos não têm preço, então trocar o ativo reaproveita o mesmo checkpoint
+                        eventos = detectar_cronologico(
+                            dados_filtrados.iloc[::-1].reset_index(drop=True),
+                            (ano_escolhido, window, hora_inicio, hora_fim),
+                            window=window,
+                            arquivo=chave_arquivo
+                        )
+                    else:
+                        eventos = eventos_anos(
+                            candles, chave_arquivo, [ano_escolhido], window, hora_inicio, hora_fim
+                        )[ano_escolhido]
+                
+                # Ativo, tabela de pontos e contratos só precificam os eventos
+                with etapa(diagnostico, "Precificação", len(eventos)):
+                    operacoes = precificar(eventos, tabela_pontos_ativa, contratos, ativo_escolhido=ativo_escolhido)
+            
+                # Estatísticas por nível numa única passada, usadas nas seções de estatísticas e probabilidades
+                with etapa(diagnostico, "Estatísticas por nível", len(operacoes)):
+                    resumo_niveis, tabela_stops = calcular_estatisticas_por_nivel(operacoes)
+        
+            if secao == SECOES[0]:
+                with etapa(diagnostico, "Seção Sequências", len(dados_filtrados)):
+                    st.subheader(f"🔎 Dados Filtrados - Ano {ano_escolhido} (≥{hora_inicio}, ≤{hora_fim}, invertidos)")
+                    # Mostrar todas as colunas disponíveis
+                    colunas_para_mostrar = ["Data", "Barras"]
+                    if coluna_maxima and coluna_minima:
+                        colunas_para_mostrar.extend([coluna_maxima, coluna_minima])
+                    # Data formatada pelo próprio componente, só nas linhas da página exibida
+                    with etapa(diagnostico, "Tabela de dados filtrados", len(dados_filtrados)):
+                        tabela_paginada(
+                            dados_filtrados[colunas_para_mostrar], "tabela_dados", coluna_data="Data",
+                            column_config={"Data": st.column_config.DatetimeColumn("Data_BR", format="DD/MM/YYYY HH:mm")}
+                        )
+                
+                    st.radio("Ordem da simulação:", ORDENS_SIMULACAO, horizontal=True, key="ordem_simulacao")
+                
+                    st.subheader("📈 Sequências de Stops (-200 ou -5) e Gains (escalonados) + Linhas Usadas")
+                
+                    # O livro de operações (nível, sequência, pontos) é a fonte de tudo; a tabela larga
+                    # só é montada para a página de sequências exibida
+                    sequencias = range(total_de_sequencias(eventos, len(dados_filtrados)))
+                    total_paginas = max(1, -(-len(sequencias) // SEQUENCIAS_POR_PAGINA))
+                    pagina_sequencias = st.number_input(
+                        f"Página de sequências (1 a {total_paginas}, {SEQUENCIAS_POR_PAGINA} por página)",
+                        min_value=1, max_value=total_paginas, value=1,
+                        key="pagina_sequencias"
+                    )
+                    inicio_pagina = (pagina_sequencias - 1) * SEQUENCIAS_POR_PAGINA
+                    with etapa(diagnostico, "Tabela Nível x Sequência", len(operacoes)):
+                        resultado, _ = montar_tabela_resultado(
+                            operacoes, sequencias[inicio_pagina:inicio_pagina + SEQUENCIAS_POR_PAGINA]
+                        )
+                    
+                        st.dataframe(resultado)
+        
+            if secao == SECOES[1]:
+                with etapa(diagnostico, "Seção Estatísticas", len(dados_filtrados)):
+                    st.subheader("📊 Estatísticas")
+                
+                    # NOVA SEÇÃO: PERIODICIDADE NAS ESTATÍSTICAS
+                    st.markdown("---")
+                    st.subheader("📅 Estatísticas por Período")
+                
+                    # Seleção de período
+                    periodo_estatistica = st.selectbox(
+                        "Selecione o período para análise:",
+                        ["Ano completo", "30 dias", "3 meses", "6 meses"],
+                        key="periodo_estatistica"
+                    )
+                
+                    # Calcular estatísticas para o período selecionado
+                    if periodo_estatistica != "Ano completo":
+                        # Período do ano selecionado direto no índice de sessões
+                        with etapa(diagnostico, f"Simulação do período ({periodo_estatistica})"):
+                            operacoes_periodo = calcular_estatisticas_por_periodo(
+                                candles, periodo_estatistica, hora_inicio, hora_fim, 
+                                window, contratos, tabela_pontos_ativa, ativo_escolhido,
+                                indice=indice, ano=ano_escolhido, chave=chave_arquivo
+                            )
+                    
+                        if not operacoes_periodo.empty:
+                            st.success(f"*Período analisado:* {periodo_estatistica} | *Ano:* {ano_escolhido}")
+                        
+                            # Mostrar somatório por linha para o período
+                            st.subheader(f"📊 Somatório por Linha - {periodo_estatistica}")
+                        
+                            # Extrair apenas a coluna de totais
+                            totais_periodo = totais_por_nivel(operacoes_periodo)
+                        
+                            # Formatar para melhor visualização
+                            st.dataframe(totais_periodo.style.format({
+                                'Total por Linha': '{:,.0f}'
+                            }))
+                        
+                            # Calcular estatísticas financeiras
+                            saldo_total_periodo = operacoes_periodo['Pontos'].sum()
+                            valor_ponto = 10.0 if "Dólar" in ativo_escolhido else 0.20
+                            financeiro_total_periodo = saldo_total_periodo * valor_ponto
+                        
+                            col1, col2 = st.columns(2)
+                            col1.metric(f"🎯 Saldo Total {periodo_estatistica} (pontos)", saldo_total_periodo)
+                            col2.metric(f"💰 Saldo Financeiro {periodo_estatistica} (R$)", f"{financeiro_total_periodo:,.2f}")
+                        
+                            # Gráfico de barras dos totais por linha
+                            st.subheader(f"📈 Distribuição por Linha - {periodo_estatistica}")
+                        
+                            # Preparar dados para o gráfico (excluir linha TOTAL)
+                            dados_grafico = totais_periodo[totais_periodo.index != "TOTAL"].copy()
+                            if not dados_grafico.empty:
+                                fig_totais = px.bar(
+                                    dados_grafico.reset_index(),
+                                    x='Nível',
+                                    y='Total por Linha',
+                                    title=f'Total por Linha - {periodo_estatistica}',
+                                    color='Total por Linha',
+                                    color_continuous_scale='RdYlGn'
+                                )
+                                st.plotly_chart(fig_totais, use_container_width=True)
+                        
+                            # Estatísticas adicionais
+                            st.subheader(f"📋 Estatísticas Detalhadas - {periodo_estatistica}")
+                        
+                            # Calcular médias de stops entre ganhos
+                            if not operacoes_periodo.empty:
+                                resumo_periodo, _ = calcular_estatisticas_por_nivel(operacoes_periodo)
+                                df_medias_periodo = resumo_periodo[['Média Stops entre Ganhos']].rename_axis('Linha')
+                            
+                                st.write("*Média de Stops entre Ganhos por Linha:*")
+                                st.dataframe(df_medias_periodo)
+                            
+                                # Calcular média geral
+                                linhas_com_ganhos_periodo = df_medias_periodo[df_medias_periodo['Média Stops entre Ganhos'] > 0]
+                                if not linhas_com_ganhos_periodo.empty:
+                                    media_geral_periodo = linhas_com_ganhos_periodo['Média Stops entre Ganhos'].mean()
+                                    st.write(f"*Média Geral de Stops entre Ganhos:* {media_geral_periodo:.2f}")
+                    
+                        else:
+                            st.warning(f"Não foram encontrados dados para o período {periodo_estatistica} no ano {ano_escolhido}")
+                
+                    else:
+                        # Usar dados do ano completo (comportamento original)
+                        saldo_total = operacoes['Pontos'].sum()
+                        valor_ponto = 10.0 if "Dólar" in ativo_escolhido else 0.20
+                        financeiro_total = saldo_total * valor_ponto
+                    
+                        col1, col2 = st.columns(2)
+                        col1.metric("🎯 Saldo Total (pontos)", saldo_total)
+                        col2.metric("💰 Saldo Financeiro (R$)", f"{financeiro_total:,.2f}")
+                    
+                        tabela_totais = totais_por_nivel(operacoes).to_html(escape=False, index=True)
+                        st.subheader("📊 Somatório por Linha")
+                        st.markdown(f"<div style='text-align:center'>{tabela_totais}</div>", unsafe_allow_html=True)
+                    
+                        ganhos_por_nivel = resumo_niveis['Ganhos']
+                        st.bar_chart(ganhos_por_nivel)
+                    
+                        # CORREÇÃO APLICADA AQUI - média de stops entre ganhos
+                        df_medias = resumo_niveis[['Média Stops entre Ganhos']].rename_axis('Linha')
+                    
+                        st.subheader("📉 Média de Stops entre Ganhos por Linha")
+                        st.dataframe(df_medias)
+                    
+                        # Calcular média geral apenas para linhas que tiveram ganhos
+                        linhas_com_ganhos = df_medias[df_medias['Média Stops entre Ganhos'] > 0]
+                        if not linhas_com_ganhos.empty:
+                            media_geral = linhas_com_ganhos['Média Stops entre Ganhos'].mean()
+                        else:
+                            media_geral = 0
+                        
+                        st.write(f"Média Geral de Stops entre Ganhos: {media_geral:.2f}")
+                        st.bar_chart(df_medias['Média Stops entre Ganhos'])
+                
+                    # --- E SE: os mesmos stops e gains do ano com outras tabelas de pontos ---
+                    st.markdown("---")
+                    st.subheader("🧮 E se? Comparar Tabelas de Pontos")
+                    with st.expander("Editar tabelas, stop e contratos por nível"):
+                        st.caption(
+                            f"As operações detectadas no ano {ano_escolhido} (window {window}) são só precificadas "
+                            "de novo com cada tabela: acrescente linhas para testar outras tabelas."
+                        )
+                        tabelas_editadas = st.data_editor(
+                            tabelas_de_pontos_padrao(), num_rows="dynamic", hide_index=True, key="tabelas_e_se"
+                        )
+                        texto_contratos = st.text_input(
+                            "Contratos por nível (ex.: 1:1, 2:2, 3:4; níveis fora da lista usam o nº de contratos)",
+                            key="contratos_por_nivel_e_se"
+                        )
+                    
+                    try:
+                        contratos_por_nivel = ler_contratos_por_nivel(texto_contratos)
+                    except ValueError as erro:
+                        st.warning(str(erro))
+                        contratos_por_nivel = None
+                    tabelas, stops = tabelas_do_editor(tabelas_editadas)
+                    
+                    with etapa(diagnostico, "Comparação de tabelas de pontos", len(eventos)):
+                        comparacao_tabelas = comparar_tabelas_pontos(
+                            eventos, tabelas, contratos, stops, ativo_escolhido, contratos_por_nivel
+                        )
+                    st.dataframe(comparacao_tabelas.style.format({'Saldo por Operação': '{:.2f}'}), hide_index=True)
+                
+                    # --- GRÁFICO: Evolução dos Stops ---
+                    st.markdown("---")
+                    st.subheader("📈 Evolução dos Stops entre Ganhos")
+                
+                    modo_visualizacao = st.radio(
+                        "Escolha o modo de visualização:",
+                        ["Ano + Nível específico", "Comparar anos"],
+                        key="modo_visualizacao_estat"
+                    )
+                
+                    limite_stops = st.number_input(
+                        "Defina o limite de Stops entre Ganhos (linha amarela)",
+                        min_value=1, value=20,
+                        key="limite_stops_estat"
+                    )
+                
+                    if modo_visualizacao == "Comparar anos":
+                        anos_escolhidos = st.multiselect(
+                            "Selecione os anos para comparar:",
+                            anos_disponiveis, default=anos_disponiveis,
+                            key="anos_comparacao_estat"
+                        )
+                    
+                        niveis_disponiveis_geral = list(resumo_niveis.index)
+                        if not niveis_disponiveis_geral:
+                            st.info("Não há níveis disponíveis para comparação.")
+                        else:
+                            nivel_ref = st.selectbox(
+                                "Selecione o nível para referência na comparação entre anos:",
+                                niveis_disponiveis_geral,
+                                key="nivel_ref_estat"
+                            )
+                        
+                            # Anos já simulados com estes parâmetros vêm do cache; os demais rodam em paralelo
+                            with etapa(diagnostico, f"Simulação dos anos comparados ({len(anos_escolhidos)})"):
+                                operacoes_por_ano = simular_anos(
+                                    candles, chave_arquivo, anos_escolhidos,
+                                    window, hora_inicio, hora_fim, contratos,
+                                    tabela_pontos=tabela_pontos_ativa,
+                                    ativo_escolhido=ativo_escolhido
+                                )
+                        
+                            dfs = []
+                            for ano, operacoes_ano in operacoes_por_ano.items():
+                                _, stops_ano = calcular_estatisticas_por_nivel(operacoes_ano)
+                                sequencia_stops = stops_do_nivel(stops_ano, nivel_ref)
+                                if len(sequencia_stops) > 0:
+                                    df_temp = pd.DataFrame({
+                                        "Ordem": list(range(1, len(sequencia_stops)+1)),
+                                        "Stops entre Ganhos": sequencia_stops,
+                                        "Ano": ano
+                                    })
+                                    dfs.append(df_temp)
+                        
+                            if len(dfs) == 0:
+                                st.info("Não há dados suficientes para exibir a comparação.")
+                            else:
+                                df_hist = pd.concat(dfs, ignore_index=True)
+                            
+                                # --- CALCULO DA MÉDIA EVOLUTIVA ---
+                                dfs_me = []
+                                for ano in anos_escolhidos:
+                                    df_ano = df_hist[df_hist['Ano'] == ano].copy()
+                                    df_ano['Média Evolutiva'] = df_ano['Stops entre Ganhos'].expanding().mean()
+                                    dfs_me.append(df_ano)
+                            
+                                df_hist_me = pd.concat(dfs_me, ignore_index=True)
+                            
+                                # --- PLOTAGEM --- (linhas longas reduzidas por LTTB, com a média junto)
+                                fig, df_hist_me, webgl = grafico_de_linha(
+                                    df_hist_me,
+                                    x="Ordem",
+                                    y="Stops entre Ganhos",
+                                    chave="zoom_stops_anos",
+                                    color="Ano",
+                                    markers=True,
+                                    colunas_reducao=["Média Evolutiva"],
+                                    title=f'Histórico de Stops entre Ganhos - Nível {nivel_ref}'
+                                )
+                            
+                                fig.add_hline(
+                                    y=limite_stops,
+                                    line_dash="dash",
+                                    line_color="yellow",
+                                    annotation_text=f"Limite = {limite_stops}",
+                                    annotation_position="top left"
+                                )
+                            
+                                # --- LINHA MÉDIA EVOLUTIVA ---
+                                for ano in anos_escolhidos:
+                                    df_ano_me = df_hist_me[df_hist_me['Ano'] == ano]
+                                    adicionar_linha(
+                                        fig,
+                                        df_ano_me['Ordem'],
+                                        df_ano_me['Média Evolutiva'],
+                                        webgl,
+                                        line=dict(color='magenta', dash='dash'),
+                                        name=f'Média Evolutiva {ano}'
+                                    )
+                            
+                                st.plotly_chart(fig, use_container_width=True)
+                
+                    else:
+                        niveis_disponiveis = list(resumo_niveis.index)
+                        nivel_selecionado = st.selectbox(
+                            "Selecione o nível para ver a evolução:", 
+                            niveis_disponiveis,
+                            key="nivel_selecionado_estat"
+                        )
+                    
+                        sequencia_stops = stops_do_nivel(tabela_stops, nivel_selecionado)
+                    
+                        if len(sequencia_stops) == 0:
+                            st.info("Não há dados suficientes para exibir.")
+                        else:
+                            df_graf = pd.DataFrame({
+                                'Ordem': list(range(1, len(sequencia_stops)+1)),
+                                'Stops entre Ganhos': sequencia_stops
+                            })
+                        
+                            df_graf['Média Evolutiva'] = df_graf['Stops entre Ganhos'].expanding().mean()
+                        
+                            fig, df_graf, webgl = grafico_de_linha(
+                                df_graf,
+                                x='Ordem',
+                                y='Stops entre Ganhos',
+                                chave="zoom_stops_nivel",
+                                markers=True,
+                                colunas_reducao=['Média Evolutiva'],
+                                title=f'Stops entre Ganhos no Nível {nivel_selecionado}'
+                            )
+                        
+                            fig.add_hline(
+                                y=limite_stops,
+                                line_dash="dash",
+                                line_color="yellow",
+                                annotation_text=f"Limite = {limite_stops}",
+                                annotation_position="top left"
+                            )
+                        
+                            adicionar_linha(
+                                fig,
+                                df_graf['Ordem'],
+                                df_graf['Média Evolutiva'],
+                                webgl,
+                                line=dict(color='magenta', dash='dash'),
+                                name='Média Evolutiva'
+                            )
+                        
+                            st.plotly_chart(fig, use_container_width=True)
+                        
+                            # --- RISCO: Monte Carlo sobre os ciclos (stops até um ganho) do nível ---
+                            st.subheader(f"🎲 Risco do Nível {nivel_selecionado} (Monte Carlo)")
+                            col1, col2 = st.columns(2)
+                            caminhos_risco = col1.number_input(
+                                "Caminhos simulados",
+                                min_value=1_000, max_value=5_000_000, value=CAMINHOS_PADRAO, step=10_000,
+                                key="caminhos_risco"
+                            )
+                            capital_risco = col2.number_input(
+                                "Capital para o risco de ruína (em stops do nível)",
+                                min_value=1, value=50,
+                                key="capital_risco"
+                            )
+                        
+                            stops_antes, ganhos_nivel, perda_por_stop = ciclos_do_nivel(operacoes, nivel_selecionado)
+                            if not len(stops_antes):
+                                st.info("O nível não tem ganhos: não há ciclos para sortear.")
+                            else:
+                                with etapa(diagnostico, "Monte Carlo de risco", caminhos_risco):
+                                    caminhos = simular_caminhos(stops_antes, ganhos_nivel, perda_por_stop, caminhos=caminhos_risco)
+                                    resumo_risco, percentis_risco = resumir_caminhos(
+                                        caminhos, capital_risco * perda_por_stop, limite_stops
+                                    )
+                            
+                                st.caption(
+                                    f"Cada caminho sorteia {len(stops_antes)} ciclos (os ganhos do nível no ano) entre os "
+                                    f"observados, com {perda_por_stop:.0f} pontos perdidos por stop. Ruína = perder "
+                                    f"{capital_risco} stops ({capital_risco * perda_por_stop:,.0f} pontos) desde o início."
+                                )
+                                col1, col2, col3 = st.columns(3)
+                                col1.metric("☠️ Risco de Ruína", f"{resumo_risco.get('Risco de Ruína (%)', 0.0):.2f}%")
+                                col2.metric(
+                                    f"🚧 Passar de {limite_stops} Stops Seguidos",
+                                    f"{resumo_risco['Probabilidade de Exceder o Limite (%)']:.2f}%"
+                                )
+                                col3.metric("📉 Drawdown Máximo Médio (pontos)", f"{resumo_risco['Drawdown Máximo Médio']:,.0f}")
+                            
+                                st.dataframe(
+                                    percentis_risco.style.format({
+                                        'Drawdown Máximo': '{:,.0f}', 'Maior Sequência de Stops': '{:.0f}', 'Saldo Final': '{:,.0f}'
+                                    }),
+                                    hide_index=True
+                                )
+        
+            if secao == SECOES[2]:
+                with etapa(diagnostico, "Seção Probabilidades", len(dados_filtrados)):
+                    st.subheader("🎯 Probabilidade de Ganho por Nível")
+                
+                    # Probabilidade, contagens e sequências de stops por nível, do mesmo resumo da aba de estatísticas
+                    df_probabilidades = resumo_niveis[[
+                        'Probabilidade de Ganho (%)', 'Operações', 'Ganhos', 'Stops',
+                        'Média Stops entre Ganhos', 'Máximo Stops entre Ganhos'
+                    ]].rename(
+                        columns={'Operações': 'Total Ocorrências'}
+                    )
+                
+                    # Ordenar por nível
+                    df_probabilidades = df_probabilidades.sort_index()
+                
+                    st.dataframe(df_probabilidades.style.format({
+                        'Probabilidade de Ganho (%)': '{:.2f}%',
+                        'Total Ocorrências': '{:.0f}',
+                        'Ganhos': '{:.0f}',
+                        'Stops': '{:.0f}',
+                        'Média Stops entre Ganhos': '{:.2f}',
+                        'Máximo Stops entre Ganhos': '{:.0f}'
+                    }))
+                
+                    # Gráfico de probabilidades
+                    fig_prob = px.bar(
+                        df_probabilidades.reset_index(),
+                        x='Nível',
+                        y='Probabilidade de Ganho (%)',
+                        title='Probabilidade de Ganho por Nível',
+                        color='Probabilidade de Ganho (%)',
+                        color_continuous_scale='RdYlGn'
+                    )
+                    fig_prob.update_layout(
+                        xaxis_title="Nível",
+                        yaxis_title="Probabilidade de Ganho (%)",
+                        yaxis=dict(range=[0, 100])
+                    )
+                    st.plotly_chart(fig_prob, use_container_width=True)
+                
+                    # Estatísticas resumidas
+                    st.subheader("📈 Estatísticas Resumidas das Probabilidades")
+                    prob_media = df_probabilidades['Probabilidade de Ganho (%)'].mean()
+                    prob_max = df_probabilidades['Probabilidade de Ganho (%)'].max()
+                    prob_min = df_probabilidades['Probabilidade de Ganho (%)'].min()
+                    nivel_maior_prob = df_probabilidades['Probabilidade de Ganho (%)'].idxmax()
+                    nivel_menor_prob = df_probabilidades['Probabilidade de Ganho (%)'].idxmin()
+                
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("📊 Probabilidade Média", f"{prob_media:.2f}%")
+                    col2.metric("⬆ Maior Probabilidade", f"{prob_max:.2f}%", f"Nível {nivel_maior_prob}")
+                    col3.metric("⬇ Menor Probabilidade", f"{prob_min:.2f}%", f"Nível {nivel_menor_prob}")
+                
+                    # --- NOVA SEÇÃO: DIAS UTILIZADOS NO CÁLCULO DA MÉDIA DE RANGE ---
+                    st.markdown("---")
+                    st.subheader("📅 Dias Utilizados no Cálculo da Média de Range")
+                
+                    # Verificar se as colunas Máxima e Mínima existem
+                    coluna_maxima, coluna_minima = encontrar_colunas_maxima_minima(candles)
+                
+                    if coluna_maxima and coluna_minima:
+                        # Resumo diário do arquivo (cache pelo hash): períodos, gráfico e detalhe são consultas nele
+                        with etapa(diagnostico, "Resumo diário do range", len(candles)):
+                            resumo_dias = resumo_diario(candles, chave_arquivo)
+                    
+                        # Calcular médias para diferentes períodos
+                        media_30_dias = calcular_media_range_por_periodo(candles, 30, ano_escolhido, resumo_dias)
+                        media_3_meses = calcular_media_range_por_periodo(candles, 90, ano_escolhido, resumo_dias)
+                        media_6_meses = calcular_media_range_por_periodo(candles, 180, ano_escolhido, resumo_dias)
+                    
+                        # Obter os dias específicos usados em cada período
+                        dias_30 = obter_dias_por_periodo(candles, 30, ano_escolhido, resumo_dias)
+                        dias_90 = obter_dias_por_periodo(candles, 90, ano_escolhido, resumo_dias)
+                        dias_180 = obter_dias_por_periodo(candles, 180, ano_escolhido, resumo_dias)
+                    
+                        # Criar tabela de resumo
+                        st.subheader("📊 Resumo dos Períodos")
+                        df_resumo_range = pd.DataFrame({
+                            'Período': ['30 Dias', '3 Meses', '6 Meses'],
+                            'Dias Solicitados': [30, 90, 180],
+                            'Dias Encontrados': [len(dias_30), len(dias_90), len(dias_180)],
+                            'Média do Range': [media_30_dias, media_3_meses, media_6_meses],
+                            'Data Inicial': [
+                                dias_30.index.min().strftime('%d/%m/%Y') if not dias_30.empty else 'N/A',
+                                dias_90.index.min().strftime('%d/%m/%Y') if not dias_90.empty else 'N/A', 
+                                dias_180.index.min().strftime('%d/%m/%Y') if not dias_180.empty else 'N/A'
+                            ],
+                            'Data Final': [
+                                dias_30.index.max().strftime('%d/%m/%Y') if not dias_30.empty else 'N/A',
+                                dias_90.index.max().strftime('%d/%m/%Y') if not dias_90.empty else 'N/A',
+                                dias_180.index.max().strftime('%d/%m/%Y') if not dias_180.empty else 'N/A'
+                            ]
+                        })
+                    
+                        st.dataframe(df_resumo_range.style.format({
+                            'Média do Range': '{:.2f}'
+                        }))
+                    
+                        # Mostrar dias específicos para cada período
+                        st.subheader("📋 Dias Específicos por Período")
+                    
+                        # 30 DIAS
+                        with st.expander(f"📅 30 Dias ({len(dias_30)} dias encontrados) - Média: {media_30_dias:.2f}"):
+                            if not dias_30.empty:
+                                dias_30_display = dias_30.reset_index()
+                                dias_30_display.columns = ['Data', 'Maior Máxima', 'Menor Mínima', 'Range Diário']
+                                dias_30_display = dias_30_display.sort_values('Data', ascending=False)
+                                tabela_paginada(dias_30_display, "tabela_dias_30", FORMATOS_RANGE, coluna_data="Data")
+                            else:
+                                st.info("Nenhum dia encontrado para o período de 30 dias")
+                    
+                        # 3 MESES  
+                        with st.expander(f"📅 3 Meses ({len(dias_90)} dias encontrados) - Média: {media_3_meses:.2f}"):
+                            if not dias_90.empty:
+                                dias_90_display = dias_90.reset_index()
+                                dias_90_display.columns = ['Data', 'Maior Máxima', 'Menor Mínima', 'Range Diário']
+                                dias_90_display = dias_90_display.sort_values('Data', ascending=False)
+                                tabela_paginada(dias_90_display, "tabela_dias_90", FORMATOS_RANGE, coluna_data="Data")
+                            else:
+                                st.info("Nenhum dia encontrado para o período de 3 meses")
+                    
+                        # 6 MESES
+                        with st.expander(f"📅 6 Meses ({len(dias_180)} dias encontrados) - Média: {media_6_meses:.2f}"):
+                            if not dias_180.empty:
+                                dias_180_display = dias_180.reset_index()
+                                dias_180_display.columns = ['Data', 'Maior Máxima', 'Menor Mínima', 'Range Diário']
+                                dias_180_display = dias_180_display.sort_values('Data', ascending=False)
+                                tabela_paginada(dias_180_display, "tabela_dias_180", FORMATOS_RANGE, coluna_data="Data")
+                            else:
+                                st.info("Nenhum dia encontrado para o período de 6 meses")
+                    
+                        # Gráfico de linha do range ao longo do ano
+                        st.markdown("---")
+                        st.subheader(f"📅 Range Diário - Ano {ano_escolhido}")
+                    
+                        range_diario = calcular_range_diario(candles, ano_escolhido, resumo_dias)
+                        if range_diario is not None and not range_diario.empty:
+                            # Criar DataFrame com todos os ranges do ano
+                            df_range_completo = range_diario.reset_index()
+                            df_range_completo.columns = ['Data', 'Maior Máxima', 'Menor Mínima', 'Range Diário']
+                        
+                            # Ordenar por data
+                            df_range_completo = df_range_completo.sort_values('Data', ascending=False)
+                        
+                            st.write(f"Total de dias no ano {ano_escolhido}: {len(df_range_completo)}")
+                        
+                            # Tabela com todos os ranges, formatada só na página exibida
+                            with etapa(diagnostico, "Tabela de range do ano (Styler)", len(df_range_completo)):
+                                tabela_paginada(df_range_completo, "tabela_range_ano", FORMATOS_RANGE, coluna_data="Data")
+                        
+                            # Estatísticas do range do ano
+                            st.subheader("📊 Estatísticas do Range do Ano")
+                            range_medio_ano = df_range_completo['Range Diário'].mean()
+                            range_max_ano = df_range_completo['Range Diário'].max()
+                            range_min_ano = df_range_completo['Range Diário'].min()
+                            dia_maior_range = df_range_completo.loc[df_range_completo['Range Diário'].idxmax(), 'Data']
+                            dia_menor_range = df_range_completo.loc[df_range_completo['Range Diário'].idxmin(), 'Data']
+                        
+                            col1, col2, col3, col4 = st.columns(4)
+                            col1.metric("📊 Range Médio", f"{range_medio_ano:.0f}")
+                            col2.metric("⬆ Maior Range", f"{range_max_ano:.0f}", f"Dia {dia_maior_range}")
+                            col3.metric("⬇ Menor Range", f"{range_min_ano:.0f}", f"Dia {dia_menor_range}")
+                            col4.metric("📅 Dias Analisados", f"{len(df_range_completo)}")
+                        
+                            # Gráfico de linha do range ao longo do ano
+                            with etapa(diagnostico, "Gráfico do range do ano (Plotly)", len(df_range_completo)):
+                                fig_range_ano, _, _ = grafico_de_linha(
+                                    df_range_completo.sort_values('Data'),
+                                    x='Data',
+                                    y='Range Diário',
+                                    chave="zoom_range_ano",
+                                    title=f'Evolução do Range Diário - Ano {ano_escolhido}',
+                                    markers=True
+                                )
+                                fig_range_ano.update_layout(
+                                    xaxis_title="Data",
+                                    yaxis_title="Range Diário"
+                                )
+                                st.plotly_chart(fig_range_ano, use_container_width=True)
+                        
+                            # Mostrar exemplo detalhado para um dia específico
+                            with st.expander("🔍 Ver exemplo detalhado de cálculo"):
+                                if not df_range_completo.empty:
+                                    dia_exemplo = df_range_completo['Data'].iloc[0]
+                                    dados_dia = linhas_do_dia(candles, resumo_dias, dia_exemplo)
+                                
+                                    maxima_dia = dados_dia[coluna_maxima].max()
+                                    minima_dia = dados_dia[coluna_minima].min()
+                                    range_calculado = maxima_dia - minima_dia
+                                
+                                    st.write(f"Dia: {dia_exemplo}")
+                                    st.write(f"Maior {coluna_maxima} do dia: {maxima_dia}")
+                                    st.write(f"Menor {coluna_minima} do dia: {minima_dia}")
+                                    st.write(f"Range calculado: {maxima_dia} - {minima_dia} = {range_calculado}")
+                                
+                                    st.write("Dados do dia (primeiras 10 linhas):")
+                                    st.dataframe(dados_dia[['Data', coluna_maxima, coluna_minima]].head(10))
+                        else:
+                            st.info(f"Não há dados de range disponíveis para o ano {ano_escolhido}")
+                    
+                    else:
+                        st.warning("⚠ Colunas 'Máxima' e 'Mínima' não foram encontradas no arquivo.")
+                        st.info("📝 Colunas disponíveis no seu arquivo:")
+                        st.write(list(candles.columns))
+        
+            if secao == SECOES[3]:
+                with etapa(diagnostico, "Seção Estatística de Barras", len(dados_filtrados)):
+                    st.subheader("📊 Estatística de Sequências de Barras")
+                
+                    # NOVO: Seleção de período para análise de barras
+                    st.markdown("---")
+                    st.subheader("📅 Configuração do Período de Análise")
+                
+                    col_periodo1, col_periodo2 = st.columns(2)
+                
+                    with col_periodo1:
+                        periodo_analise = st.selectbox(
+                            "Selecione o período para análise:",
+                            ["Ano completo", "30 dias", "3 meses", "6 meses"],
+                            help="Escolha o período temporal para análise das sequências de barras",
+                            key="periodo_analise_barras"
+                        )
+                
+                    with col_periodo2:
+                        st.write("ℹ Informações do Período:")
+                        if periodo_analise == "30 dias":
+                            st.write("📊 Análise dos últimos 30 dias")
+                        elif periodo_analise == "3 meses":
+                            st.write("📊 Análise dos últimos 3 meses")
+                        elif periodo_analise == "6 meses":
+                            st.write("📊 Análise dos últimos 6 meses")
+                        else:
+                            st.write("📊 Análise do ano completo")
+                
+                    # Filtrar dados por período selecionado
+                    dados_barras_periodo = dados_filtrados.copy()
+                
+                    if periodo_analise != "Ano completo":
+                        dados_barras_periodo = filtrar_por_periodo(dados_barras_periodo, periodo_analise)
+                
+                    # Mostrar informações sobre o período filtrado
+                    if not dados_barras_periodo.empty:
+                        data_inicio = dados_barras_periodo['Data'].min().strftime('%d/%m/%Y')
+                        data_fim = dados_barras_periodo['Data'].max().strftime('%d/%m/%Y')
+                        total_barras_periodo = len(dados_barras_periodo)
+                    
+                        st.success(f"*Período analisado:* {data_inicio} a {data_fim} | *Total de barras:* {total_barras_periodo}")
+                    else:
+                        st.warning("Não há dados disponíveis para o período selecionado.")
+                        dados_barras_periodo = dados_filtrados  # Fallback para dados completos
+                
+                    st.markdown("---")
+                
+                    # Frequência básica das barras (agora usando o período filtrado)
+                    freq_barras = calcular_frequencia_barras(dados_barras_periodo)
+                
+                    col1, col2, col3, col4 = st.columns(4)
+                    col1.metric("📊 Total de Barras", freq_barras['Total Barras'])
+                    col2.metric("🟢 Barras Compradoras", f"{freq_barras['Compradoras']} ({freq_barras['% Compradoras']}%)")
+                    col3.metric("🔴 Barras Vendedoras", f"{freq_barras['Vendedoras']} ({freq_barras['% Vendedoras']}%)")
+                    col4.metric("⚖ Viés Geral", 
+                                "Comprador" if freq_barras['% Compradoras'] > 55 else "Vendedor" if freq_barras['% Vendedoras'] > 55 else "Neutro")
+                
+                    st.markdown("---")
+                
+                    # Análise de sequências (agora usando o período filtrado)
+                    st.subheader("🔍 Análise de Probabilidades por Sequência")
+                
+                    max_sequencia = st.slider("Tamanho máximo da sequência analisada:", 2, 16, 3, key="max_sequencia_barras")
+                
+                    # Analisar sequências por categoria
+                    with etapa(diagnostico, "Análise de sequências de barras", len(dados_barras_periodo)):
+                        df_laterais, df_compradoras, df_vendedoras = analisar_sequencias_barras_por_categoria(dados_barras_periodo, max_sequencia)
+                
+                    # Criar abas para cada categoria - AGORA COM 4 ABAS (INCLUINDO EVOLUÇÃO TEMPORAL)
+                    tab_laterais, tab_compradoras, tab_vendedoras, tab_evolucao = st.tabs([
+                        "🔄 Sequências Laterais", 
+                        "🟢 Sequências Compradoras", 
+                        "🔴 Sequências Vendedoras",
+                        "📈 Evolução Temporal"
+                    ])
+                
+                    with tab_laterais:
+                        st.subheader("🔄 Sequências Laterais (Mistas - 0 e 1)")
+                        if not df_laterais.empty:
+                            colunas_mostrar = ['Sequência Anterior', 'Tamanho Sequência', 'Ocorrências', 
+                                              'Prob. Compradora (%)', 'Prob. Vendedora (%)', 'Viés']
+                        
+                            st.dataframe(df_laterais[colunas_mostrar].style.format({
+                                'Prob. Compradora (%)': '{:.2f}%',
+                                'Prob. Vendedora (%)': '{:.2f}%'
+                            }))
+                        
+                            # Gráfico para sequências laterais
+                            if len(df_laterais) > 0:
+                                df_grafico_laterais = df_laterais.copy()
+                                df_grafico_laterais['Sequência'] = df_grafico_laterais['Sequência Anterior'] + ' → ?'
+                            
+                                fig_laterais = px.bar(
+                                    df_grafico_laterais.head(10),  # Mostrar apenas as top 10
+                                    x='Sequência',
+                                    y=['Prob. Compradora (%)', 'Prob. Vendedora (%)'],
+                                    title=f'Top 10 Sequências Laterais - {periodo_analise}',
+                                    barmode='group',
+                                    color_discrete_map={'Prob. Compradora (%)': 'green', 'Prob. Vendedora (%)': 'red'}
+                                )
+                                fig_laterais.update_layout(
+                                    xaxis_title="Sequência Anterior",
+                                    yaxis_title="Probabilidade (%)",
+                                    yaxis=dict(range=[0, 100])
+                                )
+                                st.plotly_chart(fig_laterais, use_container_width=True)
+                        else:
+                            st.info("Nenhuma sequência lateral encontrada.")
+                
+                    with tab_compradoras:
+                        st.subheader("🟢 Sequências Compradoras (Apenas 1s)")
+                        if not df_compradoras.empty:
+                            colunas_mostrar = ['Sequência Anterior', 'Tamanho Sequência', 'Ocorrências', 
+                                              'Prob. Compradora (%)', 'Prob. Vendedora (%)', 'Viés']
+                        
+                            st.dataframe(df_compradoras[colunas_mostrar].style.format({
+                                'Prob. Compradora (%)': '{:.2f}%',
+                                'Prob. Vendedora (%)': '{:.2f}%'
+                            }))
+                        
+                            # Gráfico para sequências compradoras
+                            if len(df_compradoras) > 0:
+                                df_grafico_compradoras = df_compradoras.copy()
+                                df_grafico_compradoras['Sequência'] = df_grafico_compradoras['Sequência Anterior'] + ' → ?'
+                            
+                                fig_compradoras = px.bar(
+                                    df_grafico_compradoras.head(10),  # Mostrar apenas as top 10
+                                    x='Sequência',
+                                    y=['Prob. Compradora (%)', 'Prob. Vendedora (%)'],
+                                    title=f'Top 10 Sequências Compradoras - {periodo_analise}',
+                                    barmode='group',
+                                    color_discrete_map={'Prob. Compradora (%)': 'green', 'Prob. Vendedora (%)': 'red'}
+                                )
+                                fig_compradoras.update_layout(
+                                    xaxis_title="Sequência Anterior",
+                                    yaxis_title="Probabilidade (%)",
+                                    yaxis=dict(range=[0, 100])
+                                )
+                                st.plotly_chart(fig_compradoras, use_container_width=True)
+                        else:
+                            st.info("Nenhuma sequência compradora encontrada.")
+                
+                    with tab_vendedoras:
+                        st.subheader("🔴 Sequências Vendedoras (Apenas 0s)")
+                        if not df_vendedoras.empty:
+                            colunas_mostrar = ['Sequência Anterior', 'Tamanho Sequência', 'Ocorrências', 
+                                              'Prob. Compradora (%)', 'Prob. Vendedora (%)', 'Viés']
+                        
+                            st.dataframe(df_vendedoras[colunas_mostrar].style.format({
+                                'Prob. Compradora (%)': '{:.2f}%',
+                                'Prob. Vendedora (%)': '{:.2f}%'
+                            }))
+                        
+                            # Gráfico para sequências vendedoras
+                            if len(df_vendedoras) > 0:
+                                df_grafico_vendedoras = df_vendedoras.copy()
+                                df_grafico_vendedoras['Sequência'] = df_grafico_vendedoras['Sequência Anterior'] + ' → ?'
+                            
+                                fig_vendedoras = px.bar(
+                                    df_grafico_vendedoras.head(10),  # Mostrar apenas as top 10
+                                    x='Sequência',
+                                    y=['Prob. Compradora (%)', 'Prob. Vendedora (%)'],
+                                    title=f'Top 10 Sequências Vendedoras - {periodo_analise}',
+                                    barmode='group',
+                                    color_discrete_map={'Prob. Compradora (%)': 'green', 'Prob. Vendedora (%)': 'red'}
+                                )
+                                fig_vendedoras.update_layout(
+                                    xaxis_title="Sequência Anterior",
+                                    yaxis_title="Probabilidade (%)",
+                                    yaxis=dict(range=[0, 100])
+                                )
+                                st.plotly_chart(fig_vendedoras, use_container_width=True)
+                        else:
+                            st.info("Nenhuma sequência vendedora encontrada.")
+                
+                    # NOVA ABA: EVOLUÇÃO TEMPORAL
+                    with tab_evolucao:
+                        st.subheader("📈 Evolução Temporal das Probabilidades")
+                    
+                        # Seleção da sequência para análise
+                        st.markdown("### 🔍 Seleção da Sequência para Análise")
+                    
+                        # Combinar todas as sequências encontradas
+                        todas_sequencias = []
+                        if not df_laterais.empty:
+                            todas_sequencias.extend(df_laterais['Sequência Anterior'].tolist())
+                        if not df_compradoras.empty:
+                            todas_sequencias.extend(df_compradoras['Sequência Anterior'].tolist())
+                        if not df_vendedoras.empty:
+                            todas_sequencias.extend(df_vendedoras['Sequência Anterior'].tolist())
+                    
+                        if todas_sequencias:
+                            # Remover duplicatas e ordenar
+                            todas_sequencias = sorted(list(set(todas_sequencias)), key=lambda x: (len(x), x))
+                        
+                            col_seq1, col_seq2, col_seq3 = st.columns(3)
+                        
+                            with col_seq1:
+                                sequencia_selecionada = st.selectbox(
+                                    "Selecione a sequência:",
+                                    todas_sequencias,
+                                    help="Escolha a sequência para analisar a evolução temporal",
+                                    key="sequencia_evolucao"
+                                )
+                        
+                            with col_seq2:
+                                tipo_probabilidade = st.selectbox(
+                                    "Tipo de probabilidade:",
+                                    ['Compradora', 'Vendedora'],
+                                    help="Probabilidade da próxima barra ser compradora ou vendedora",
+                                    key="tipo_prob_evolucao"
+                                )
+                        
+                            with col_seq3:
+                                janela_media = st.number_input(
+                                    "Janela da média móvel (dias):",
+                                    min_value=1,
+                                    max_value=90,
+                                    value=7,
+                                    help="Número de dias para a média móvel",
+                                    key="janela_media_evolucao"
+                                )
+                        
+                            # Calcular evolução temporal
+                            if sequencia_selecionada:
+                                # Contagens padrão x dia só do tamanho da sequência, calculadas uma vez;
+                                # trocar sequência/tipo/janela só fatia a tabela
+                                with etapa(diagnostico, "Tabela padrão x dia", len(dados_barras_periodo)):
+                                    tabela_evolucao = tabela_padroes_por_dia(
+                                        dados_barras_periodo,
+                                        len(sequencia_selecionada),
+                                        chave=(chave_arquivo, ano_escolhido, hora_inicio, hora_fim, periodo_analise)
+                                    )
+                                
+                                df_evolucao = evolucao_do_padrao(
+                                    tabela_evolucao, 
+                                    sequencia_selecionada, 
+                                    tipo_probabilidade,
+                                    janela_media
+                                )
+                            
+                                if not df_evolucao.empty:
+                                    # Estatísticas da sequência
+                                    total_ocorrencias = df_evolucao['Ocorrencias_Acumuladas'].iloc[-1]
+                                    sucessos = df_evolucao['Sucessos_Acumulados'].iloc[-1]
+                                    probabilidade_atual = df_evolucao['Probabilidade_Acumulada'].iloc[-1]
+                                
+                                    col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
+                                    col_stat1.metric("📊 Total Ocorrências", total_ocorrencias)
+                                    col_stat2.metric("✅ Sucessos", sucessos)
+                                    col_stat3.metric("❌ Fracassos", total_ocorrencias - sucessos)
+                                    col_stat4.metric("🎯 Probabilidade Atual", f"{probabilidade_atual:.1f}%")
+                                
+                                    # Explicação do cálculo
+                                    with st.expander("ℹ️ Como a média móvel é calculada?"):
+                                        st.markdown(f"""
+                                        **Método de Cálculo:**
+                                    
+                                        1. **Agrupamento por Dia**: Todas as ocorrências da sequência `{sequencia_selecionada}` são agrupadas por data
+                                        2. **Probabilidade Diária**: Para cada dia, calculamos `(sucessos / total) × 100`
+                                        3. **Média Móvel**: Para cada dia, calculamos a média das probabilidades dos últimos **{janela_media} dias**
+                                    
+                                        **Exemplo com janela de 3 dias:**
+                                        - Dia 1: 60% (apenas este dia)
+                                        - Dia 2: (60% + 75%) / 2 = 67.5%
+                                        - Dia 3: (60% + 75% + 50%) / 3 = 61.7%
+                                        - Dia 4: (75% + 50% + 71%) / 3 = 65.3%
+                                        """)
+                                
+                                    # Gráfico de evolução temporal
+                                    st.markdown("### 📈 Evolução da Probabilidade ao Longo do Tempo")
+                                
+                                    fig_evolucao, _, _ = grafico_de_linha(
+                                        df_evolucao,
+                                        x='Data',
+                                        y=['Probabilidade_Acumulada', 'Probabilidade_Media_Movel'],
+                                        chave="zoom_evolucao",
+                                        title=f'Evolução da Probabilidade {tipo_probabilidade} - Sequência: {sequencia_selecionada}',
+                                        labels={
+                                            'value': 'Probabilidade (%)',
+                                            'variable': 'Tipo de Probabilidade',
+                                            'Data': 'Data'
+                                        }
+                                    )
+                                
+                                    # Personalizar as linhas
+                                    fig_evolucao.update_traces(
+                                        selector=dict(name='Probabilidade_Acumulada'),
+                                        line=dict(dash='dot', color='blue'),
+                                        name='Probabilidade Acumulada'
+                                    )
+                                    fig_evolucao.update_traces(
+                                        selector=dict(name='Probabilidade_Media_Movel'),
+                                        line=dict(dash='solid', color='red'),
+                                        name=f'Média Móvel ({janela_media} dias)'
+                                    )
+                                
+                                    # Adicionar linha de referência em 50%
+                                    fig_evolucao.add_hline(
+                                        y=50, 
+                                        line_dash="dash", 
+                                        line_color="gray",
+                                        annotation_text="50% (Aleatório)",
+                                        annotation_position="bottom right"
+                                    )
+                                
+                                    fig_evolucao.update_layout(
+                                        xaxis_title="Data",
+                                        yaxis_title="Probabilidade (%)",
+                                        yaxis=dict(range=[0, 100]),
+                                        hovermode='x unified'
+                                    )
+                                
+                                    st.plotly_chart(fig_evolucao, use_container_width=True)
+                                
+                                    # Tabela com dados detalhados - CORREÇÃO APLICADA AQUI
+                                    with st.expander("📋 Ver Dados Detalhados da Evolução"):
+                                        st.write(f"**Sequência:** {sequencia_selecionada} | **Tipo:** {tipo_probabilidade}")
+                                        df_display = df_evolucao.copy()
+                                    
+                                        # CORREÇÃO: Converter a coluna 'Data' para string antes de exibir
+                                        df_display['Data'] = df_display['Data'].astype(str)
+                                    
+                                        st.dataframe(df_display.style.format({
+                                            'Probabilidade_Acumulada': '{:.2f}%',
+                                            'Probabilidade_Media_Movel': '{:.2f}%',
+                                            'Probabilidade_Diaria': '{:.2f}%',
+                                            'Total_Ocorrencias': '{:.0f}',
+                                            'Total_Sucessos': '{:.0f}'
+                                        }))
+                                
+                                else:
+                                    st.warning(f"Não foram encontradas ocorrências suficientes da sequência '{sequencia_selecionada}' no período selecionado.")
+                    
+                        else:
+                            st.info("Nenhuma sequência encontrada para análise temporal.")
+                
+                    # Estatísticas avançadas
+                    st.markdown("---")
+                    st.subheader("📊 Estatísticas Avançadas por Categoria")
+                
+                    col1, col2, col3 = st.columns(3)
+                
+                    with col1:
+                        st.metric("🔄 Sequências Laterais", len(df_laterais))
+                        if not df_laterais.empty:
+                            st.write(f"Mais comum: {df_laterais.iloc[0]['Sequência Anterior']}")
+                            st.write(f"Ocorrências: {df_laterais.iloc[0]['Ocorrências']}")
+                
+                    with col2:
+                        st.metric("🟢 Sequências Compradoras", len(df_compradoras))
+                        if not df_compradoras.empty:
+                            st.write(f"Mais comum: {df_compradoras.iloc[0]['Sequência Anterior']}")
+                            st.write(f"Ocorrências: {df_compradoras.iloc[0]['Ocorrências']}")
+                
+                    with col3:
+                        st.metric("🔴 Sequências Vendedoras", len(df_vendedoras))
+                        if not df_vendedoras.empty:
+                            st.write(f"Mais comum: {df_vendedoras.iloc[0]['Sequência Anterior']}")
+                            st.write(f"Ocorrências: {df_vendedoras.iloc[0]['Ocorrências']}")
+                
+                    # Recomendações baseadas nos dados
+                    st.markdown("---")
+                    st.subheader("💡 Insights e Recomendações")
+                
+                    # Encontrar padrões fortes em cada categoria
+                    padroes_fortes_laterais = df_laterais[df_laterais['Viés'] != 'Neutro']
+                    padroes_fortes_compradoras = df_compradoras[df_compradoras['Viés'] == 'Comprador']
+                    padroes_fortes_vendedoras = df_vendedoras[df_vendedoras['Viés'] == 'Vendedor']
+                
+                    col_rec1, col_rec2 = st.columns(2)
+                
+                    with col_rec1:
+                        st.write("🎯 Padrões Fortes Identificados:")
+                    
+                        if not padroes_fortes_compradoras.empty:
+                            melhor_compradora = padroes_fortes_compradoras.iloc[0]
+                            st.success(f"*Comprador:* {melhor_compradora['Sequência Anterior']} → {melhor_compradora['Prob. Compradora (%)']}%")
+                    
+                        if not padroes_fortes_vendedoras.empty:
+                            melhor_vendedora = padroes_fortes_vendedoras.iloc[0]
+                            st.error(f"*Vendedor:* {melhor_vendedora['Sequência Anterior']} → {melhor_vendedora['Prob. Vendedora (%)']}%")
+                    
+                        if not padroes_fortes_laterais.empty:
+                            melhor_lateral = padroes_fortes_laterais.iloc[0]
+                            viés_cor = "🟢" if melhor_lateral['Viés'] == 'Comprador' else "🔴"
+                            st.info(f"*Lateral {viés_cor}:* {melhor_lateral['Sequência Anterior']} → Comp: {melhor_lateral['Prob. Compradora (%)']}% | Vend: {melhor_lateral['Prob. Vendedora (%)']}%")
+                
+                    with col_rec2:
+                        st.write("📈 Resumo por Categoria:")
+                    
+                        total_padroes = len(df_laterais) + len(df_compradoras) + len(df_vendedoras)
+                        if total_padroes > 0:
+                            st.write(f"• *Laterais:* {len(df_laterais)} ({len(df_laterais)/total_padroes*100:.1f}%)")
+                            st.write(f"• *Compradoras:* {len(df_compradoras)} ({len(df_compradoras)/total_padroes*100:.1f}%)")
+                            st.write(f"• *Vendedoras:* {len(df_vendedoras)} ({len(df_vendedoras)/total_padroes*100:.1f}%)")
+                        
+                            # Viés geral do mercado
+                            if len(df_compradoras) > len(df_vendedoras):
+                                st.success("*Viés Geral:* Comprador")
+                            elif len(df_vendedoras) > len(df_compradoras):
+                                st.error("*Viés Geral:* Vendedor")
+                            else:
+                                st.info("*Viés Geral:* Neutro")
+        
+            if secao == SECOES[4]:
+                with etapa(diagnostico, "Seção Varredura", len(dados_filtrados)):
+                    st.subheader("🧪 Varredura de Parâmetros (Window x Horário)")
+                    st.write(f"Simula todas as combinações para o ano {ano_escolhido} usando todos os núcleos do servidor.")
+                
+                    with st.form("form_varredura"):
+                        faixa_window = st.slider("🔢 Faixa de Window", 2, 10, (3, 8))
+                    
+                        col_v1, col_v2, col_v3 = st.columns(3)
+                        with col_v1:
+                            inicio_de = st.time_input("⏰ Hora Inicial - de", value=pd.to_datetime("09:00").time())
+                            inicio_ate = st.time_input("⏰ Hora Inicial - até", value=pd.to_datetime("10:00").time())
+                        with col_v2:
+                            fim_de = st.time_input("⏰ Hora Final - de", value=pd.to_datetime("11:00").time())
+                            fim_ate = st.time_input("⏰ Hora Final - até", value=pd.to_datetime("13:00").time())
+                        with col_v3:
+                            passo_minutos = st.number_input("⏱ Passo (minutos)", min_value=1, max_value=240, value=30)
+                    
+                        executar_varredura = st.form_submit_button("▶ Executar varredura")
+                
+                    metrica_varredura = st.selectbox(
+                        "Métrica do mapa de calor:",
+                        ['Total Pontos', 'Prob. Ganho (%)', 'Média Stops entre Ganhos'],
+                        key="metrica_varredura"
+                    )
+                
+                    if executar_varredura:
+                        grade = montar_grade(
+                            range(faixa_window[0], faixa_window[1] + 1),
+                            faixa_horarios(inicio_de, inicio_ate, passo_minutos),
+                            faixa_horarios(fim_de, fim_ate, passo_minutos)
+                        )
+                    
+                        if not grade:
+                            st.warning("Nenhuma combinação válida: a hora inicial precisa ser anterior à hora final.")
+                        else:
+                            progresso = st.progress(0.0, text=f"0 de {len(grade)} combinações")
+                            area_grafico = st.empty()
+                            linhas_varredura = []
+                        
+                            with etapa(diagnostico, f"Varredura ({len(grade)} combinações)"):
+                                # Resultados parciais aparecem à medida que os workers terminam
+                                for linha in varrer_parametros(
+                                    candles[candles["Ano"] == ano_escolhido],
+                                    grade,
+                                    contratos=contratos,
+                                    tabela_pontos=tabela_pontos_ativa,
+                                    ativo_escolhido=ativo_escolhido
+                                ):
+                                    linhas_varredura.append(linha)
+                                    progresso.progress(
+                                        len(linhas_varredura) / len(grade),
+                                        text=f"{len(linhas_varredura)} de {len(grade)} combinações"
+                                    )
+                                    if len(linhas_varredura) % max(1, len(grade) // 20) == 0 or len(linhas_varredura) == len(grade):
+                                        area_grafico.plotly_chart(
+                                            grafico_varredura(pd.DataFrame(linhas_varredura), metrica_varredura),
+                                            use_container_width=True
+                                        )
+                        
+                            st.session_state["resultado_varredura"] = pd.DataFrame(linhas_varredura)
+                            st.session_state["parametros_varredura"] = (chave_arquivo, ano_escolhido, ativo_escolhido, contratos)
+                            progresso.empty()
+                            area_grafico.empty()
+                
+                    # A varredura guardada só vale para o arquivo, ano, ativo e contratos com que rodou
+                    df_varredura = st.session_state.get("resultado_varredura")
+                    if st.session_state.get("parametros_varredura") != (chave_arquivo, ano_escolhido, ativo_escolhido, contratos):
+                        df_varredura = None
+                    if df_varredura is not None and not df_varredura.empty:
+                        _, ano_v, ativo_v, contratos_v = st.session_state["parametros_varredura"]
+                        st.success(f"*Ano:* {ano_v} | *Ativo:* {ativo_v} | *Contratos:* {contratos_v} | *Combinações:* {len(df_varredura)}")
+                    
+                        st.plotly_chart(grafico_varredura(df_varredura, metrica_varredura), use_container_width=True)
+                    
+                        st.subheader("🏆 Melhores Combinações")
+                        st.dataframe(df_varredura.sort_values(metrica_varredura, ascending=metrica_varredura == 'Média Stops entre Ganhos').head(20).style.format({
+                            'Prob. Ganho (%)': '{:.2f}%',
+                            'Média Stops entre Ganhos': '{:.2f}'
+                        }))
+        
+            if secao == SECOES[5]:
+                with etapa(diagnostico, "Seção Walk-forward"):
+                    st.subheader("🚶 Walk-forward (Janelas Móveis)")
+                    st.write(
+                        "Janelas de N pregões que avançam P pregões por todo o histórico do arquivo, no horário e window "
+                        "escolhidos. Cada janela é simulada sozinha; o saldo fora da amostra é o dos P pregões seguintes."
+                    )
+                
+                    with st.form("form_walk_forward"):
+                        col_w1, col_w2 = st.columns(2)
+                        with col_w1:
+                            treino = st.number_input("📏 Tamanho da janela (pregões)", min_value=1, value=60)
+                        with col_w2:
+                            passo = st.number_input("⏩ Passo (pregões)", min_value=1, value=5)
+                    
+                        executar_walk_forward = st.form_submit_button("▶ Executar walk-forward")
+                
+                    if executar_walk_forward:
+                        # Um único índice de dias do histórico (cache pelo arquivo, horário e window) serve todas as janelas
+                        with etapa(diagnostico, "Índice de dias do histórico"):
+                            indice_dias = indice_do_historico(candles, hora_inicio, hora_fim, window, indice, chave_arquivo)
+                        with etapa(diagnostico, "Janelas do walk-forward", len(indice_dias['limites']) - 1):
+                            st.session_state["resultado_walk_forward"] = walk_forward(
+                                indice_dias, treino, passo, contratos, tabela_pontos_ativa, ativo_escolhido
+                            )
+                        st.session_state["parametros_walk_forward"] = (
+                            chave_arquivo, hora_inicio, hora_fim, window, ativo_escolhido, contratos, treino, passo
+                        )
+                
+                    # O walk-forward guardado só vale para o arquivo, horário, window, ativo e contratos com que rodou
+                    resultado_walk_forward = st.session_state.get("resultado_walk_forward")
+                    parametros_wf = st.session_state.get("parametros_walk_forward")
+                    if parametros_wf is None or parametros_wf[:6] != (chave_arquivo, hora_inicio, hora_fim, window, ativo_escolhido, contratos):
+                        resultado_walk_forward = None
+                    if resultado_walk_forward is not None:
+                        janelas_wf, niveis_wf, _ = resultado_walk_forward
+                        _, _, _, window_v, ativo_v, contratos_v, treino_v, passo_v = parametros_wf
+                    
+                        if janelas_wf.empty:
+                            st.info(f"O histórico tem menos de {treino_v} pregões no horário escolhido.")
+                        else:
+                            st.success(
+                                f"*Janela:* {treino_v} pregões | *Passo:* {passo_v} | *Window:* {window_v} | "
+                                f"*Ativo:* {ativo_v} | *Contratos:* {contratos_v} | *Janelas:* {len(janelas_wf)}"
+                            )
+                        
+                            fig_wf = px.line(
+                                janelas_wf, x='Fim', y=['Saldo', 'Saldo Fora da Amostra'], markers=True,
+                                title='Saldo de cada janela e dos pregões seguintes (fora da amostra)'
+                            )
+                            st.plotly_chart(fig_wf, use_container_width=True)
+                        
+                            nivel_wf = st.selectbox(
+                                "Selecione o nível para acompanhar entre as janelas:",
+                                sorted(niveis_wf['Nível'].unique()),
+                                key="nivel_walk_forward"
+                            )
+                            niveis_do_nivel = niveis_wf[niveis_wf['Nível'] == nivel_wf].merge(janelas_wf[['Janela', 'Fim']], on='Janela')
+                        
+                            col_g1, col_g2 = st.columns(2)
+                            with col_g1:
+                                st.plotly_chart(px.line(
+                                    niveis_do_nivel, x='Fim', y='Probabilidade de Ganho (%)', markers=True,
+                                    title=f'Probabilidade de Ganho - Nível {nivel_wf}'
+                                ), use_container_width=True)
+                            with col_g2:
+                                st.plotly_chart(px.line(
+                                    niveis_do_nivel, x='Fim', y=['Média Stops entre Ganhos', 'Máximo Stops entre Ganhos'],
+                                    markers=True, title=f'Stops entre Ganhos - Nível {nivel_wf}'
+                                ), use_container_width=True)
+                        
+                            st.subheader("📋 Janelas")
+                            tabela_paginada(
+                                janelas_wf, "tabela_walk_forward", coluna_data="Fim",
+                                formatos={
+                                    'Prob. Ganho (%)': '{:.2f}',
+                                    'Saldo Fora da Amostra': lambda saldo: "-" if pd.isna(saldo) else f"{saldo:,.0f}"
+                                }
+                            )
+        
+            if secao == SECOES[6]:
+                with etapa(diagnostico, "Seção Tempos Gráficos"):
+                    st.subheader("⏱ Tempos Gráficos (Reamostragem das Barras)")
+                    st.write(
+                        f"As barras de 1 minuto do ano {ano_escolhido} são agrupadas em tempos gráficos maiores, dentro do "
+                        "horário e sem atravessar o dia, e cada tempo gráfico é simulado com o mesmo window e tem as "
+                        "sequências de barras analisadas, lado a lado."
+                    )
+                    if not all(encontrar_colunas_precos(candles)):
+                        st.info("Sem Abertura e Fechamento no arquivo, a cor de cada barra reamostrada é a da maioria das barras de 1 minuto.")
+                
+                    with st.form("form_tempos_graficos"):
+                        tempos_escolhidos = st.multiselect(
+                            "⏱ Tempos gráficos (minutos)", [1, 2, 3, 5, 10, 15, 30, 60], default=list(TEMPOS_GRAFICOS_PADRAO)
+                        )
+                        max_sequencia_tempos = st.slider("Tamanho máximo da sequência analisada:", 2, 8, MAX_SEQUENCIA_PADRAO)
+                        executar_tempos = st.form_submit_button("▶ Simular tempos gráficos")
+                
+                    if executar_tempos:
+                        if not tempos_escolhidos:
+                            st.warning("Escolha ao menos um tempo gráfico.")
+                        else:
+                            # Os tempos gráficos que faltam no cache (arquivo, ano, horário e window) rodam em paralelo
+                            dados_ano = candles[candles["Ano"] == ano_escolhido]
+                            with etapa(diagnostico, f"Tempos gráficos ({len(tempos_escolhidos)})", len(dados_ano)):
+                                st.session_state["resultado_tempos_graficos"] = simular_tempos_graficos(
+                                    dados_ano, sorted(tempos_escolhidos), hora_inicio, hora_fim, window, contratos,
+                                    tabela_pontos_ativa, ativo_escolhido, chave=(chave_arquivo, ano_escolhido),
+                                    max_sequencia=max_sequencia_tempos
+                                )
+                            st.session_state["parametros_tempos_graficos"] = (
+                                chave_arquivo, ano_escolhido, hora_inicio, hora_fim, window, ativo_escolhido, contratos
+                            )
+                
+                    # O resultado guardado só vale para o arquivo e os parâmetros com que rodou
+                    resultado_tempos = st.session_state.get("resultado_tempos_graficos")
+                    if st.session_state.get("parametros_tempos_graficos") != (
+                        chave_arquivo, ano_escolhido, hora_inicio, hora_fim, window, ativo_escolhido, contratos
+                    ):
+                        resultado_tempos = None
+                    if resultado_tempos is not None:
+                        livros_tempos, comparacao_tempos, sequencias_tempos = resultado_tempos
+                        st.success(f"*Ano:* {ano_escolhido} | *Window:* {window} | *Ativo:* {ativo_escolhido} | *Contratos:* {contratos}")
+                    
+                        st.dataframe(comparacao_tempos.set_index('Tempo Gráfico').style.format({
+                            '% Compradoras': '{:.2f}%',
+                            'Prob. Alternância (%)': '{:.2f}%',
+                            'Prob. Ganho (%)': '{:.2f}%',
+                            'Média Stops entre Ganhos': '{:.2f}'
+                        }))
+                        st.caption("Sequências com Viés: sequências anteriores com mais de 60% de chance de a próxima barra ser de uma cor.")
+                    
+                        col_t1, col_t2 = st.columns(2)
+                        with col_t1:
+                            st.plotly_chart(px.bar(
+                                comparacao_tempos, x='Tempo Gráfico', y='Total Pontos', title='Total de Pontos por Tempo Gráfico'
+                            ), use_container_width=True)
+                        with col_t2:
+                            st.plotly_chart(px.bar(
+                                comparacao_tempos, x='Tempo Gráfico', y=['Prob. Alternância (%)', 'Prob. Ganho (%)'],
+                                barmode='group', title='Alternância entre Barras e Probabilidade de Ganho'
+                            ), use_container_width=True)
+                    
+                        # Probabilidade de ganho de cada nível nos vários tempos gráficos
+                        niveis_tempos = [
+                            calcular_estatisticas_por_nivel(livro)[0].reset_index().assign(**{'Tempo Gráfico': f"{minutos} min"})
+                            for minutos, livro in livros_tempos.items() if not livro.empty
+                        ]
+                        if niveis_tempos:
+                            st.plotly_chart(px.line(
+                                pd.concat(niveis_tempos, ignore_index=True), x='Nível', y='Probabilidade de Ganho (%)', color='Tempo Gráfico', markers=True,
+                                title='Probabilidade de Ganho por Nível em cada Tempo Gráfico'
+                            ), use_container_width=True)
+                    
+                        # Análise de sequências de barras de cada tempo gráfico, lado a lado
+                        st.subheader("🔍 Sequências de Barras por Tempo Gráfico")
+                        categoria_tempos = st.selectbox(
+                            "Categoria de sequência:", CATEGORIAS_SEQUENCIA, key="categoria_sequencia_tempos"
+                        )
+                        sequencias_categoria = sequencias_tempos[sequencias_tempos['Categoria'] == categoria_tempos]
+                        if sequencias_categoria.empty:
+                            st.info("Nenhuma sequência desta categoria nos tempos gráficos simulados.")
+                        else:
+                            ordem_tempos = list(comparacao_tempos['Tempo Gráfico'])
+                            st.dataframe(sequencias_categoria.pivot_table(
+                                index=['Tamanho Sequência', 'Sequência Anterior'], columns='Tempo Gráfico',
+                                values='Prob. Compradora (%)'
+                            ).reindex(columns=ordem_tempos).style.format('{:.2f}%', na_rep="-"))
+                            st.plotly_chart(px.bar(
+                                sequencias_categoria, x='Sequência Anterior', y='Prob. Compradora (%)', color='Tempo Gráfico',
+                                barmode='group', category_orders={'Tempo Gráfico': ordem_tempos},
+                                title=f'Probabilidade de a Próxima Barra ser Compradora ({categoria_tempos})'
+                            ), use_container_width=True)
+        
+        # ===============================
+        # Diagnóstico de desempenho desta execução
+        # ===============================
+        with st.expander("🩺 Diagnóstico de desempenho"):
+            st.checkbox(
+                "Medir pico de memória (tracemalloc, deixa a página mais lenta)",
+                key="diagnostico_memoria"
+            )
+            st.dataframe(tabela_diagnostico(diagnostico).style.format({
+                'Tempo (ms)': '{:,.1f}',
+                'Pico de Memória (MB)': '{:,.1f}'
+            }, na_rep="-"))
+            st.caption(
+                f"Execução {diagnostico['execucao']}: cada etapa também é registrada como JSON "
+                "na saída de erro do servidor (log 'lateralizacoes.diagnostico', nível INFO; "
+                "DETECTOR_LOG_LEVEL=WARNING desliga)"
+            )
@@ -0,0 +1,26 @@
+"""
+Fixtures dos testes: candles sintéticos do gerador do benchmark (determinísticos), no horário do
+pregão e na ordem que a simulação espera (mais recente primeiro)
+"""
+import pytest
+
+from lateralizacoes.benchmark import PREGOES, gerar_candles
+from lateralizacoes.ingestao import normalizar_candles
+from lateralizacoes.simulacao import preparar_para_simulacao
+
+# (ativo, semente, densidade de alternância): com densidade baixa as sequências chegam a níveis altos
+CENARIOS = [("WIN", 0, 0.6), ("WDO", 1, 0.45)]
+
+LINHAS = 8_000
+
+def dados_do_pregao(linhas, ativo="WIN", densidade_alternancia=0.6, semente=0):
+    """Candles do gerador filtrados no pregão do ativo, como preparar_para_simulacao devolve"""
+    pregao = PREGOES[ativo]
+    candles = normalizar_candles(gerar_candles(linhas, ativo, densidade_alternancia, semente=semente))
+    return preparar_para_simulacao(candles, pregao["abertura"], pregao["fechamento"])
+
+@pytest.fixture(scope="session", params=CENARIOS, ids=[f"{ativo}-{densidade}" for ativo, _, densidade in CENARIOS])
+def cenario(request):
+    """(ativo como na tabela de pontos, candles prontos para a simulação)"""
+    ativo, semente, densidade = request.param
+    return PREGOES[ativo]["ativo"], dados_do_pregao(LINHAS, ativo, densidade, semente)
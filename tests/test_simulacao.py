@@ -0,0 +1,102 @@
+"""Equivalências da simulação sobre os candles do gerador do benchmark"""
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from conftest import dados_do_pregao
+from lateralizacoes.benchmark import PREGOES
+from lateralizacoes.simulacao import (
+    detectar_alternancias,
+    detectar_alternancias_paralelo,
+    detectar_dias,
+    indexar_dias,
+    montar_tabela_resultado,
+    precificar,
+    simular,
+    simular_incremental,
+    total_de_sequencias,
+    valores_por_ativo,
+)
+
+DADOS = Path(__file__).parent / "dados"
+
+# Livros gravados pelo simular de antes da separação entre detecção e precificação, sobre
+# dados_do_pregao(5_000, ativo, semente=2): (ativo, window, contratos, arquivo)
+LIVROS_REFERENCIA = [("WIN", 4, 2, "livro_win_w4_c2.csv"), ("WDO", 6, 1, "livro_wdo_w6_c1.csv")]
+
+@pytest.mark.parametrize("window", [3, 6])
+@pytest.mark.parametrize("tamanho_bloco", [997, 2_500])
+def test_simular_incremental_em_blocos_igual_a_simular(cenario, window, tamanho_bloco):
+    ativo, dados = cenario
+    cronologicos = dados.iloc[::-1].reset_index(drop=True)
+    parametros = dict(window=window, contratos=2, tabela_pontos=valores_por_ativo[ativo], ativo_escolhido=ativo)
+    
+    # Depois de cada bloco, o livro é o de simular() sobre tudo o que já foi recebido
+    estado = None
+    for inicio in range(0, len(cronologicos), tamanho_bloco):
+        fim = inicio + tamanho_bloco
+        livro, estado = simular_incremental(cronologicos.iloc[inicio:fim], estado, **parametros)
+        pd.testing.assert_frame_equal(livro, simular(cronologicos.iloc[:fim].reset_index(drop=True), **parametros))
+
+@pytest.mark.parametrize("ativo, window, contratos, arquivo", LIVROS_REFERENCIA)
+def test_precificar_eventos_igual_ao_livro_anterior(ativo, window, contratos, arquivo):
+    nome = PREGOES[ativo]["ativo"]
+    eventos = detectar_alternancias(dados_do_pregao(5_000, ativo, semente=2), window=window)
+    livro = precificar(eventos, valores_por_ativo[nome], contratos, ativo_escolhido=nome)
+    
+    esperado = pd.read_csv(DADOS / arquivo, dtype={'Padrao': str, 'Dia': str}, parse_dates=['Data'])
+    pd.testing.assert_frame_equal(livro.astype({'Padrao': str, 'Dia': str}), esperado, check_dtype=False)
+
+@pytest.mark.parametrize("max_levels", [350, 3])
+@pytest.mark.parametrize("max_workers, blocos", [(1, 1), (1, 7), (2, 4)])
+def test_detectar_paralelo_igual_ao_sequencial(cenario, max_levels, max_workers, blocos):
+    _, dados = cenario
+    pd.testing.assert_frame_equal(
+        detectar_alternancias_paralelo(dados, max_levels, 6, max_workers=max_workers, blocos=blocos),
+        detectar_alternancias(dados, max_levels, 6)
+    )
+
+COLUNAS_RESUMIDAS = ['Sequencia', 'Nivel', 'Ganho', 'Alternancias', 'Linha_Inicial']
+
+@pytest.mark.parametrize("max_levels", [350, 2])
+def test_detectar_dias_igual_a_detectar_so_os_dias(cenario, max_levels):
+    _, dados = cenario
+    indice_dias = indexar_dias(dados, window=6)
+    limites = indice_dias['limites']
+    dias = len(limites) - 1
+    
+    # Faixas em qualquer ordem: o índice memoriza os caminhos de cada entrada na primeira vez
+    for primeiro, ultimo in [(0, dias), (3, 9), (dias - 1, dias), (1, 2), (0, 5), (5, 5)]:
+        esperado = detectar_alternancias(
+            dados.iloc[limites[primeiro]:limites[ultimo]].reset_index(drop=True), max_levels, 6
+        )
+        pd.testing.assert_frame_equal(detectar_dias(indice_dias, primeiro, ultimo, max_levels), esperado)
+        pd.testing.assert_frame_equal(
+            detectar_dias(indice_dias, primeiro, ultimo, max_levels, resumido=True),
+            esperado[COLUNAS_RESUMIDAS],
+            check_index_type=False
+        )
+
+def test_tabela_resultado_tem_a_sequencia_vazia_do_fim(cenario):
+    ativo, dados = cenario
+    completos = detectar_alternancias(dados, 2, 4)
+    
+    # Cortes que terminam com a última sequência cheia de stops abrem uma coluna vazia, que com
+    # mais barras recebe as próximas operações; as sequências anteriores não mudam
+    vazias = 0
+    for linhas in range(50, 3_000, 13):
+        eventos = detectar_alternancias(dados.iloc[:linhas].reset_index(drop=True), 2, 4)
+        total = total_de_sequencias(eventos, linhas, 2)
+        resultado, numerico = montar_tabela_resultado(precificar(eventos, ativo_escolhido=ativo), range(total))
+        assert list(numerico.columns) == list(range(total))
+        
+        if total > eventos['Sequencia'].max() + 1:
+            vazias += 1
+            assert resultado[total - 1].drop("TOTAL").isna().all()
+            assert (completos['Sequencia'] == total - 1).any()
+            pd.testing.assert_frame_equal(
+                eventos[COLUNAS_RESUMIDAS],
+                completos.loc[completos['Sequencia'] < total - 1, COLUNAS_RESUMIDAS].reset_index(drop=True)
+            )
+    assert vazias
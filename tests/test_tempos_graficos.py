@@ -0,0 +1,119 @@
+from datetime import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lateralizacoes.benchmark import gerar_candles
+from lateralizacoes.ingestao import normalizar_candles
+from lateralizacoes.simulacao import preparar_para_simulacao
+from lateralizacoes.tempos_graficos import reamostrar, simular_tempos_graficos
+
+HORA_INICIO, HORA_FIM = time(9, 7), time(17, 3)
+
+def candles_sinteticos():
+    # Fora de ordem, como pode vir da planilha
+    candles = normalizar_candles(gerar_candles(20_000, semente=1))
+    return candles.sample(frac=1, random_state=1).reset_index(drop=True)
+
+@pytest.mark.parametrize("minutos", [2, 5, 15])
+def test_reamostrar_igual_ao_groupby(minutos):
+    candles = candles_sinteticos()
+    barras = reamostrar(candles, [minutos], HORA_INICIO, HORA_FIM)[minutos]
+    
+    dados = candles[(candles['Data'].dt.time >= HORA_INICIO) & (candles['Data'].dt.time <= HORA_FIM)].sort_values('Data')
+    minuto = dados['Data'].dt.hour * 60 + dados['Data'].dt.minute
+    origem = HORA_INICIO.hour * 60 + HORA_INICIO.minute
+    grupos = dados.groupby(dados['Data'].dt.normalize() + pd.to_timedelta(origem + (minuto - origem) // minutos * minutos, unit='m'))
+    esperado = pd.DataFrame({
+        'Abertura': grupos['Abertura'].first(),
+        'Máxima': grupos['Máxima'].max(),
+        'Mínima': grupos['Mínima'].min(),
+        'Fechamento': grupos['Fechamento'].last()
+    })
+    
+    assert np.array_equal(barras['Data'].to_numpy(), esperado.index.to_numpy())
+    for coluna in esperado.columns:
+        assert np.array_equal(barras[coluna].to_numpy(), esperado[coluna].to_numpy())
+    
+    # Sem empate entre abertura e fechamento, a cor vem do corpo da barra
+    corpo = esperado['Fechamento'].to_numpy() - esperado['Abertura'].to_numpy()
+    assert np.array_equal(barras['Barras'].to_numpy()[corpo > 0], np.ones((corpo > 0).sum()))
+    assert np.array_equal(barras['Barras'].to_numpy()[corpo < 0], np.zeros((corpo < 0).sum()))
+
+def test_reamostrar_respeita_horario_e_dia():
+    barras = reamostrar(candles_sinteticos(), [15], HORA_INICIO, HORA_FIM)[15]
+    horario = barras['Data'].dt.hour * 60 + barras['Data'].dt.minute
+    
+    # Barras começam na hora inicial e a cada 15 minutos dela, e nenhuma passa da hora final
+    assert horario.min() == 9 * 60 + 7
+    assert ((horario - (9 * 60 + 7)) % 15 == 0).all()
+    assert horario.max() <= 17 * 60 + 3
+    
+    # Cada dia começa pela barra da hora inicial e as colunas derivadas são do próprio dia
+    primeiras = barras.groupby('DataApenas')['Hora'].min()
+    assert (primeiras == 9 * 60 + 7).all()
+    assert np.array_equal(barras['DataApenas'].to_numpy(), barras['Data'].to_numpy().astype('datetime64[D]').astype(np.int64))
+
+def test_reamostrar_nao_atravessa_a_virada_do_dia():
+    candles = normalizar_candles(pd.DataFrame({
+        'Data': pd.to_datetime(['2024-03-01 23:57', '2024-03-01 23:59', '2024-03-02 00:00', '2024-03-02 00:03']),
+        'Abertura': [10.0, 12.0, 15.0, 14.0],
+        'Máxima': [13.0, 14.0, 16.0, 18.0],
+        'Mínima': [9.0, 11.0, 13.0, 12.0],
+        'Fechamento': [12.0, 13.0, 14.0, 17.0],
+        'Barras': [1, 1, 0, 1]
+    }))
+    barras = reamostrar(candles, [5])[5]
+    
+    assert list(barras['Data']) == [pd.Timestamp('2024-03-01 23:55'), pd.Timestamp('2024-03-02 00:00')]
+    assert list(barras['Abertura']) == [10.0, 15.0]
+    assert list(barras['Máxima']) == [14.0, 18.0]
+    assert list(barras['Mínima']) == [9.0, 12.0]
+    assert list(barras['Fechamento']) == [13.0, 17.0]
+    assert list(barras['Barras']) == [1, 1]
+
+def test_reamostrar_sem_abertura_e_fechamento_usa_a_maioria():
+    candles = normalizar_candles(pd.DataFrame({
+        'Data': pd.date_range('2024-03-01 09:00', periods=8, freq='min'),
+        'Máxima': np.arange(8.0) + 1,
+        'Mínima': np.arange(8.0),
+        'Barras': [1, 1, 0, 0, 0, 1, 0, 1]
+    }))
+    barras = reamostrar(candles, [2, 3])
+    
+    # Empate: vale a cor da última barra do grupo
+    assert list(barras[2]['Barras']) == [1, 0, 1, 1]
+    assert list(barras[3]['Barras']) == [1, 0, 1]
+    assert list(barras[3]['Máxima']) == [3.0, 6.0, 8.0]
+    assert list(barras[3]['Mínima']) == [0.0, 3.0, 6.0]
+
+def test_reamostrar_1_minuto_mantem_as_barras():
+    candles = normalizar_candles(gerar_candles(5_000, semente=3))
+    pd.testing.assert_frame_equal(reamostrar(candles, [1])[1], candles)
+
+def test_sequencias_de_5_minutos():
+    candles = candles_sinteticos()
+    livros, comparacao, sequencias = simular_tempos_graficos(candles, [1, 5], HORA_INICIO, HORA_FIM, 6, max_sequencia=2)
+    
+    # Na ordem da simulação (mais recente primeiro), como a seção de estatística de barras
+    barras = preparar_para_simulacao(reamostrar(candles, [5], HORA_INICIO, HORA_FIM)[5], HORA_INICIO, HORA_FIM)
+    cores = barras['Barras'].to_numpy()
+    
+    de_5 = sequencias[sequencias['Tempo Gráfico'] == '5 min'].set_index('Sequência Anterior')
+    assert set(de_5.index) == {'0', '1', '00', '01', '10', '11'}
+    assert set(sequencias['Tempo Gráfico']) == {'1 min', '5 min'}
+    for anterior in ['0', '1', '00', '01', '10', '11']:
+        # Como na contagem original, a última barra nunca entra como próxima
+        tamanho = len(anterior)
+        janelas = np.lib.stride_tricks.sliding_window_view(cores[:-1], tamanho + 1)
+        ocorrencias = janelas[(janelas[:, :-1] == [int(cor) for cor in anterior]).all(axis=1)]
+        assert de_5.loc[anterior, 'Ocorrências'] == len(ocorrencias)
+        assert de_5.loc[anterior, 'Próxima Compradora'] == ocorrencias[:, -1].sum()
+        assert de_5.loc[anterior, 'Categoria'] == ('Compradora' if set(anterior) == {'1'} else
+                                                   'Vendedora' if set(anterior) == {'0'} else 'Lateral')
+    
+    linha_5 = comparacao.set_index('Tempo Gráfico').loc['5 min']
+    assert linha_5['Barras'] == len(cores)
+    assert linha_5['Sequências com Viés'] == (de_5['Viés'] != 'Neutro').sum()
+    assert linha_5['Operações'] == len(livros[5])